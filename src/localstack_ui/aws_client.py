@@ -1,8 +1,11 @@
+import asyncio
 import time
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError, EndpointConnectionError, NoCredentialsError
 
+from .executor import AWSExecutor
 from .settings import settings
 
 
@@ -12,21 +15,38 @@ class AWSClientError(Exception):
     pass
 
 
+# Services probed by the health check
+HEALTH_SERVICES = ["s3", "lambda", "stepfunctions"]
+
+
 class AWSClientFactory:
     """Factory for creating AWS service clients configured for LocalStack."""
 
     def __init__(self):
         self._clients = {}
-
-    def _create_client(self, service_name: str):
+        self._health_clients = {}
+        # Probes run on their own threads, never competing with page requests
+        self._probe_executor = AWSExecutor(max_workers=len(HEALTH_SERVICES))
+        self._probes = {}
+        self._health = None
+        self._health_time = 0.0
+        self._health_lock = asyncio.Lock()
+
+    def _create_client(
+        self,
+        service_name: str,
+        endpoint_url: str = settings.LOCALSTACK_ENDPOINT,
+        config: Config = None,
+    ):
         """Create a boto3 client for the specified service."""
         try:
             client = boto3.client(
                 service_name,
-                endpoint_url=settings.LOCALSTACK_ENDPOINT,
+                endpoint_url=endpoint_url,
                 aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
                 region_name=settings.AWS_REGION,
+                config=config or Config(max_pool_connections=settings.AWS_MAX_CONCURRENCY),
             )
             return client
         except (ClientError, NoCredentialsError) as e:
@@ -38,95 +58,172 @@ class AWSClientFactory:
             self._clients["s3"] = self._create_client("s3")
         return self._clients["s3"]
 
+    def get_s3_presign_client(self):
+        """Get or create an S3 client that signs URLs for the browser-facing endpoint."""
+        if "s3_presign" not in self._clients:
+            self._clients["s3_presign"] = self._create_client(
+                "s3", settings.LOCALSTACK_PUBLIC_ENDPOINT
+            )
+        return self._clients["s3_presign"]
+
     def get_lambda_client(self):
         """Get or create Lambda client."""
         if "lambda" not in self._clients:
             self._clients["lambda"] = self._create_client("lambda")
         return self._clients["lambda"]
 
+    def get_lambda_invoke_client(self):
+        """
+        Get or create a Lambda client that never retries, for load tests.
+
+        botocore would otherwise retry throttled invocations, hiding the
+        throttles (and inflating the latencies) a load test should report.
+        """
+        if "lambda_invoke" not in self._clients:
+            self._clients["lambda_invoke"] = self._create_client(
+                "lambda",
+                config=Config(
+                    max_pool_connections=settings.LAMBDA_LOAD_MAX_CONCURRENCY,
+                    retries={"max_attempts": 0},
+                ),
+            )
+        return self._clients["lambda_invoke"]
+
     def get_stepfunctions_client(self):
         """Get or create Step Functions client."""
         if "stepfunctions" not in self._clients:
             self._clients["stepfunctions"] = self._create_client("stepfunctions")
         return self._clients["stepfunctions"]
 
-    def health_check(self, max_retries: int = 3, retry_delay: float = 1.0) -> dict:
+    def _get_health_client(self, service_name: str):
+        """
+        Get or create the client used by health probes.
+
+        Its timeouts are HEALTH_CHECK_TIMEOUT and it never retries, so a probe
+        against a hung LocalStack gives up instead of holding its thread for
+        botocore's default 60s timeouts and retries.
+        """
+        if service_name not in self._health_clients:
+            self._health_clients[service_name] = self._create_client(
+                service_name,
+                config=Config(
+                    connect_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                    read_timeout=settings.HEALTH_CHECK_TIMEOUT,
+                    retries={"max_attempts": 0},
+                    max_pool_connections=1,
+                ),
+            )
+        return self._health_clients[service_name]
+
+    def _probe(self, service_name: str):
+        """Make one cheap read-only call against a service."""
+        client = self._get_health_client(service_name)
+        if service_name == "s3":
+            # Test S3 by listing buckets
+            client.list_buckets()
+        elif service_name == "lambda":
+            # Test Lambda by listing functions
+            client.list_functions(MaxItems=1)
+        elif service_name == "stepfunctions":
+            # Test Step Functions by listing state machines
+            client.list_state_machines(maxResults=1)
+
+    def _start_probe(self, service_name: str) -> asyncio.Future:
+        """Start a probe of a service, or join the one still running for it."""
+        probe = self._probes.get(service_name)
+        if probe is None or probe.done():
+            probe = asyncio.ensure_future(self._probe_executor.run(self._probe, service_name))
+            self._probes[service_name] = probe
+        return probe
+
+    async def _check_service(
+        self, service_name: str, max_retries: int, retry_delay: float, timeout: float
+    ) -> dict:
+        """
+        Probe a single service with a timeout and exponential async backoff.
+
+        Returns:
+            dict: Health status for the service
+        """
+        error_msg = None
+
+        for attempt in range(max_retries):
+            try:
+                # Shielded: a timed-out probe keeps running and the next attempt joins it
+                await asyncio.wait_for(asyncio.shield(self._start_probe(service_name)), timeout)
+                return {"status": "healthy", "error": None, "attempt": attempt + 1}
+
+            except asyncio.TimeoutError:
+                error_msg = f"Timed out after {timeout}s"
+            except EndpointConnectionError as e:
+                error_msg = f"Cannot connect to LocalStack endpoint: {e}"
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code", "Unknown")
+                error_msg = f"AWS API error ({error_code}): {e}"
+            except Exception as e:
+                error_msg = f"Unexpected error: {e}"
+
+            if attempt < max_retries - 1:
+                await asyncio.sleep(retry_delay * 2**attempt)
+
+        return {"status": "unhealthy", "error": error_msg, "attempt": max_retries}
+
+    async def health_check(
+        self,
+        max_retries: int = 3,
+        retry_delay: float = 0.5,
+        timeout: float = settings.HEALTH_CHECK_TIMEOUT,
+    ) -> dict:
         """
-        Check the health of LocalStack services.
+        Check the health of LocalStack services, probing them concurrently.
 
         Returns:
             dict: Health status for each service
         """
-        services = {
-            "s3": self.get_s3_client,
-            "lambda": self.get_lambda_client,
-            "stepfunctions": self.get_stepfunctions_client,
-        }
-
-        health_status = {}
-
-        for service_name, client_factory in services.items():
-            for attempt in range(max_retries):
-                try:
-                    client = client_factory()
-
-                    if service_name == "s3":
-                        # Test S3 by listing buckets
-                        client.list_buckets()
-                    elif service_name == "lambda":
-                        # Test Lambda by listing functions
-                        client.list_functions(MaxItems=1)
-                    elif service_name == "stepfunctions":
-                        # Test Step Functions by listing state machines
-                        client.list_state_machines(maxResults=1)
-
-                    health_status[service_name] = {
-                        "status": "healthy",
-                        "error": None,
-                        "attempt": attempt + 1,
-                    }
-                    break
-
-                except EndpointConnectionError as e:
-                    error_msg = f"Cannot connect to LocalStack endpoint: {e}"
-                    if attempt == max_retries - 1:
-                        health_status[service_name] = {
-                            "status": "unhealthy",
-                            "error": error_msg,
-                            "attempt": attempt + 1,
-                        }
-                    else:
-                        time.sleep(retry_delay)
-
-                except ClientError as e:
-                    error_code = e.response.get("Error", {}).get("Code", "Unknown")
-                    error_msg = f"AWS API error ({error_code}): {e}"
-                    if attempt == max_retries - 1:
-                        health_status[service_name] = {
-                            "status": "unhealthy",
-                            "error": error_msg,
-                            "attempt": attempt + 1,
-                        }
-                    else:
-                        time.sleep(retry_delay)
-
-                except Exception as e:
-                    error_msg = f"Unexpected error: {e}"
-                    if attempt == max_retries - 1:
-                        health_status[service_name] = {
-                            "status": "unhealthy",
-                            "error": error_msg,
-                            "attempt": attempt + 1,
-                        }
-                    else:
-                        time.sleep(retry_delay)
-
-        return health_status
-
-    def is_healthy(self) -> bool:
+        results = await asyncio.gather(
+            *(
+                self._check_service(service_name, max_retries, retry_delay, timeout)
+                for service_name in HEALTH_SERVICES
+            )
+        )
+        return dict(zip(HEALTH_SERVICES, results))
+
+    async def get_health(self, max_age: float = settings.HEALTH_CHECK_TTL) -> dict:
+        """
+        Return the cached health status, re-probing only when it is older than max_age.
+
+        Concurrent callers share a single probe round.
+
+        Returns:
+            dict: Health status for each service plus "checked_at" (epoch seconds)
+        """
+        if self._health is not None and time.monotonic() - self._health_time < max_age:
+            return self._health
+
+        async with self._health_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._health is not None and time.monotonic() - self._health_time < max_age:
+                return self._health
+
+            services = await self.health_check()
+            self._health = {"services": services, "checked_at": time.time()}
+            self._health_time = time.monotonic()
+            return self._health
+
+    async def refresh_health_forever(self, interval: float = settings.HEALTH_CHECK_TTL):
+        """Keep the cached health status warm; run as a background task."""
+        while True:
+            await self.get_health(max_age=0)
+            await asyncio.sleep(interval)
+
+    def shutdown(self):
+        """Release the health probe threads."""
+        self._probe_executor.shutdown()
+
+    async def is_healthy(self) -> bool:
         """Check if all services are healthy."""
-        health_status = self.health_check()
-        return all(service["status"] == "healthy" for service in health_status.values())
+        health = await self.get_health()
+        return all(service["status"] == "healthy" for service in health["services"].values())
 
 
 # Global instance
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+from .settings import settings
+from .templating import TEMPLATE_DIRECTORY
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value names the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def _template_version() -> str:
+    """Latest modification time of the templates, so template edits change ETags."""
+    latest = 0.0
+    for directory, _, files in os.walk(TEMPLATE_DIRECTORY):
+        for name in files:
+            latest = max(latest, os.path.getmtime(os.path.join(directory, name)))
+    return str(latest)
+
+
+class PageCache:
+    """
+    Data-derived ETags and a short-lived cache of rendered pages.
+
+    A page's ETag is a hash of its URL, the template version and the data it
+    shows (listing ETags, LastModified, CodeSha256, definition hashes, ...).
+    When the browser already holds that version the page is not rendered at
+    all, and a page rendered for the same data within ttl seconds is reused.
+    """
+
+    # Seconds between checks of the templates directory in DEBUG
+    TEMPLATE_CHECK_INTERVAL = 2.0
+
+    def __init__(
+        self,
+        ttl: float = settings.PAGE_CACHE_TTL,
+        max_entries: int = settings.PAGE_CACHE_MAX_ENTRIES,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._pages = OrderedDict()
+        self._lock = threading.Lock()
+        self._template_version = None
+        self._template_checked = 0.0
+
+    def etag(self, request, data: Any) -> str:
+        """Strong ETag for the page at the request's URL showing data."""
+        digest = hashlib.sha256(
+            json.dumps(
+                [str(request.url), self.template_version(), data], default=str, sort_keys=True
+            ).encode("utf-8")
+        ).hexdigest()
+        return f'"{digest[:32]}"'
+
+    def template_version(self) -> str:
+        """
+        Version of the templates, part of every ETag.
+
+        Computed once per process; in DEBUG, where templates are reloaded when
+        edited, the directory is checked again at most every
+        TEMPLATE_CHECK_INTERVAL seconds rather than on every request.
+        """
+        now = time.monotonic()
+        if self._template_version is None or (
+            settings.DEBUG and now - self._template_checked >= self.TEMPLATE_CHECK_INTERVAL
+        ):
+            self._template_version = _template_version()
+            self._template_checked = now
+        return self._template_version
+
+    def respond(self, request, data: Any, render: Callable[[], Response]) -> Response:
+        """
+        Return the page for data, rendering it only when needed.
+
+        Args:
+            request: The page request
+            data: What the page shows; must be JSON-serializable (str is used
+                for anything else, e.g. datetimes)
+            render: Builds the full response when neither the browser nor the
+                cache has this version
+
+        Returns:
+            A 304, a cached copy or the freshly rendered response, with its ETag
+        """
+        etag = self.etag(request, data)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match", ""), etag):
+            return Response(status_code=304, headers=headers)
+
+        cached = self._get(etag)
+        if cached is not None:
+            body, media_type = cached
+            return Response(body, media_type=media_type, headers=headers)
+
+        response = render()
+        if response.status_code != 200:
+            return response
+        response.headers.update(headers)
+        if self.ttl > 0:
+            self._put(etag, (response.body, response.media_type))
+        return response
+
+    def _get(self, etag: str) -> Optional[tuple]:
+        """A page rendered for this ETag within ttl seconds, if any."""
+        with self._lock:
+            entry = self._pages.get(etag)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > self.ttl:
+                del self._pages[etag]
+                return None
+            self._pages.move_to_end(etag)
+            return entry[1]
+
+    def _put(self, etag: str, page: tuple):
+        """Keep a rendered page, evicting the least recently used."""
+        with self._lock:
+            self._pages[etag] = (time.monotonic(), page)
+            self._pages.move_to_end(etag)
+            while len(self._pages) > self.max_entries:
+                self._pages.popitem(last=False)
+
+
+class ConditionalGetMiddleware:
+    """
+    Answer conditional GETs with 304 Not Modified.
+
+    Responses that already carry an ETag are checked against If-None-Match as
+    they are. Other complete HTML pages (with a Content-Length) get a strong
+    ETag from a hash of their body; streamed responses pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match", "")
+        start = None
+        mode = None
+        body = []
+
+        async def send_conditional(message):
+            nonlocal start, mode
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] != 200:
+                    mode = "pass"
+                elif "etag" in headers:
+                    mode = "skip" if etag_matches(if_none_match, headers["etag"]) else "pass"
+                elif (
+                    scope["method"] == "GET"
+                    and "content-length" in headers
+                    and headers.get("content-type", "").startswith("text/html")
+                ):
+                    mode = "hash"
+                else:
+                    mode = "pass"
+
+                if mode == "pass":
+                    await send(message)
+                elif mode == "skip":
+                    await send(self._not_modified(headers["etag"]))
+                else:
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or mode == "pass":
+                await send(message)
+            elif mode == "hash":
+                body.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                content = b"".join(body)
+                etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+                if etag_matches(if_none_match, etag):
+                    await send(self._not_modified(etag))
+                    await send({"type": "http.response.body", "body": b""})
+                    return
+                headers = MutableHeaders(raw=start["headers"])
+                headers["ETag"] = etag
+                headers["Cache-Control"] = "no-cache"
+                await send(start)
+                await send({"type": "http.response.body", "body": content})
+            elif not message.get("more_body", False):
+                # The 304 has been sent; end it once the original body is done
+                await send({"type": "http.response.body", "body": b""})
+
+        await self.app(scope, receive, send_conditional)
+
+    @staticmethod
+    def _not_modified(etag: str) -> dict:
+        """Start message of a 304 response for etag."""
+        return {
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [
+                (b"etag", etag.encode("latin-1")),
+                (b"cache-control", b"no-cache"),
+            ],
+        }
+
+
+# Global instance
+page_cache = PageCache()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .settings import settings
+
+
+class AWSExecutor:
+    """Bounded thread pool that runs blocking boto3 calls off the event loop."""
+
+    def __init__(self, max_workers: int = settings.AWS_MAX_CONCURRENCY, name: str = "aws"):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._max_queued = 0
+
+    def _call(self, func):
+        """Run func inside a worker thread, keeping the counters up to date."""
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+
+        try:
+            result = func()
+        except BaseException:
+            with self._lock:
+                self._active -= 1
+                self._failed += 1
+            raise
+
+        with self._lock:
+            self._active -= 1
+            self._completed += 1
+        return result
+
+    def _call_done(self, future):
+        """Take a call that was cancelled before a worker picked it up off the queue."""
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Run a blocking function in the AWS thread pool and await its result.
+
+        Cancelling the await (e.g. a wait_for timeout) drops the call if it is
+        still queued; a call already running finishes in its worker.
+
+        Args:
+            func: Callable to run (usually a service method)
+            *args: Positional arguments for the callable
+            **kwargs: Keyword arguments for the callable
+
+        Returns:
+            Whatever the callable returns; exceptions are re-raised in the caller
+        """
+        with self._lock:
+            self._queued += 1
+            self._max_queued = max(self._max_queued, self._queued)
+
+        future = self._pool.submit(self._call, partial(func, *args, **kwargs))
+        future.add_done_callback(self._call_done)
+        return await asyncio.wrap_future(future)
+
+    def metrics(self) -> dict:
+        """Snapshot of the executor's queue depth and throughput counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "max_queued": self._max_queued,
+            }
+
+    def shutdown(self):
+        """Stop accepting work and wait for in-flight calls to finish."""
+        self._pool.shutdown(wait=True)
+
+
+# Global instance
+aws_executor = AWSExecutor()
@@ -1,18 +1,22 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
 from starlette.applications import Starlette
 from starlette.middleware import Middleware
 from starlette.middleware.errors import ServerErrorMiddleware
 from starlette.responses import HTMLResponse, JSONResponse
 from starlette.routing import Route
 from starlette.staticfiles import StaticFiles
-from starlette.templating import Jinja2Templates
 
 from .aws_client import aws_client_factory
+from .caching import ConditionalGetMiddleware
+from .executor import aws_executor
 from .routes.lambda_routes import lambda_routes
 from .routes.s3 import s3_routes
 from .routes.stepfunctions_routes import stepfunctions_routes
+from .services.lambda_service import load_test_executor
 from .settings import settings
-
-templates = Jinja2Templates(directory="templates")
+from .templating import precompile_templates, templates
 
 
 async def homepage(request):
@@ -27,7 +31,8 @@ async def health_check(request):
 
 async def localstack_health(request):
     """Detailed health check for LocalStack services."""
-    health_status = aws_client_factory.health_check()
+    health = await aws_client_factory.get_health()
+    health_status = health["services"]
 
     # Determine overall status
     overall_healthy = all(service["status"] == "healthy" for service in health_status.values())
@@ -38,15 +43,22 @@ async def localstack_health(request):
         "status": "healthy" if overall_healthy else "unhealthy",
         "services": health_status,
         "endpoint": settings.LOCALSTACK_ENDPOINT,
+        "checked_at": health["checked_at"],
     }
 
     return JSONResponse(response_data, status_code=status_code)
 
 
+async def executor_metrics(request):
+    """Queue depth and throughput counters for the AWS executor."""
+    return JSONResponse(aws_executor.metrics())
+
+
 routes = [
     Route("/", homepage, name="home"),
     Route("/health", health_check, name="health"),
     Route("/health/localstack", localstack_health, name="localstack_health"),
+    Route("/health/executor", executor_metrics, name="executor_metrics"),
 ]
 
 # Add S3 routes
@@ -60,12 +72,31 @@ routes.extend(stepfunctions_routes)
 
 middleware = [
     Middleware(ServerErrorMiddleware, debug=settings.DEBUG),
+    Middleware(ConditionalGetMiddleware),
 ]
 
+
+@asynccontextmanager
+async def lifespan(app):
+    """Keep the LocalStack health cache warm and release AWS worker threads on shutdown."""
+    # Without auto-reload templates never change, so compile them all before serving
+    if not settings.DEBUG:
+        precompile_templates()
+    refresher = asyncio.create_task(aws_client_factory.refresh_health_forever())
+    yield
+    refresher.cancel()
+    with suppress(asyncio.CancelledError):
+        await refresher
+    aws_client_factory.shutdown()
+    load_test_executor.shutdown()
+    aws_executor.shutdown()
+
+
 app = Starlette(
     debug=settings.DEBUG,
     routes=routes,
     middleware=middleware,
+    lifespan=lifespan,
 )
 
 # Mount static files
@@ -1,79 +1,204 @@
-from starlette.routing import Route
-from starlette.templating import Jinja2Templates
+import json
 
-from ..services.lambda_service import LambdaServiceError, lambda_service
+from starlette.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.routing import Route
 
-templates = Jinja2Templates(directory="templates")
+from ..caching import page_cache
+from ..executor import aws_executor
+from ..services.lambda_service import LambdaServiceError, LoadTest, lambda_service
+from ..settings import settings
+from ..templating import templates
 
 
 async def list_functions(request):
-    """List all Lambda functions."""
+    """List Lambda functions one page at a time, served from the cached listing."""
     error_message = None
     functions = []
+    listed_at = None
     search_query = request.query_params.get("search", "").strip()
+    try:
+        page = max(1, int(request.query_params.get("page", 1)))
+    except ValueError:
+        page = 1
+    page_size = settings.LAMBDA_PAGE_SIZE
 
     try:
-        functions = lambda_service.list_functions()
+        listing = await lambda_service.get_functions()
+        listed_at = listing["listed_at"]
 
         # Apply search filter if provided
         if search_query:
-            functions = [
-                func
-                for func in functions
-                if search_query.lower() in func["function_name"].lower()
-                or search_query.lower() in func.get("description", "").lower()
-                or search_query.lower() in func.get("runtime", "").lower()
-            ]
+            functions = listing["index"].search(search_query)
+        else:
+            functions = listing["functions"]
     except LambdaServiceError as e:
         error_message = str(e)
 
-    return templates.TemplateResponse(
-        "lambda/functions.html",
-        {
-            "request": request,
-            "functions": functions,
-            "error_message": error_message,
-            "search_query": search_query,
-            "format_memory_size": lambda_service.format_memory_size,
-            "format_timeout": lambda_service.format_timeout,
-            "format_code_size": lambda_service.format_code_size,
-        },
+    total = len(functions)
+    page_count = max(1, (total + page_size - 1) // page_size)
+    page = min(page, page_count)
+
+    return page_cache.respond(
+        request,
+        # Function summaries carry CodeSha256 and LastModified; the listing time is shown
+        [functions[(page - 1) * page_size : page * page_size], total, listed_at, error_message],
+        lambda: templates.TemplateResponse(
+            "lambda/functions.html",
+            {
+                "request": request,
+                "functions": functions[(page - 1) * page_size : page * page_size],
+                "total": total,
+                "page": page,
+                "page_count": page_count,
+                "listed_at": listed_at,
+                "error_message": error_message,
+                "search_query": search_query,
+            },
+        ),
     )
 
 
+async def refresh_functions(request):
+    """Drop the cached function list and show a freshly listed one."""
+    lambda_service.invalidate_functions()
+    return RedirectResponse(url=request.url_for("lambda_functions"), status_code=302)
+
+
 async def function_detail(request):
     """Show details of a specific Lambda function."""
     function_name = request.path_params["function_name"]
+    refresh = request.query_params.get("refresh") == "1"
     error_message = None
     function_info = None
+    details = None
 
     try:
-        function_info = lambda_service.get_function(function_name)
-        if not function_info:
+        details = await lambda_service.get_function_details(function_name, refresh=refresh)
+        if not details:
             error_message = f"Lambda function '{function_name}' not found"
+        else:
+            function_info = details["function"]
     except LambdaServiceError as e:
         error_message = str(e)
 
-    return templates.TemplateResponse(
-        "lambda/function_detail.html",
-        {
-            "request": request,
-            "function_info": function_info,
-            "error_message": error_message,
-            "format_memory_size": lambda_service.format_memory_size,
-            "format_timeout": lambda_service.format_timeout,
-            "format_code_size": lambda_service.format_code_size,
-        },
+    return page_cache.respond(
+        request,
+        # Configuration (with CodeSha256), sections and when the function was fetched
+        [
+            details
+            and [
+                details["function"],
+                details["sections"],
+                details["section_errors"],
+                details["fetched_at"],
+            ],
+            error_message,
+        ],
+        lambda: templates.TemplateResponse(
+            "lambda/function_detail.html",
+            {
+                "request": request,
+                "function_info": function_info,
+                "details": details,
+                "error_message": error_message,
+                "max_invocations": settings.LAMBDA_LOAD_MAX_INVOCATIONS,
+                "max_concurrency": settings.LAMBDA_LOAD_MAX_CONCURRENCY,
+            },
+        ),
     )
 
 
+def _read_payload(form):
+    """
+    Validate the JSON payload field of an invoke form.
+
+    Returns:
+        Tuple of (payload_bytes, error_message)
+    """
+    payload = form.get("payload", "").strip() or "{}"
+    try:
+        json.loads(payload)
+    except json.JSONDecodeError as e:
+        return None, f"Payload is not valid JSON: {e}"
+    return payload.encode("utf-8"), None
+
+
+async def invoke_function(request):
+    """Invoke a Lambda function once with a JSON payload."""
+    function_name = request.path_params["function_name"]
+    form = await request.form()
+    payload, error_message = _read_payload(form)
+    if error_message:
+        return JSONResponse({"error": error_message}, status_code=400)
+
+    try:
+        result = await aws_executor.run(lambda_service.invoke, function_name, payload)
+    except LambdaServiceError as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+
+    return JSONResponse(result)
+
+
+async def load_test(request):
+    """
+    Invoke a Lambda function N times at concurrency C.
+
+    Streams newline-delimited JSON progress snapshots; the last has "done": true.
+    """
+    function_name = request.path_params["function_name"]
+    form = await request.form()
+    payload, error_message = _read_payload(form)
+    try:
+        count = int(form.get("count", 10))
+        concurrency = int(form.get("concurrency", 1))
+    except ValueError:
+        error_message = error_message or "Invocations and concurrency must be whole numbers"
+    else:
+        if not 1 <= count <= settings.LAMBDA_LOAD_MAX_INVOCATIONS:
+            error_message = (
+                f"Invocations must be between 1 and {settings.LAMBDA_LOAD_MAX_INVOCATIONS}"
+            )
+        elif not 1 <= concurrency <= settings.LAMBDA_LOAD_MAX_CONCURRENCY:
+            error_message = (
+                f"Concurrency must be between 1 and {settings.LAMBDA_LOAD_MAX_CONCURRENCY}"
+            )
+    if error_message:
+        return JSONResponse({"error": error_message}, status_code=400)
+
+    test = LoadTest(lambda_service, function_name, payload, count, concurrency)
+
+    async def snapshots():
+        async for snapshot in test.stream():
+            yield json.dumps(snapshot) + "\n"
+
+    return StreamingResponse(snapshots(), media_type="application/x-ndjson")
+
+
 # Lambda routes
 lambda_routes = [
     Route("/lambda/functions", list_functions, methods=["GET"], name="lambda_functions"),
+    Route(
+        "/lambda/functions/refresh",
+        refresh_functions,
+        methods=["POST"],
+        name="lambda_functions_refresh",
+    ),
     Route(
         "/lambda/functions/{function_name}",
         function_detail,
         methods=["GET"],
         name="lambda_function_detail",
     ),
+    Route(
+        "/lambda/functions/{function_name}/invoke",
+        invoke_function,
+        methods=["POST"],
+        name="lambda_invoke",
+    ),
+    Route(
+        "/lambda/functions/{function_name}/load-test",
+        load_test,
+        methods=["POST"],
+        name="lambda_load_test",
+    ),
 ]
@@ -1,10 +1,24 @@
-from starlette.responses import RedirectResponse, Response
-from starlette.routing import Route
-from starlette.templating import Jinja2Templates
+import time
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import urlencode
 
-from ..services.s3 import S3ServiceError, s3_service
+from python_multipart.multipart import MultipartParser, parse_options_header
+from starlette.responses import RedirectResponse, Response, StreamingResponse
+from starlette.routing import Route
 
-templates = Jinja2Templates(directory="templates")
+from ..caching import page_cache
+from ..executor import aws_executor
+from ..services.s3 import (
+    BulkDelete,
+    MultipartUpload,
+    S3ServiceError,
+    bucket_stats,
+    key_index,
+    s3_service,
+)
+from ..settings import settings
+from ..templating import templates
 
 
 async def list_buckets(request):
@@ -14,18 +28,22 @@ async def list_buckets(request):
     buckets = []
 
     try:
-        buckets = s3_service.list_buckets()
+        buckets = await aws_executor.run(s3_service.list_buckets)
     except S3ServiceError as e:
         error_message = str(e)
 
-    return templates.TemplateResponse(
-        "s3/buckets.html",
-        {
-            "request": request,
-            "buckets": buckets,
-            "error_message": error_message,
-            "success_message": success_message,
-        },
+    return page_cache.respond(
+        request,
+        {"buckets": buckets, "error": error_message},
+        lambda: templates.TemplateResponse(
+            "s3/buckets.html",
+            {
+                "request": request,
+                "buckets": buckets,
+                "error_message": error_message,
+                "success_message": success_message,
+            },
+        ),
     )
 
 
@@ -38,7 +56,7 @@ async def create_bucket(request):
     form = await request.form()
     bucket_name = form.get("bucket_name", "").strip()
 
-    success, error_message = s3_service.create_bucket(bucket_name)
+    success, error_message = await aws_executor.run(s3_service.create_bucket, bucket_name)
 
     if success:
         # Redirect to bucket list with success message
@@ -63,9 +81,29 @@ async def delete_bucket(request):
         )
 
     # Handle POST request (confirmation)
-    success, error_message = s3_service.delete_bucket(bucket_name)
+    form = await request.form()
+    if form.get("empty_first"):
+        # Remove every object first so the bucket can be deleted
+        bulk = BulkDelete(s3_service, bucket_name)
+        try:
+            await bulk.delete_prefix()
+        except S3ServiceError as e:
+            bulk.errors.append(str(e))
+        if bulk.errors:
+            return templates.TemplateResponse(
+                "s3/delete_bucket.html",
+                {
+                    "request": request,
+                    "bucket_name": bucket_name,
+                    "error_message": _bulk_delete_error(bulk),
+                },
+            )
+
+    success, error_message = await aws_executor.run(s3_service.delete_bucket, bucket_name)
 
     if success:
+        bucket_stats.invalidate(bucket_name)
+        key_index.invalidate(bucket_name)
         # Redirect to bucket list
         return RedirectResponse(url="/s3/buckets", status_code=302)
     else:
@@ -79,88 +117,340 @@ async def delete_bucket(request):
         )
 
 
-async def bucket_contents(request):
-    """Show contents of an S3 bucket."""
+async def bucket_statistics(request):
+    """Show storage statistics for an S3 bucket with a size breakdown by prefix."""
     bucket_name = request.path_params["bucket_name"]
+    try:
+        depth = int(request.query_params.get("depth", 2))
+    except ValueError:
+        depth = 2
+    depth = max(1, min(depth, settings.S3_STATS_MAX_DEPTH))
+
     error_message = None
-    objects = []
+    stats = None
 
     try:
-        objects = s3_service.list_objects(bucket_name)
+        # POST recomputes; GET serves the cached result when there is one
+        stats = await bucket_stats.get(bucket_name, refresh=request.method == "POST")
     except S3ServiceError as e:
         error_message = str(e)
 
+    if request.method == "POST" and not error_message:
+        return RedirectResponse(
+            url=f"/s3/buckets/{bucket_name}/stats?depth={depth}", status_code=302
+        )
+
+    rows = []
+    if stats:
+        total = stats["total_bytes"] or 1
+        rows = [
+            {"prefix": prefix, **node, "percent": node["bytes"] * 100 / total}
+            for prefix, node in stats["prefixes"].items()
+            if node["depth"] <= depth
+        ]
+
     return templates.TemplateResponse(
-        "s3/bucket_contents.html",
+        "s3/bucket_stats.html",
         {
             "request": request,
             "bucket_name": bucket_name,
-            "objects": objects,
+            "stats": stats,
+            "rows": rows,
+            "depth": depth,
+            "max_depth": settings.S3_STATS_MAX_DEPTH,
             "error_message": error_message,
-            "format_file_size": s3_service.format_file_size,
         },
     )
 
 
-async def upload_file(request):
-    """Upload a file to an S3 bucket."""
+async def bucket_contents(request):
+    """Show contents of an S3 bucket."""
     bucket_name = request.path_params["bucket_name"]
-
-    if request.method == "GET":
-        return templates.TemplateResponse(
-            "s3/upload_file.html", {"request": request, "bucket_name": bucket_name}
-        )
-
-    # Handle POST request
+    prefix = request.query_params.get("prefix", "")
+    cursor = request.query_params.get("cursor") or None
     try:
-        form = await request.form()
-        uploaded_file = form.get("file")
+        page_size = int(request.query_params.get("page_size", settings.S3_PAGE_SIZE))
+    except ValueError:
+        page_size = settings.S3_PAGE_SIZE
+    error_message = None
+    page = {
+        "objects": [],
+        "folders": [],
+        "cursor": cursor,
+        "next_cursor": None,
+        "previous_cursor": None,
+    }
+
+    sort = request.query_params.get("sort", "")
+    if sort not in s3_service.TOP_SORTS:
+        sort = ""
+    query = request.query_params.get("q", "").strip()
+    search = None
 
-        if not uploaded_file or not uploaded_file.filename:
-            return templates.TemplateResponse(
-                "s3/upload_file.html",
-                {
-                    "request": request,
-                    "bucket_name": bucket_name,
-                    "error_message": "No file selected",
-                },
+    try:
+        if query:
+            # Substring search over every key under the prefix, from the key index
+            started = time.perf_counter()
+            page["objects"], total, index = await key_index.search(
+                bucket_name, query, prefix=prefix, limit=max(1, min(page_size, 1000))
             )
+            search = {
+                "total": total,
+                "indexed_keys": len(index.keys),
+                "elapsed_ms": (time.perf_counter() - started) * 1000,
+            }
+        elif sort:
+            # Top-N report over everything under the prefix, not one folder level
+            page["objects"] = await aws_executor.run(
+                s3_service.top_objects,
+                bucket_name,
+                sort=sort,
+                limit=max(1, min(page_size, 1000)),
+                prefix=prefix,
+            )
+        else:
+            page = await aws_executor.run(
+                s3_service.list_objects,
+                bucket_name,
+                prefix=prefix,
+                cursor=cursor,
+                page_size=page_size,
+                delimiter="/",
+            )
+    except S3ServiceError as e:
+        error_message = str(e)
 
-        # Read file data
-        file_data = await uploaded_file.read()
-        file_key = uploaded_file.filename
+    return page_cache.respond(
+        request,
+        # The listing itself (keys, ETags, LastModified, cursors) and the search it came from
+        {"page": page, "search": search, "error": error_message},
+        lambda: templates.TemplateResponse(
+            "s3/bucket_contents.html",
+            {
+                "request": request,
+                "bucket_name": bucket_name,
+                "prefix": prefix,
+                "breadcrumbs": s3_service.prefix_breadcrumbs(prefix),
+                "objects": page["objects"],
+                "folders": page["folders"],
+                "cursor": page["cursor"],
+                "next_cursor": page["next_cursor"],
+                "previous_cursor": page["previous_cursor"],
+                "page_size": page_size,
+                "sort": sort,
+                "query": query,
+                "search": search,
+                "max_file_size": s3_service.format_file_size(settings.MAX_FILE_SIZE_BYTES),
+                "error_message": error_message,
+            },
+        ),
+    )
 
-        success, error_message = s3_service.upload_file(bucket_name, file_key, file_data)
 
-        if success:
-            return RedirectResponse(url=f"/s3/buckets/{bucket_name}/contents", status_code=302)
-        else:
-            return templates.TemplateResponse(
-                "s3/upload_file.html",
-                {
-                    "request": request,
-                    "bucket_name": bucket_name,
-                    "error_message": error_message,
-                },
-            )
+async def _iter_multipart(request):
+    """
+    Parse a multipart/form-data body as it arrives, without buffering it.
+
+    Yields:
+        ("headers", dict) at the start of each part, ("data", bytes) for its
+        content and ("end", None) when the part is finished
+    """
+    _, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise ValueError("Missing multipart boundary")
+
+    events = []
+    header = {"field": b"", "value": b""}
+    part_headers = {}
+
+    def on_header_field(data, start, end):
+        header["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header["value"] += data[start:end]
+
+    def on_header_end():
+        part_headers[header["field"].decode("latin-1").lower()] = header["value"]
+        header["field"] = b""
+        header["value"] = b""
+
+    def on_headers_finished():
+        events.append(("headers", dict(part_headers)))
+        part_headers.clear()
+
+    def on_part_data(data, start, end):
+        events.append(("data", bytes(data[start:end])))
+
+    def on_part_end():
+        events.append(("end", None))
+
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },
+    )
+
+    async for chunk in request.stream():
+        parser.write(chunk)
+        for event in events:
+            yield event
+        events.clear()
+    parser.finalize()
+    for event in events:
+        yield event
+
+
+async def _stream_upload(request, bucket_name):
+    """
+    Stream the "file" field of an upload form into S3.
+
+    Returns:
+        Tuple of (success, error_message)
+    """
+    upload = None
+    in_file_field = False
+
+    try:
+        async for event, payload in _iter_multipart(request):
+            if event == "headers":
+                _, disposition = parse_options_header(payload.get("content-disposition", b""))
+                filename = disposition.get(b"filename", b"").decode("utf-8", "replace")
+                in_file_field = disposition.get(b"name") == b"file" and upload is None
+                if in_file_field and filename:
+                    content_type = payload.get("content-type", b"").decode("latin-1") or None
+                    upload = MultipartUpload(s3_service, bucket_name, filename, content_type)
+                else:
+                    in_file_field = False
+            elif event == "data" and in_file_field:
+                await upload.write(payload)
+            elif event == "end":
+                in_file_field = False
+
+        if upload is None:
+            return False, "No file selected"
+
+        await upload.complete()
+        return True, None
 
     except Exception as e:
+        if upload is not None:
+            try:
+                await upload.abort()
+            except S3ServiceError:
+                # The original error is more useful to the user
+                pass
+        return False, f"Upload failed: {e}"
+
+
+async def upload_file(request):
+    """Upload a file to an S3 bucket, streaming it straight into a multipart upload."""
+    bucket_name = request.path_params["bucket_name"]
+    limits = {
+        "max_file_size": s3_service.format_file_size(settings.MAX_FILE_SIZE_BYTES),
+        "max_file_size_bytes": settings.MAX_FILE_SIZE_BYTES,
+    }
+
+    if request.method == "GET":
+        presigned_post = None
+        error_message = None
+        if settings.S3_PRESIGNED_URLS:
+            # The browser posts the file straight to LocalStack, which redirects back here
+            redirect_url = str(request.url_for("s3_bucket_contents", bucket_name=bucket_name))
+            try:
+                presigned_post = await aws_executor.run(
+                    s3_service.presigned_upload_post, bucket_name, redirect_url
+                )
+            except S3ServiceError as e:
+                error_message = str(e)
+
         return templates.TemplateResponse(
             "s3/upload_file.html",
             {
                 "request": request,
                 "bucket_name": bucket_name,
-                "error_message": f"Upload failed: {e}",
+                "presigned_post": presigned_post,
+                "error_message": error_message,
+                **limits,
             },
         )
 
+    # Handle POST request
+    success, error_message = await _stream_upload(request, bucket_name)
+    key_index.mark_stale(bucket_name)
+    bucket_stats.invalidate(bucket_name)
+
+    if success:
+        return RedirectResponse(url=f"/s3/buckets/{bucket_name}/contents", status_code=302)
+    else:
+        return templates.TemplateResponse(
+            "s3/upload_file.html",
+            {
+                "request": request,
+                "bucket_name": bucket_name,
+                "error_message": error_message,
+                **limits,
+            },
+        )
+
+
+async def _stream_body(body):
+    """Yield a botocore stream chunk by chunk, reading on the AWS executor."""
+    try:
+        while chunk := await aws_executor.run(s3_service.read_chunk, body):
+            yield chunk
+    finally:
+        body.close()
+
 
 async def download_file(request):
-    """Download a file from an S3 bucket."""
+    """
+    Download a file from an S3 bucket.
+
+    Redirects to a presigned URL in S3_PRESIGNED_URLS mode, otherwise streams the
+    file, honouring Range and conditional GET headers.
+    """
     bucket_name = request.path_params["bucket_name"]
     file_key = request.path_params["file_key"]
 
-    success, file_data, error_message = s3_service.download_file(bucket_name, file_key)
+    if settings.S3_PRESIGNED_URLS:
+        # Hand the transfer to LocalStack; it handles Range and conditional headers itself
+        try:
+            url = await aws_executor.run(s3_service.presigned_download_url, bucket_name, file_key)
+            return RedirectResponse(url=url, status_code=307)
+        except S3ServiceError as e:
+            return templates.TemplateResponse(
+                "s3/bucket_contents.html",
+                {
+                    "request": request,
+                    "bucket_name": bucket_name,
+                    "objects": [],
+                    "error_message": str(e),
+                },
+            )
+
+    if_modified_since = None
+    if "if-modified-since" in request.headers:
+        try:
+            if_modified_since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            # Ignore malformed dates, as HTTP requires
+            if_modified_since = None
+
+    success, download, error_message = await aws_executor.run(
+        s3_service.download_file,
+        bucket_name,
+        file_key,
+        byte_range=request.headers.get("range"),
+        if_none_match=request.headers.get("if-none-match"),
+        if_modified_since=if_modified_since,
+    )
 
     if not success:
         return templates.TemplateResponse(
@@ -170,33 +460,32 @@ async def download_file(request):
                 "bucket_name": bucket_name,
                 "objects": [],
                 "error_message": error_message,
-                "format_file_size": s3_service.format_file_size,
             },
         )
 
-    # Determine content type
-    content_type = "application/octet-stream"
-    if "." in file_key:
-        extension = file_key.split(".")[-1].lower()
-        content_types = {
-            "txt": "text/plain",
-            "json": "application/json",
-            "csv": "text/csv",
-            "html": "text/html",
-            "css": "text/css",
-            "js": "application/javascript",
-            "png": "image/png",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "gif": "image/gif",
-            "pdf": "application/pdf",
-        }
-        content_type = content_types.get(extension, "application/octet-stream")
-
-    return Response(
-        content=file_data,
-        media_type=content_type,
-        headers={"Content-Disposition": f'attachment; filename="{file_key}"'},
+    headers = {"Accept-Ranges": "bytes"}
+    if download["etag"]:
+        headers["ETag"] = download["etag"]
+    if download["last_modified"]:
+        last_modified = download["last_modified"].astimezone(timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    if download["content_range"]:
+        headers["Content-Range"] = download["content_range"]
+
+    if download["body"] is None:
+        # 304 Not Modified or 416 Range Not Satisfiable
+        return Response(status_code=download["status_code"], headers=headers)
+
+    filename = file_key.rsplit("/", 1)[-1]
+    headers["Content-Type"] = download["content_type"]
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    if download["content_length"] is not None:
+        headers["Content-Length"] = str(download["content_length"])
+
+    return StreamingResponse(
+        _stream_body(download["body"]),
+        status_code=download["status_code"],
+        headers=headers,
     )
 
 
@@ -213,7 +502,9 @@ async def delete_file(request):
         )
 
     # Handle POST request (confirmation)
-    success, error_message = s3_service.delete_file(bucket_name, file_key)
+    success, error_message = await aws_executor.run(s3_service.delete_file, bucket_name, file_key)
+    key_index.mark_stale(bucket_name)
+    bucket_stats.invalidate(bucket_name)
 
     if success:
         return RedirectResponse(url=f"/s3/buckets/{bucket_name}/contents", status_code=302)
@@ -229,6 +520,93 @@ async def delete_file(request):
         )
 
 
+def _bulk_delete_error(bulk):
+    """Summarise the failures of a bulk delete for display."""
+    return (
+        f"Deleted {bulk.deleted} file(s), but {len(bulk.errors)} error(s) occurred. "
+        f"First error: {bulk.errors[0]}"
+    )
+
+
+def _contents_url(bucket_name, prefix=""):
+    """URL of the contents page for a bucket folder."""
+    url = f"/s3/buckets/{bucket_name}/contents"
+    if prefix:
+        url += "?" + urlencode({"prefix": prefix})
+    return url
+
+
+async def delete_files(request):
+    """Delete the files selected on the bucket contents page."""
+    bucket_name = request.path_params["bucket_name"]
+    form = await request.form()
+    keys = form.getlist("keys")
+    prefix = form.get("prefix", "")
+
+    bulk = BulkDelete(s3_service, bucket_name)
+    await bulk.delete_keys(keys)
+    key_index.mark_stale(bucket_name)
+    bucket_stats.invalidate(bucket_name)
+
+    if not bulk.errors:
+        return RedirectResponse(url=_contents_url(bucket_name, prefix), status_code=302)
+    else:
+        return templates.TemplateResponse(
+            "s3/delete_prefix.html",
+            {
+                "request": request,
+                "bucket_name": bucket_name,
+                "prefix": prefix,
+                "error_message": _bulk_delete_error(bulk),
+            },
+        )
+
+
+async def delete_prefix(request):
+    """Delete every file in a folder (all files under a key prefix)."""
+    bucket_name = request.path_params["bucket_name"]
+
+    if request.method == "GET":
+        # Show confirmation page
+        return templates.TemplateResponse(
+            "s3/delete_prefix.html",
+            {
+                "request": request,
+                "bucket_name": bucket_name,
+                "prefix": request.query_params.get("prefix", ""),
+            },
+        )
+
+    # Handle POST request (confirmation)
+    form = await request.form()
+    prefix = form.get("prefix", "")
+
+    bulk = BulkDelete(s3_service, bucket_name)
+    try:
+        await bulk.delete_prefix(prefix)
+    except S3ServiceError as e:
+        bulk.errors.append(str(e))
+    key_index.mark_stale(bucket_name)
+    bucket_stats.invalidate(bucket_name)
+
+    if not bulk.errors:
+        # Go back to the folder that contained the deleted one
+        parent = prefix.rstrip("/").rpartition("/")[0]
+        return RedirectResponse(
+            url=_contents_url(bucket_name, parent + "/" if parent else ""), status_code=302
+        )
+    else:
+        return templates.TemplateResponse(
+            "s3/delete_prefix.html",
+            {
+                "request": request,
+                "bucket_name": bucket_name,
+                "prefix": prefix,
+                "error_message": _bulk_delete_error(bulk),
+            },
+        )
+
+
 # S3 routes
 s3_routes = [
     Route("/s3/buckets", list_buckets, methods=["GET"], name="s3_buckets"),
@@ -251,6 +629,24 @@ s3_routes = [
         methods=["GET", "POST"],
         name="s3_upload_file",
     ),
+    Route(
+        "/s3/buckets/{bucket_name}/stats",
+        bucket_statistics,
+        methods=["GET", "POST"],
+        name="s3_bucket_stats",
+    ),
+    Route(
+        "/s3/buckets/{bucket_name}/delete-files",
+        delete_files,
+        methods=["POST"],
+        name="s3_delete_files",
+    ),
+    Route(
+        "/s3/buckets/{bucket_name}/delete-prefix",
+        delete_prefix,
+        methods=["GET", "POST"],
+        name="s3_delete_prefix",
+    ),
     Route(
         "/s3/buckets/{bucket_name}/files/{file_key:path}/download",
         download_file,
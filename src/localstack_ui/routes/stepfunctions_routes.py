@@ -1,79 +1,443 @@
-from starlette.routing import Route
-from starlette.templating import Jinja2Templates
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
 
-from ..services.stepfunctions_service import StepFunctionsServiceError, stepfunctions_service
+from starlette.responses import JSONResponse, RedirectResponse, StreamingResponse
+from starlette.routing import Route
 
-templates = Jinja2Templates(directory="templates")
+from ..caching import page_cache
+from ..executor import aws_executor
+from ..services import json_view
+from ..services.stepfunctions_service import (
+    ExecutionBatch,
+    StepFunctionsServiceError,
+    execution_stats,
+    stepfunctions_service,
+)
+from ..settings import settings
+from ..templating import templates
 
 
 async def list_state_machines(request):
-    """List all Step Functions state machines."""
+    """List Step Functions state machines one page at a time, with their latest execution."""
     error_message = None
     state_machines = []
+    latest_executions = {}
     search_query = request.query_params.get("search", "").strip()
+    try:
+        page = max(1, int(request.query_params.get("page", 1)))
+    except ValueError:
+        page = 1
+    page_size = settings.STEPFUNCTIONS_PAGE_SIZE
 
     try:
-        state_machines = stepfunctions_service.list_state_machines()
+        listing = await stepfunctions_service.get_state_machines()
 
         # Apply search filter if provided
         if search_query:
-            state_machines = [
-                sm
-                for sm in state_machines
-                if search_query.lower() in sm["name"].lower()
-                or search_query.lower() in sm.get("type", "").lower()
-                or search_query.lower() in sm.get("status", "").lower()
-            ]
+            state_machines = listing["index"].search(search_query)
+        else:
+            state_machines = listing["state_machines"]
     except StepFunctionsServiceError as e:
         error_message = str(e)
 
+    total = len(state_machines)
+    page_count = max(1, (total + page_size - 1) // page_size)
+    page = min(page, page_count)
+    state_machines = state_machines[(page - 1) * page_size : page * page_size]
+
+    if state_machines:
+        # Only the machines on this page need their latest execution
+        latest_executions = await stepfunctions_service.get_latest_executions(
+            [sm["arn"] for sm in state_machines]
+        )
+
+    return page_cache.respond(
+        request,
+        [state_machines, latest_executions, total, error_message],
+        lambda: templates.TemplateResponse(
+            "stepfunctions/state_machines.html",
+            {
+                "request": request,
+                "state_machines": state_machines,
+                "latest_executions": latest_executions,
+                "total": total,
+                "page": page,
+                "page_count": page_count,
+                "error_message": error_message,
+                "search_query": search_query,
+            },
+        ),
+    )
+
+
+async def refresh_state_machines(request):
+    """Drop the cached state machine list and show a freshly listed one."""
+    stepfunctions_service.invalidate_state_machines()
+    return RedirectResponse(url=request.url_for("stepfunctions_state_machines"), status_code=302)
+
+
+async def state_machine_detail(request):
+    """Show details of a specific Step Functions state machine."""
+    state_machine_arn = request.path_params["state_machine_arn"]
+    error_message = None
+    state_machine_info = None
+    executions = []
+
+    # Describe the machine and list its recent executions concurrently
+    described, listed = await asyncio.gather(
+        aws_executor.run(stepfunctions_service.describe_state_machine, state_machine_arn),
+        aws_executor.run(stepfunctions_service.list_executions, state_machine_arn, 5),
+        return_exceptions=True,
+    )
+
+    if isinstance(described, StepFunctionsServiceError):
+        error_message = str(described)
+    elif isinstance(described, BaseException):
+        raise described
+    elif not described:
+        error_message = "State machine not found"
+    else:
+        state_machine_info = described
+        # Ignore execution listing errors - just show empty list
+        if not isinstance(listed, BaseException):
+            executions = listed
+
+    return page_cache.respond(
+        request,
+        # The definition hash stands in for the definition and its graph
+        [
+            state_machine_info
+            and {
+                key: value
+                for key, value in state_machine_info.items()
+                if key not in ("definition", "definition_dict", "definition_formatted", "graph_svg")
+            },
+            executions,
+            error_message,
+        ],
+        lambda: templates.TemplateResponse(
+            "stepfunctions/state_machine_detail.html",
+            {
+                "request": request,
+                "state_machine_info": state_machine_info,
+                "executions": executions,
+                "error_message": error_message,
+                "max_executions": settings.STEPFUNCTIONS_BATCH_MAX_EXECUTIONS,
+                "max_concurrency": settings.STEPFUNCTIONS_BATCH_MAX_CONCURRENCY,
+            },
+        ),
+    )
+
+
+async def run_batch(request):
+    """
+    Start N executions of a state machine from an input template.
+
+    Streams newline-delimited JSON progress snapshots; the last has "done": true.
+    """
+    state_machine_arn = request.path_params["state_machine_arn"]
+    form = await request.form()
+    input_template = form.get("input", "").strip() or "{}"
+    error_message = None
+    try:
+        count = int(form.get("count", 10))
+        concurrency = int(form.get("concurrency", 1))
+        rate = float(form.get("rate") or 0)
+    except ValueError:
+        error_message = "Executions, concurrency and rate must be numbers"
+    else:
+        if not 1 <= count <= settings.STEPFUNCTIONS_BATCH_MAX_EXECUTIONS:
+            error_message = (
+                f"Executions must be between 1 and {settings.STEPFUNCTIONS_BATCH_MAX_EXECUTIONS}"
+            )
+        elif not 1 <= concurrency <= settings.STEPFUNCTIONS_BATCH_MAX_CONCURRENCY:
+            error_message = (
+                f"Concurrency must be between 1 and {settings.STEPFUNCTIONS_BATCH_MAX_CONCURRENCY}"
+            )
+        elif rate < 0:
+            error_message = "Rate must be 0 (unlimited) or more executions per second"
+    if error_message:
+        return JSONResponse({"error": error_message}, status_code=400)
+
+    batch = ExecutionBatch(
+        stepfunctions_service, state_machine_arn, input_template, count, concurrency, rate
+    )
+    # Check the template once, with its variables filled in
+    try:
+        json.loads(batch.render_input(1))
+    except ValueError as e:
+        return JSONResponse({"error": f"Input is not valid JSON: {e}"}, status_code=400)
+
+    async def snapshots():
+        async for snapshot in batch.stream():
+            yield json.dumps(snapshot) + "\n"
+
+    return StreamingResponse(snapshots(), media_type="application/x-ndjson")
+
+
+# Status tabs of the execution browser
+EXECUTION_STATUSES = ["RUNNING", "FAILED", "SUCCEEDED", "TIMED_OUT", "ABORTED"]
+
+
+def _parse_day(value: str) -> datetime:
+    """Parse a YYYY-MM-DD query parameter as midnight UTC."""
+    return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+
+
+async def list_executions(request):
+    """
+    Browse a state machine's executions one page at a time.
+
+    ?status= is passed to ListExecutions as its status filter; ?since= and
+    ?until= (YYYY-MM-DD, UTC, inclusive) limit the start date. ?token= is the
+    ListExecutions token of the page to show.
+    """
+    state_machine_arn = request.path_params["state_machine_arn"]
+    error_message = None
+    executions = []
+    next_token = None
+
+    status = request.query_params.get("status", "").upper()
+    if status not in EXECUTION_STATUSES:
+        status = ""
+    since = request.query_params.get("since", "").strip()
+    until = request.query_params.get("until", "").strip()
+    token = request.query_params.get("token") or None
+
+    try:
+        started_after = _parse_day(since) if since else None
+        started_before = _parse_day(until) + timedelta(days=1) if until else None
+    except ValueError:
+        error_message = "Dates must be in YYYY-MM-DD format"
+    else:
+        try:
+            executions, next_token = await aws_executor.run(
+                stepfunctions_service.list_executions_page,
+                state_machine_arn,
+                status or None,
+                token,
+                settings.STEPFUNCTIONS_EXECUTIONS_PAGE_SIZE,
+                started_after,
+                started_before,
+            )
+        except StepFunctionsServiceError as e:
+            error_message = str(e)
+
     return templates.TemplateResponse(
-        "stepfunctions/state_machines.html",
+        "stepfunctions/executions.html",
         {
             "request": request,
-            "state_machines": state_machines,
+            "state_machine_arn": state_machine_arn,
+            "state_machine_name": state_machine_arn.split(":")[-1],
+            "executions": executions,
+            "statuses": EXECUTION_STATUSES,
+            "status": status,
+            "since": since,
+            "until": until,
+            "first_page": token is None,
+            "next_token": next_token,
             "error_message": error_message,
-            "search_query": search_query,
-            "format_date": stepfunctions_service.format_date,
         },
     )
 
 
-async def state_machine_detail(request):
-    """Show details of a specific Step Functions state machine."""
+# Windows offered by the statistics page: executions counts and hours
+STATS_LIMITS = [50, 100, 500, 1000]
+STATS_HOURS = [1, 24, 168]
+
+
+async def execution_statistics(request):
+    """
+    Show success rate, durations and failures of a state machine's executions.
+
+    Covers the newest ?limit= executions (default 100) or, with ?hours=, those
+    started in that many past hours.
+    """
     state_machine_arn = request.path_params["state_machine_arn"]
     error_message = None
-    state_machine_info = None
-    executions = []
+    stats = None
+    limit = None
+    hours = None
+    since = None
+    status_code = 200
 
     try:
-        state_machine_info = stepfunctions_service.describe_state_machine(state_machine_arn)
-        if not state_machine_info:
-            error_message = "State machine not found"
+        hours = int(request.query_params["hours"]) if "hours" in request.query_params else None
+        limit = int(request.query_params.get("limit", 100))
+        if (hours is not None and hours < 1) or limit < 1:
+            raise ValueError
+    except ValueError:
+        error_message = "Hours and limit must be positive whole numbers"
+        status_code = 400
+    else:
+        if hours:
+            # A time window replaces the execution count
+            limit = None
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
         else:
-            # Try to get recent executions
-            try:
-                executions = stepfunctions_service.list_executions(state_machine_arn, 5)
-            except StepFunctionsServiceError:
-                # Ignore execution listing errors - just show empty list
-                executions = []
+            limit = min(limit, settings.STEPFUNCTIONS_STATS_MAX_EXECUTIONS)
+        try:
+            stats = await execution_stats.get(state_machine_arn, limit=limit, since=since)
+        except StepFunctionsServiceError as e:
+            error_message = str(e)
+
+    max_count = max((bucket["count"] for bucket in stats["histogram"]), default=0) if stats else 0
+
+    return templates.TemplateResponse(
+        "stepfunctions/execution_stats.html",
+        {
+            "request": request,
+            "state_machine_arn": state_machine_arn,
+            "state_machine_name": state_machine_arn.split(":")[-1],
+            "stats": stats,
+            "max_count": max_count,
+            "limit": limit,
+            "hours": hours,
+            "limits": [n for n in STATS_LIMITS if n <= settings.STEPFUNCTIONS_STATS_MAX_EXECUTIONS],
+            "hour_options": STATS_HOURS,
+            "max_executions": settings.STEPFUNCTIONS_STATS_MAX_EXECUTIONS,
+            "error_message": error_message,
+        },
+        status_code=status_code,
+    )
+
+
+async def execution_detail(request):
+    """Show an execution's status; its history is streamed by execution_events."""
+    execution_arn = request.path_params["execution_arn"]
+    error_message = None
+    execution = None
+
+    try:
+        execution = await aws_executor.run(stepfunctions_service.describe_execution, execution_arn)
+        if not execution:
+            error_message = "Execution not found"
     except StepFunctionsServiceError as e:
         error_message = str(e)
 
     return templates.TemplateResponse(
-        "stepfunctions/state_machine_detail.html",
+        "stepfunctions/execution_detail.html",
         {
             "request": request,
-            "state_machine_info": state_machine_info,
-            "executions": executions,
+            "execution": execution,
+            "execution_arn": execution_arn,
             "error_message": error_message,
-            "format_date": stepfunctions_service.format_date,
-            "get_state_count": stepfunctions_service.get_state_count,
-            "get_state_types": stepfunctions_service.get_state_types,
         },
     )
 
 
+async def execution_events(request):
+    """
+    Stream an execution's history as newline-delimited JSON, one line per page.
+
+    ?reverse=1 sends the newest events first; ?follow=1 keeps tailing a running
+    execution, sending new events with "tail": true. The last line is either
+    {"done": true} or {"error": ...}.
+    """
+    execution_arn = request.path_params["execution_arn"]
+    reverse = request.query_params.get("reverse") == "1"
+    follow = request.query_params.get("follow") == "1"
+
+    async def pages():
+        try:
+            async for events, tailed in stepfunctions_service.iter_execution_history(
+                execution_arn, reverse=reverse, follow=follow
+            ):
+                yield json.dumps({"events": events, "tail": tailed}, default=str) + "\n"
+        except StepFunctionsServiceError as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps({"done": True}) + "\n"
+
+    return StreamingResponse(pages(), media_type="application/x-ndjson")
+
+
+# Children listed per level of the payload viewer
+PAYLOAD_MAX_CHILDREN = 100
+
+
+async def execution_payload(request):
+    """
+    Return a payload of an execution for the lazy payload viewer.
+
+    ?source= is "input", "output" or a history event id, with ?field= naming
+    the event's payload (input, output or parameters). ?path= selects a part
+    of a JSON payload, e.g. $.items[0]. The pretty-printed text is cut at
+    STEPFUNCTIONS_PAYLOAD_PREVIEW_BYTES characters unless ?full=1.
+    """
+    execution_arn = request.path_params["execution_arn"]
+    source = request.query_params.get("source", "input")
+    field = request.query_params.get("field", "input")
+    path = request.query_params.get("path", "$").strip() or "$"
+    full = request.query_params.get("full") == "1"
+
+    if source not in ("input", "output") and not source.isdigit():
+        return JSONResponse(
+            {"error": "source must be input, output or an event id"},
+            status_code=400,
+        )
+    if source.isdigit() and field not in stepfunctions_service.PAYLOAD_FIELDS:
+        return JSONResponse(
+            {"error": f"field must be one of {', '.join(stepfunctions_service.PAYLOAD_FIELDS)}"},
+            status_code=400,
+        )
+
+    try:
+        payload = await aws_executor.run(
+            stepfunctions_service.get_payload, execution_arn, source, field
+        )
+    except StepFunctionsServiceError as e:
+        return JSONResponse({"error": str(e)}, status_code=502)
+    if payload is None:
+        return JSONResponse({"error": "Payload not found"}, status_code=404)
+    if payload["raw"] is None:
+        return JSONResponse(
+            {
+                "path": "$",
+                "type": "none",
+                "size": 0,
+                "text": "",
+                "truncated": False,
+                "children": [],
+                "more_children": 0,
+            }
+        )
+
+    if payload["is_json"]:
+        try:
+            value = json_view.resolve(payload["value"], json_view.parse_path(path))
+        except ValueError as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        # The whole payload's pretty form is cached; parts are formatted on demand
+        text = payload["pretty"] if path == "$" else json.dumps(value, indent=2, ensure_ascii=False)
+        value_type = json_view.value_type(value)
+        children, more_children = json_view.children(value, path, PAYLOAD_MAX_CHILDREN)
+    else:
+        path = "$"
+        text = payload["pretty"]
+        value_type = "text"
+        children, more_children = [], 0
+
+    size = len(text)
+    if not full:
+        text, truncated = json_view.preview(text, settings.STEPFUNCTIONS_PAYLOAD_PREVIEW_BYTES)
+    else:
+        truncated = False
+
+    return JSONResponse(
+        {
+            "path": path,
+            "type": value_type,
+            "size": size,
+            "text": text,
+            "truncated": truncated,
+            "children": children,
+            "more_children": more_children,
+        }
+    )
+
+
 # Step Functions routes
 stepfunctions_routes = [
     Route(
@@ -82,10 +446,54 @@ stepfunctions_routes = [
         methods=["GET"],
         name="stepfunctions_state_machines",
     ),
+    Route(
+        "/stepfunctions/state-machines/refresh",
+        refresh_state_machines,
+        methods=["POST"],
+        name="stepfunctions_state_machines_refresh",
+    ),
+    # These routes must come first: the state machine ARN path swallows their suffixes
+    Route(
+        "/stepfunctions/state-machines/{state_machine_arn:path}/executions",
+        list_executions,
+        methods=["GET"],
+        name="stepfunctions_executions",
+    ),
+    Route(
+        "/stepfunctions/state-machines/{state_machine_arn:path}/stats",
+        execution_statistics,
+        methods=["GET"],
+        name="stepfunctions_stats",
+    ),
+    Route(
+        "/stepfunctions/state-machines/{state_machine_arn:path}/batch",
+        run_batch,
+        methods=["POST"],
+        name="stepfunctions_batch",
+    ),
     Route(
         "/stepfunctions/state-machines/{state_machine_arn:path}",
         state_machine_detail,
         methods=["GET"],
         name="stepfunctions_state_machine_detail",
     ),
+    # These routes must come first: the execution ARN path swallows their suffixes
+    Route(
+        "/stepfunctions/executions/{execution_arn:path}/events",
+        execution_events,
+        methods=["GET"],
+        name="stepfunctions_execution_events",
+    ),
+    Route(
+        "/stepfunctions/executions/{execution_arn:path}/payload",
+        execution_payload,
+        methods=["GET"],
+        name="stepfunctions_execution_payload",
+    ),
+    Route(
+        "/stepfunctions/executions/{execution_arn:path}",
+        execution_detail,
+        methods=["GET"],
+        name="stepfunctions_execution_detail",
+    ),
 ]
@@ -0,0 +1,300 @@
+from html import escape
+from typing import Dict, List, Optional, Tuple
+
+# Bump when the drawing changes, so cached SVGs of the old layout are not reused
+LAYOUT_VERSION = 1
+
+NODE_WIDTH = 180
+NODE_HEIGHT = 40
+H_GAP = 24
+V_GAP = 40
+PADDING = 16
+HEADER = 28
+MARGIN = 20
+START_RADIUS = 8
+MAX_LABEL = 24
+
+# Fill and stroke colors per state type
+STATE_COLORS = {
+    "Task": ("#e8f1fd", "#3273dc"),
+    "Choice": ("#fff6e5", "#f29900"),
+    "Pass": ("#f5f5f5", "#7a7a7a"),
+    "Wait": ("#f3ecfb", "#8a4fd3"),
+    "Succeed": ("#effaf3", "#48c78e"),
+    "Fail": ("#feecf0", "#f14668"),
+    "Parallel": ("#fafafa", "#4a4a4a"),
+    "Map": ("#fafafa", "#4a4a4a"),
+}
+
+
+class _Node:
+    """One state; Parallel and Map states hold the blocks of their branches."""
+
+    def __init__(self, name: str, state: Dict):
+        self.name = name
+        self.state = state
+        self.type = state.get("Type", "Unknown")
+        self.children = [_layout(branch) for branch in _branches(state)]
+        if self.children:
+            self.width = max(
+                NODE_WIDTH,
+                sum(child.width for child in self.children)
+                + H_GAP * (len(self.children) - 1)
+                + 2 * PADDING,
+            )
+            self.height = HEADER + max(child.height for child in self.children) + PADDING
+        else:
+            self.width = NODE_WIDTH
+            self.height = NODE_HEIGHT
+        self.x = 0
+        self.y = 0
+
+
+class _Block:
+    """A StartAt/States workflow: the top level or one Parallel/Map branch."""
+
+    def __init__(self, start_at: str, nodes: Dict[str, _Node], rows: List[List[str]]):
+        self.start_at = start_at
+        self.nodes = nodes
+        self.rows = rows
+        self.row_heights = [max(nodes[name].height for name in row) for row in rows]
+        self.width = max(
+            [NODE_WIDTH]
+            + [sum(nodes[name].width for name in row) + H_GAP * (len(row) - 1) for row in rows]
+        )
+        self.height = sum(self.row_heights) + V_GAP * max(0, len(rows) - 1)
+
+
+def _branches(state: Dict) -> List[Dict]:
+    """The nested workflows of a Parallel or Map state."""
+    if state.get("Type") == "Parallel":
+        return [branch for branch in state.get("Branches", []) if isinstance(branch, dict)]
+    if state.get("Type") == "Map":
+        # ItemProcessor replaced Iterator; accept either
+        processor = state.get("ItemProcessor") or state.get("Iterator")
+        if isinstance(processor, dict):
+            return [processor]
+    return []
+
+
+def _transitions(state: Dict) -> List[Tuple[str, str]]:
+    """(target, kind) of every transition out of a state; kind is next/choice/catch."""
+    transitions = []
+    if state.get("Next"):
+        transitions.append((state["Next"], "next"))
+    for rule in state.get("Choices", []):
+        if isinstance(rule, dict) and rule.get("Next"):
+            transitions.append((rule["Next"], "choice"))
+    if state.get("Default"):
+        transitions.append((state["Default"], "choice"))
+    for catcher in state.get("Catch", []):
+        if isinstance(catcher, dict) and catcher.get("Next"):
+            transitions.append((catcher["Next"], "catch"))
+    return transitions
+
+
+def _layout(definition: Dict) -> _Block:
+    """
+    Assign the states of a workflow to rows.
+
+    A state's row is the longest path to it from StartAt, ignoring back edges
+    (loops), so every forward transition points down. States that cannot be
+    reached from StartAt go in one last row.
+    """
+    states = {
+        name: state
+        for name, state in (definition.get("States") or {}).items()
+        if isinstance(state, dict)
+    }
+    start_at = definition.get("StartAt", "")
+    nodes = {name: _Node(name, state) for name, state in states.items()}
+
+    # Depth-first search from StartAt for a topological order and the back edges
+    order = []
+    back_edges = set()
+    visiting = set()
+    visited = set()
+    if start_at in states:
+        stack = [(start_at, iter(_transitions(states[start_at])))]
+        visiting.add(start_at)
+        while stack:
+            name, targets = stack[-1]
+            for target, _ in targets:
+                if target not in states:
+                    continue
+                if target in visiting:
+                    back_edges.add((name, target))
+                elif target not in visited:
+                    visiting.add(target)
+                    stack.append((target, iter(_transitions(states[target]))))
+                    break
+            else:
+                stack.pop()
+                visiting.discard(name)
+                visited.add(name)
+                order.append(name)
+        order.reverse()
+
+    depth = {name: 0 for name in order}
+    for name in order:
+        for target, _ in _transitions(states[name]):
+            if target in depth and (name, target) not in back_edges:
+                depth[target] = max(depth[target], depth[name] + 1)
+
+    rows = [[] for _ in range(max(depth.values(), default=-1) + 1)]
+    for name in states:
+        if name in depth:
+            rows[depth[name]].append(name)
+    unreachable = [name for name in states if name not in depth]
+    if unreachable:
+        rows.append(unreachable)
+
+    return _Block(start_at, nodes, rows)
+
+
+def _place(block: _Block, x: float, y: float):
+    """Give every node of a block (and its branches) absolute coordinates."""
+    row_y = y
+    for row, row_height in zip(block.rows, block.row_heights):
+        row_width = sum(block.nodes[name].width for name in row) + H_GAP * (len(row) - 1)
+        node_x = x + (block.width - row_width) / 2
+        for name in row:
+            node = block.nodes[name]
+            node.x = node_x
+            node.y = row_y
+            node_x += node.width + H_GAP
+
+            child_x = (
+                node.x
+                + (
+                    node.width
+                    - sum(child.width for child in node.children)
+                    - H_GAP * (len(node.children) - 1)
+                )
+                / 2
+            )
+            for child in node.children:
+                _place(child, child_x, node.y + HEADER)
+                child_x += child.width + H_GAP
+        row_y += row_height + V_GAP
+
+
+def _label(text: str) -> str:
+    """Escape a label, shortening it to MAX_LABEL characters."""
+    if len(text) > MAX_LABEL:
+        text = text[: MAX_LABEL - 1] + "…"
+    return escape(text)
+
+
+def _draw_edge(parts: List[str], source: _Node, target: _Node, kind: str):
+    """Draw one transition: straight down, or around the right side for loops."""
+    css = "edge" if kind == "next" else f"edge {kind}"
+    if target.y > source.y:
+        x1 = source.x + source.width / 2
+        y1 = source.y + source.height
+        x2 = target.x + target.width / 2
+        y2 = target.y
+        mid = (y1 + y2) / 2
+        parts.append(
+            f'<path class="{css}" d="M{x1:.0f},{y1:.0f} C{x1:.0f},{mid:.0f} '
+            f'{x2:.0f},{mid:.0f} {x2:.0f},{y2:.0f}"/>'
+        )
+    else:
+        x1 = source.x + source.width
+        y1 = source.y + source.height / 2
+        x2 = target.x + target.width
+        y2 = target.y + target.height / 2
+        bend = max(x1, x2) + H_GAP
+        parts.append(
+            f'<path class="{css} loop" d="M{x1:.0f},{y1:.0f} C{bend:.0f},{y1:.0f} '
+            f'{bend:.0f},{y2:.0f} {x2:.0f},{y2:.0f}"/>'
+        )
+
+
+def _draw_block(parts: List[str], block: _Block, start: Optional[Tuple[float, float]] = None):
+    """Draw the nodes and transitions of a block, then recurse into branches."""
+    if start and block.start_at in block.nodes:
+        first = block.nodes[block.start_at]
+        parts.append(
+            f'<path class="edge" d="M{start[0]:.0f},{start[1]:.0f} '
+            f'L{first.x + first.width / 2:.0f},{first.y:.0f}"/>'
+        )
+
+    for node in block.nodes.values():
+        for target, kind in _transitions(node.state):
+            if target in block.nodes:
+                _draw_edge(parts, node, block.nodes[target], kind)
+
+    for node in block.nodes.values():
+        fill, stroke = STATE_COLORS.get(node.type, ("#ffffff", "#b5b5b5"))
+        end = " end" if node.state.get("End") or node.type in ("Succeed", "Fail") else ""
+        parts.append(
+            f'<g class="state{end}"><title>{escape(node.name)} ({escape(node.type)})</title>'
+        )
+        if node.children:
+            parts.append(
+                f'<rect class="branches" x="{node.x:.0f}" y="{node.y:.0f}" '
+                f'width="{node.width:.0f}" height="{node.height:.0f}" rx="6" '
+                f'fill="{fill}" stroke="{stroke}"/>'
+                f'<text x="{node.x + PADDING:.0f}" y="{node.y + 18:.0f}" class="name">'
+                f'{_label(node.name)} <tspan class="type">{escape(node.type)}</tspan></text>'
+            )
+        else:
+            cx = node.x + node.width / 2
+            parts.append(
+                f'<rect x="{node.x:.0f}" y="{node.y:.0f}" width="{node.width:.0f}" '
+                f'height="{node.height:.0f}" rx="6" fill="{fill}" stroke="{stroke}"/>'
+                f'<text x="{cx:.0f}" y="{node.y + 17:.0f}" class="name">{_label(node.name)}</text>'
+                f'<text x="{cx:.0f}" y="{node.y + 32:.0f}" class="type">{escape(node.type)}</text>'
+            )
+        parts.append("</g>")
+        for child in node.children:
+            _draw_block(parts, child)
+
+
+def render_svg(definition: Dict) -> str:
+    """
+    Render an Amazon States Language definition as an SVG graph.
+
+    States flow top to bottom; Parallel and Map states are drawn as boxes
+    holding their branches side by side, nested to any depth. Catch and
+    Choice transitions are dashed, loops go around the right-hand side.
+
+    Args:
+        definition: Parsed definition (the state machine's definition_dict)
+
+    Returns:
+        A standalone <svg> document
+    """
+    block = _layout(definition)
+    top = MARGIN + 2 * START_RADIUS + V_GAP / 2
+    _place(block, MARGIN, top)
+    width = block.width + 2 * MARGIN + H_GAP
+    height = top + block.height + MARGIN
+    start_x = MARGIN + block.width / 2
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" class="asl-graph" width="{width:.0f}" '
+        f'height="{height:.0f}" viewBox="0 0 {width:.0f} {height:.0f}">',
+        # Scoped to the graph: the SVG is inlined into pages with their own classes
+        "<style>"
+        ".asl-graph text{font-family:sans-serif;text-anchor:middle}"
+        ".asl-graph .name{font-size:12px;font-weight:600;fill:#363636}"
+        ".asl-graph .type{font-size:10px;font-weight:400;fill:#7a7a7a}"
+        ".asl-graph .branches+text{text-anchor:start}"
+        ".asl-graph .branches{stroke-dasharray:4 3}"
+        ".asl-graph .end rect{stroke-width:2.5}"
+        ".asl-graph .edge{fill:none;stroke:#7a7a7a;stroke-width:1.2;marker-end:url(#asl-arrow)}"
+        ".asl-graph .choice{stroke:#f29900}"
+        ".asl-graph .catch{stroke:#f14668;stroke-dasharray:5 4}"
+        ".asl-graph .loop{stroke-dasharray:2 3}"
+        "</style>",
+        '<defs><marker id="asl-arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" '
+        'markerHeight="7" orient="auto-start-reverse"><path d="M0,0 L10,5 L0,10 z" '
+        'fill="#7a7a7a"/></marker></defs>',
+        f'<circle cx="{start_x:.0f}" cy="{MARGIN + START_RADIUS:.0f}" r="{START_RADIUS}" '
+        'fill="#363636"><title>Start</title></circle>',
+    ]
+    _draw_block(parts, block, start=(start_x, MARGIN + 2 * START_RADIUS))
+    parts.append("</svg>")
+    return "".join(parts)
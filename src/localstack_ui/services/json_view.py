@@ -0,0 +1,114 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple, Union
+
+# One step of a JSON path: .key, ["quoted key"] or [index]
+PATH_STEP_PATTERN = re.compile(r'\.([A-Za-z_$][\w$-]*)|\[("(?:[^"\\]|\\.)*")\]|\[(\d+)\]')
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_$][\w$-]*$")
+
+
+def parse_path(path: str) -> List[Union[str, int]]:
+    """
+    Split a JSON path such as $.items[0]["a key"] into its steps.
+
+    Raises:
+        ValueError: If the path is not of that form
+    """
+    path = path.strip() or "$"
+    if not path.startswith("$"):
+        raise ValueError(f"JSON path must start with '$': {path}")
+    steps = []
+    position = 1
+    while position < len(path):
+        match = PATH_STEP_PATTERN.match(path, position)
+        if not match:
+            raise ValueError(f"Invalid JSON path at character {position + 1}: {path}")
+        name, quoted, index = match.groups()
+        if name is not None:
+            steps.append(name)
+        elif quoted is not None:
+            steps.append(json.loads(quoted))
+        else:
+            steps.append(int(index))
+        position = match.end()
+    return steps
+
+
+def resolve(value: Any, steps: List[Union[str, int]]) -> Any:
+    """
+    Follow path steps into a parsed JSON value.
+
+    Raises:
+        ValueError: If a step does not exist
+    """
+    for step in steps:
+        if isinstance(value, dict) and isinstance(step, str) and step in value:
+            value = value[step]
+        elif isinstance(value, list) and isinstance(step, int) and step < len(value):
+            value = value[step]
+        else:
+            raise ValueError(f"No element {step!r} in the payload")
+    return value
+
+
+def child_path(path: str, key: Union[str, int]) -> str:
+    """Path of a child of the value at path."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    if IDENTIFIER_PATTERN.match(key):
+        return f"{path}.{key}"
+    return f"{path}[{json.dumps(key)}]"
+
+
+def value_type(value: Any) -> str:
+    """JSON type name of a parsed value."""
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, bool):
+        return "boolean"
+    if value is None:
+        return "null"
+    return "number"
+
+
+def children(value: Any, path: str, limit: int) -> Tuple[List[Dict], int]:
+    """
+    Summaries of the first limit children of an object or array.
+
+    Returns:
+        Tuple of (list of {"key", "path", "type", "size"}, children left out),
+        where size is the length of the child's compact JSON
+    """
+    if isinstance(value, dict):
+        items = list(value.items())
+    elif isinstance(value, list):
+        items = list(enumerate(value))
+    else:
+        return [], 0
+    summaries = [
+        {
+            "key": key,
+            "path": child_path(path, key),
+            "type": value_type(child),
+            "size": len(json.dumps(child, separators=(",", ":"))),
+        }
+        for key, child in items[:limit]
+    ]
+    return summaries, max(0, len(items) - limit)
+
+
+def preview(text: str, budget: int) -> Tuple[str, bool]:
+    """
+    Cut text to at most budget characters, at a line break where possible.
+
+    Returns:
+        Tuple of (text, whether it was cut)
+    """
+    if len(text) <= budget:
+        return text, False
+    cut = text.rfind("\n", 0, budget)
+    return text[: cut if cut > budget // 2 else budget], True
@@ -1,8 +1,16 @@
-from typing import Dict, List, Optional
+import asyncio
+import base64
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
 from ..aws_client import aws_client_factory
+from ..executor import AWSExecutor, aws_executor
+from ..settings import settings
+from .latency import LatencyStats
+from .search_index import SearchIndex
 
 
 class LambdaServiceError(Exception):
@@ -14,36 +22,53 @@ class LambdaServiceError(Exception):
 class LambdaService:
     """Service for Lambda read-only operations."""
 
+    # Fields of the function list searchable as "field:value"
+    SEARCH_FIELDS = {
+        "name": "function_name",
+        "description": "description",
+        "runtime": "runtime",
+        "handler": "handler",
+        "role": "role",
+        "state": "state",
+    }
+
+    # Detail page sections, fetched concurrently alongside get_function
+    DETAIL_SECTIONS = {
+        "aliases": "list_aliases",
+        "versions": "list_versions",
+        "reserved_concurrency": "get_reserved_concurrency",
+        "provisioned_concurrency": "list_provisioned_concurrency",
+        "event_source_mappings": "list_event_source_mappings",
+        "function_url": "get_function_url_config",
+    }
+
+    # Upper bound on cached function detail pages
+    MAX_CACHED_DETAILS = 256
+
     def __init__(self):
         self.client = aws_client_factory.get_lambda_client()
+        self._listing = None
+        self._listing_time = 0.0
+        self._listing_lock = asyncio.Lock()
+        self._details = OrderedDict()
 
     def list_functions(self) -> List[Dict]:
         """
-        List all Lambda functions.
+        List all Lambda functions, following Marker pagination to the end.
 
         Returns:
             List of function dictionaries with basic information
         """
         try:
-            response = self.client.list_functions()
             functions = []
+            params = {}
 
-            for func in response.get("Functions", []):
-                functions.append(
-                    {
-                        "function_name": func["FunctionName"],
-                        "runtime": func.get("Runtime", "Unknown"),
-                        "memory_size": func.get("MemorySize", 0),
-                        "timeout": func.get("Timeout", 0),
-                        "last_modified": func.get("LastModified", ""),
-                        "description": func.get("Description", ""),
-                        "handler": func.get("Handler", ""),
-                        "role": func.get("Role", ""),
-                        "code_size": func.get("CodeSize", 0),
-                        "state": func.get("State", "Unknown"),
-                        "version": func.get("Version", "$LATEST"),
-                    }
-                )
+            while True:
+                response = self.client.list_functions(**params)
+                functions.extend(self._summarize(func) for func in response.get("Functions", []))
+                if not response.get("NextMarker"):
+                    break
+                params["Marker"] = response["NextMarker"]
 
             # Sort by function name for consistent display
             functions.sort(key=lambda x: x["function_name"].lower())
@@ -55,6 +80,55 @@ class LambdaService:
         except Exception as e:
             raise LambdaServiceError(f"Unexpected error listing Lambda functions: {e}")
 
+    def _summarize(self, func: Dict) -> Dict:
+        """Reduce a ListFunctions entry to the fields shown in the function list."""
+        return {
+            "function_name": func["FunctionName"],
+            "runtime": func.get("Runtime", "Unknown"),
+            "memory_size": func.get("MemorySize", 0),
+            "timeout": func.get("Timeout", 0),
+            "last_modified": func.get("LastModified", ""),
+            "description": func.get("Description", ""),
+            "handler": func.get("Handler", ""),
+            "role": func.get("Role", ""),
+            "code_size": func.get("CodeSize", 0),
+            "state": func.get("State", "Unknown"),
+            "version": func.get("Version", "$LATEST"),
+            "code_sha256": func.get("CodeSha256", ""),
+        }
+
+    async def get_functions(self, max_age: float = settings.LAMBDA_LIST_CACHE_TTL) -> Dict:
+        """
+        Return the cached function list, re-listing only when older than max_age.
+
+        Concurrent callers share a single listing.
+
+        Returns:
+            dict: "functions" (sorted by name), "index" (a SearchIndex over them)
+            and "listed_at" (epoch seconds)
+        """
+        if self._listing is not None and time.monotonic() - self._listing_time < max_age:
+            return self._listing
+
+        async with self._listing_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._listing is not None and time.monotonic() - self._listing_time < max_age:
+                return self._listing
+
+            functions = await aws_executor.run(self.list_functions)
+            if self._listing is not None and self._listing["functions"] == functions:
+                # Unchanged listing: keep the index already built for it
+                index = self._listing["index"]
+            else:
+                index = SearchIndex(functions, self.SEARCH_FIELDS)
+            self._listing = {"functions": functions, "index": index, "listed_at": time.time()}
+            self._listing_time = time.monotonic()
+            return self._listing
+
+    def invalidate_functions(self):
+        """Drop the cached function list so the next request re-lists."""
+        self._listing = None
+
     def get_function(self, function_name: str) -> Optional[Dict]:
         """
         Get detailed information about a Lambda function.
@@ -82,6 +156,7 @@ class LambdaService:
                 "last_modified": config.get("LastModified", ""),
                 "code_sha256": config.get("CodeSha256", ""),
                 "version": config.get("Version", "$LATEST"),
+                "revision_id": config.get("RevisionId", ""),
                 "state": config.get("State", "Unknown"),
                 "state_reason": config.get("StateReason", ""),
                 "state_reason_code": config.get("StateReasonCode", ""),
@@ -107,6 +182,301 @@ class LambdaService:
                 f"Unexpected error getting Lambda function '{function_name}': {e}"
             )
 
+    def list_aliases(self, function_name: str) -> List[Dict]:
+        """List every alias of a function."""
+        try:
+            aliases = []
+            params = {"FunctionName": function_name}
+            while True:
+                response = self.client.list_aliases(**params)
+                for alias in response.get("Aliases", []):
+                    routing = alias.get("RoutingConfig", {}).get("AdditionalVersionWeights", {})
+                    aliases.append(
+                        {
+                            "name": alias.get("Name", ""),
+                            "function_version": alias.get("FunctionVersion", ""),
+                            "description": alias.get("Description", ""),
+                            "routing": routing,
+                        }
+                    )
+                if not response.get("NextMarker"):
+                    return aliases
+                params["Marker"] = response["NextMarker"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise LambdaServiceError(f"Failed to list aliases ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error listing aliases: {e}")
+
+    def list_versions(self, function_name: str) -> List[Dict]:
+        """List every published version of a function (and $LATEST)."""
+        try:
+            versions = []
+            params = {"FunctionName": function_name}
+            while True:
+                response = self.client.list_versions_by_function(**params)
+                for version in response.get("Versions", []):
+                    versions.append(
+                        {
+                            "version": version.get("Version", ""),
+                            "description": version.get("Description", ""),
+                            "runtime": version.get("Runtime", ""),
+                            "code_sha256": version.get("CodeSha256", ""),
+                            "last_modified": version.get("LastModified", ""),
+                        }
+                    )
+                if not response.get("NextMarker"):
+                    return versions
+                params["Marker"] = response["NextMarker"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise LambdaServiceError(f"Failed to list versions ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error listing versions: {e}")
+
+    def get_reserved_concurrency(self, function_name: str) -> Optional[int]:
+        """Get the reserved concurrency of a function, None if unreserved."""
+        try:
+            response = self.client.get_function_concurrency(FunctionName=function_name)
+            return response.get("ReservedConcurrentExecutions")
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise LambdaServiceError(f"Failed to get reserved concurrency ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error getting reserved concurrency: {e}")
+
+    def list_provisioned_concurrency(self, function_name: str) -> List[Dict]:
+        """List the provisioned concurrency configs of a function's versions and aliases."""
+        try:
+            configs = []
+            params = {"FunctionName": function_name}
+            while True:
+                response = self.client.list_provisioned_concurrency_configs(**params)
+                for config in response.get("ProvisionedConcurrencyConfigs", []):
+                    configs.append(
+                        {
+                            "qualifier": config.get("FunctionArn", "").rsplit(":", 1)[-1],
+                            "requested": config.get("RequestedProvisionedConcurrentExecutions", 0),
+                            "allocated": config.get("AllocatedProvisionedConcurrentExecutions", 0),
+                            "status": config.get("Status", "Unknown"),
+                        }
+                    )
+                if not response.get("NextMarker"):
+                    return configs
+                params["Marker"] = response["NextMarker"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise LambdaServiceError(f"Failed to list provisioned concurrency ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error listing provisioned concurrency: {e}")
+
+    def list_event_source_mappings(self, function_name: str) -> List[Dict]:
+        """List the event source mappings that invoke a function."""
+        try:
+            mappings = []
+            params = {"FunctionName": function_name}
+            while True:
+                response = self.client.list_event_source_mappings(**params)
+                for mapping in response.get("EventSourceMappings", []):
+                    mappings.append(
+                        {
+                            "uuid": mapping.get("UUID", ""),
+                            "event_source_arn": mapping.get("EventSourceArn", ""),
+                            "state": mapping.get("State", "Unknown"),
+                            "batch_size": mapping.get("BatchSize"),
+                            "last_modified": mapping.get("LastModified", ""),
+                        }
+                    )
+                if not response.get("NextMarker"):
+                    return mappings
+                params["Marker"] = response["NextMarker"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise LambdaServiceError(f"Failed to list event source mappings ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error listing event source mappings: {e}")
+
+    def get_function_url_config(self, function_name: str) -> Optional[Dict]:
+        """Get the function URL configuration, None if the function has no URL."""
+        try:
+            response = self.client.get_function_url_config(FunctionName=function_name)
+            return {
+                "url": response.get("FunctionUrl", ""),
+                "auth_type": response.get("AuthType", ""),
+                "invoke_mode": response.get("InvokeMode", "BUFFERED"),
+                "cors": response.get("Cors", {}),
+            }
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "ResourceNotFoundException":
+                return None
+            raise LambdaServiceError(f"Failed to get function URL config ({error_code}): {e}")
+        except Exception as e:
+            raise LambdaServiceError(f"Unexpected error getting function URL config: {e}")
+
+    async def get_function_details(
+        self, function_name: str, refresh: bool = False
+    ) -> Optional[Dict]:
+        """
+        Get a function together with every detail page section.
+
+        The whole page is cached. For LAMBDA_DETAIL_FRESH_TTL seconds after it
+        was fetched or last checked it is served without any AWS call; after
+        that, for up to LAMBDA_DETAIL_CACHE_TTL seconds, one get_function call
+        checks that CodeSha256, Version, LastModified and RevisionId are
+        unchanged. Otherwise the function and its DETAIL_SECTIONS are fetched
+        concurrently, at most LAMBDA_DETAIL_CONCURRENCY calls at a time.
+
+        Args:
+            function_name: Name of the function
+            refresh: Fetch everything again even if cached
+
+        Returns:
+            dict with "function", "sections", "section_errors", "fetched_at"
+            (epoch seconds the page was fetched) and "cached", or None if the
+            function does not exist
+        """
+        now = time.monotonic()
+        slots = asyncio.Semaphore(settings.LAMBDA_DETAIL_CONCURRENCY)
+        cached = self._details.get(function_name)
+        if cached is not None and (
+            refresh or now - cached["time"] >= settings.LAMBDA_DETAIL_CACHE_TTL
+        ):
+            self._details.pop(function_name)
+            cached = None
+
+        if cached is not None:
+            self._details.move_to_end(function_name)
+            if now - cached["checked"] < settings.LAMBDA_DETAIL_FRESH_TTL:
+                return {**cached["details"], "cached": True}
+            function_info = await aws_executor.run(self.get_function, function_name)
+            if function_info is None:
+                self._details.pop(function_name, None)
+                return None
+            if self._detail_key(function_info) == cached["key"]:
+                cached["checked"] = time.monotonic()
+                return {**cached["details"], "cached": True}
+            # Changed: the function just fetched is reused, only the sections are fetched
+            sections, section_errors = await self._fetch_sections(function_name, slots)
+        else:
+
+            async def fetch_function():
+                async with slots:
+                    return await aws_executor.run(self.get_function, function_name)
+
+            results = await asyncio.gather(
+                fetch_function(), self._fetch_sections(function_name, slots)
+            )
+            function_info, (sections, section_errors) = results
+            if function_info is None:
+                return None
+
+        details = {
+            "function": function_info,
+            "sections": sections,
+            "section_errors": section_errors,
+            "fetched_at": time.time(),
+        }
+        # Failed sections are cached too (emulators lack some APIs); Refresh retries them
+        self._details[function_name] = {
+            "key": self._detail_key(function_info),
+            "details": details,
+            "time": time.monotonic(),
+            "checked": time.monotonic(),
+        }
+        self._details.move_to_end(function_name)
+        while len(self._details) > self.MAX_CACHED_DETAILS:
+            self._details.popitem(last=False)
+        return {**details, "cached": False}
+
+    async def _fetch_sections(
+        self, function_name: str, slots: asyncio.Semaphore
+    ) -> Tuple[Dict, Dict]:
+        """
+        Fetch every DETAIL_SECTIONS entry concurrently, one call per free slot.
+
+        Returns:
+            Tuple of (section name -> result, section name -> error message)
+        """
+
+        async def fetch(method_name):
+            async with slots:
+                return await aws_executor.run(getattr(self, method_name), function_name)
+
+        results = await asyncio.gather(
+            *(fetch(method_name) for method_name in self.DETAIL_SECTIONS.values()),
+            return_exceptions=True,
+        )
+        sections = {}
+        section_errors = {}
+        for name, result in zip(self.DETAIL_SECTIONS, results):
+            if isinstance(result, BaseException):
+                section_errors[name] = str(result)
+            else:
+                sections[name] = result
+        return sections, section_errors
+
+    def _detail_key(self, function: Dict) -> tuple:
+        """Cache key identifying one state of a function's configuration and code."""
+        return (
+            function["code_sha256"],
+            function["version"],
+            function["last_modified"],
+            function["revision_id"],
+        )
+
+    def invoke(self, function_name: str, payload: bytes = b"{}", retries: bool = True) -> Dict:
+        """
+        Invoke a function synchronously and report how the call went.
+
+        Args:
+            function_name: Name of the function
+            payload: JSON event payload
+            retries: Let botocore retry throttled calls; load tests turn this
+                off so every throttle is counted
+
+        Returns:
+            dict with status_code, function_error, payload, log_tail,
+            duration_ms (client-side), cold_start and throttled
+        """
+        started = time.perf_counter()
+        try:
+            client = self.client if retries else aws_client_factory.get_lambda_invoke_client()
+            response = client.invoke(FunctionName=function_name, Payload=payload, LogType="Tail")
+            body = response["Payload"].read().decode("utf-8", errors="replace")
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "TooManyRequestsException":
+                return {
+                    "status_code": 429,
+                    "function_error": None,
+                    "payload": "",
+                    "log_tail": "",
+                    "duration_ms": (time.perf_counter() - started) * 1000,
+                    "cold_start": False,
+                    "throttled": True,
+                }
+            raise LambdaServiceError(
+                f"Failed to invoke Lambda function '{function_name}' ({error_code}): {e}"
+            )
+        except Exception as e:
+            raise LambdaServiceError(
+                f"Unexpected error invoking Lambda function '{function_name}': {e}"
+            )
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        log_tail = base64.b64decode(response.get("LogResult", "")).decode("utf-8", errors="replace")
+        return {
+            "status_code": response.get("StatusCode", 0),
+            "function_error": response.get("FunctionError"),
+            "payload": body,
+            "log_tail": log_tail,
+            "duration_ms": duration_ms,
+            # The REPORT line only carries an init duration for cold starts
+            "cold_start": "Init Duration" in log_tail,
+            "throttled": False,
+        }
+
     def format_memory_size(self, memory_mb: int) -> str:
         """Format memory size for display."""
         if memory_mb < 1024:
@@ -143,5 +513,108 @@ class LambdaService:
         return f"{size_bytes:.1f} TB"
 
 
-# Global instance
+class LoadTest:
+    """
+    Invoke a function count times with up to concurrency invocations in flight.
+
+    Invocations run on load_test_executor, not the AWS executor, so a test
+    never starves page requests, and are not retried, so throttles show up.
+    stream() yields progress snapshots while the test runs, so results can
+    be shown live.
+    """
+
+    # Seconds between progress snapshots
+    SNAPSHOT_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        service: LambdaService,
+        function_name: str,
+        payload: bytes,
+        count: int,
+        concurrency: int,
+    ):
+        self.service = service
+        self.function_name = function_name
+        self.payload = payload
+        self.count = count
+        self.concurrency = concurrency
+        self.latency = LatencyStats()
+        self.started = 0
+        self.completed = 0
+        self.errors = 0
+        self.throttles = 0
+        self.cold_starts = 0
+        self.error_messages = Counter()
+        self._start_time = None
+        self._end_time = None
+
+    async def stream(self):
+        """Run the test, yielding a snapshot periodically and once at the end."""
+        self._start_time = time.monotonic()
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(min(self.concurrency, self.count))
+        ]
+        try:
+            while True:
+                done, _ = await asyncio.wait(workers, timeout=self.SNAPSHOT_INTERVAL)
+                if len(done) == len(workers):
+                    break
+                yield self.snapshot()
+            self._end_time = time.monotonic()
+            yield self.snapshot()
+        finally:
+            # Stop issuing invocations if the client went away
+            for worker in workers:
+                worker.cancel()
+
+    async def _worker(self):
+        """Issue invocations until the requested count has been started."""
+        while self.started < self.count:
+            self.started += 1
+            try:
+                result = await load_test_executor.run(
+                    self.service.invoke, self.function_name, self.payload, retries=False
+                )
+            except LambdaServiceError as e:
+                self.completed += 1
+                self.errors += 1
+                self.error_messages[str(e)] += 1
+                continue
+
+            self.completed += 1
+            self.latency.record(result["duration_ms"])
+            if result["throttled"]:
+                self.throttles += 1
+            elif result["function_error"]:
+                self.errors += 1
+                self.error_messages[f"Function error: {result['function_error']}"] += 1
+            if result["cold_start"]:
+                self.cold_starts += 1
+
+    def snapshot(self) -> Dict:
+        """Current progress and statistics."""
+        completed = self.completed
+        elapsed = 0.0
+        if self._start_time is not None:
+            elapsed = (self._end_time or time.monotonic()) - self._start_time
+        return {
+            "count": self.count,
+            "concurrency": self.concurrency,
+            "completed": completed,
+            "errors": self.errors,
+            "error_rate": self.errors / completed if completed else 0.0,
+            "throttles": self.throttles,
+            "cold_starts": self.cold_starts,
+            "latency_ms": self.latency.summary(),
+            "elapsed": elapsed,
+            "throughput": completed / elapsed if elapsed else 0.0,
+            "top_errors": self.error_messages.most_common(5),
+            "done": self._end_time is not None,
+        }
+
+
+# Global instances
 lambda_service = LambdaService()
+# Shared by all load tests, so together they never exceed LAMBDA_LOAD_MAX_CONCURRENCY
+load_test_executor = AWSExecutor(settings.LAMBDA_LOAD_MAX_CONCURRENCY, name="lambda-load")
@@ -0,0 +1,47 @@
+import bisect
+import math
+from typing import Dict, List
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LatencyStats:
+    """Collects latency samples (milliseconds) and summarizes them."""
+
+    def __init__(self):
+        self._samples = []
+
+    def record(self, latency_ms: float):
+        """Add one sample, keeping the samples sorted."""
+        bisect.insort(self._samples, latency_ms)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, min, mean, max and p50/p95/p99 of the samples so far."""
+        samples = self._samples
+        return {
+            "count": len(samples),
+            "min": samples[0] if samples else 0.0,
+            "mean": sum(samples) / len(samples) if samples else 0.0,
+            "max": samples[-1] if samples else 0.0,
+            "p50": percentile(samples, 50),
+            "p95": percentile(samples, 95),
+            "p99": percentile(samples, 99),
+        }
@@ -1,9 +1,18 @@
+import asyncio
+import bisect
+import heapq
 import re
-from typing import Dict, List, Optional, Tuple
+import string
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
 from ..aws_client import aws_client_factory
+from ..executor import aws_executor
 from ..settings import settings
 
 
@@ -16,8 +25,24 @@ class S3ServiceError(Exception):
 class S3Service:
     """Service for managing S3 operations."""
 
+    # Size of each read from a download stream
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+    # Upper bound on remembered continuation tokens used for "previous page" links
+    MAX_REMEMBERED_CURSORS = 1000
+
+    # Ranking used by top_objects for each report; larger ranks win
+    TOP_SORTS = {
+        "largest": lambda obj: obj["size"],
+        "newest": lambda obj: obj["last_modified"].timestamp(),
+        "oldest": lambda obj: -obj["last_modified"].timestamp(),
+    }
+
     def __init__(self):
         self.client = aws_client_factory.get_s3_client()
+        self.presign_client = aws_client_factory.get_s3_presign_client()
+        self._previous_cursors = OrderedDict()
+        self._cursor_lock = threading.Lock()
 
     def list_buckets(self) -> List[Dict]:
         """
@@ -154,22 +179,45 @@ class S3Service:
 
         return None
 
-    def list_objects(self, bucket_name: str, prefix: str = "") -> List[Dict]:
+    def list_objects(
+        self,
+        bucket_name: str,
+        prefix: str = "",
+        cursor: Optional[str] = None,
+        page_size: int = settings.S3_PAGE_SIZE,
+        delimiter: str = "",
+    ) -> Dict:
         """
-        List objects in an S3 bucket.
+        List one page of objects in an S3 bucket.
 
         Args:
             bucket_name: Name of the bucket
             prefix: Prefix to filter objects (for folders)
+            cursor: ContinuationToken of the page to fetch, None for the first page
+            page_size: Maximum number of keys and folders to return (1-1000)
+            delimiter: Group keys into folders on this character ("/"), or "" for a flat list
 
         Returns:
-            List of object dictionaries with key, size, last_modified
+            Dictionary with "objects" (key, size, last_modified, etag), "folders"
+            (sub-prefixes, only with a delimiter), "cursor", "next_cursor" and
+            "previous_cursor" (None when there is no such page)
         """
+        page_size = max(1, min(page_size, 1000))
+        params = {"Bucket": bucket_name, "Prefix": prefix, "MaxKeys": page_size}
+        if delimiter:
+            params["Delimiter"] = delimiter
+        if cursor:
+            params["ContinuationToken"] = cursor
+
         try:
-            response = self.client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
+            response = self.client.list_objects_v2(**params)
             objects = []
 
+            # S3 already returns keys in lexicographic order, so no sorting is needed
             for obj in response.get("Contents", []):
+                # Skip the zero-byte placeholder object some tools create for a folder
+                if delimiter and prefix and obj["Key"] == prefix:
+                    continue
                 objects.append(
                     {
                         "key": obj["Key"],
@@ -179,18 +227,212 @@ class S3Service:
                     }
                 )
 
-            # Sort by key for consistent display
-            objects.sort(key=lambda x: x["key"])
-            return objects
+            next_cursor = (
+                response.get("NextContinuationToken") if response.get("IsTruncated") else None
+            )
+            if next_cursor:
+                # Tokens depend on the page size, so pages of another size keep their own links
+                self._remember_previous_cursor(
+                    (bucket_name, prefix, page_size, next_cursor), cursor
+                )
+
+            folders = [
+                common_prefix["Prefix"] for common_prefix in response.get("CommonPrefixes", [])
+            ]
+
+            return {
+                "objects": objects,
+                "folders": folders,
+                "cursor": cursor,
+                "next_cursor": next_cursor,
+                "previous_cursor": self._previous_cursors.get(
+                    (bucket_name, prefix, page_size, cursor)
+                ),
+            }
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to list objects in '{bucket_name}' ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error listing objects in '{bucket_name}': {e}")
+
+    def list_object_page(
+        self, bucket_name: str, prefix: str = "", cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch one full page (up to 1000) of objects for bulk operations.
+
+        Unlike list_objects this does not group folders or remember cursors.
 
+        Args:
+            bucket_name: Name of the bucket
+            prefix: Only include keys starting with this prefix
+            cursor: ContinuationToken from the previous page, None for the first
+
+        Returns:
+            Tuple of (objects, next_cursor); next_cursor is None on the last page
+        """
+        params = {"Bucket": bucket_name, "Prefix": prefix, "MaxKeys": 1000}
+        if cursor:
+            params["ContinuationToken"] = cursor
+
+        try:
+            response = self.client.list_objects_v2(**params)
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
             raise S3ServiceError(f"Failed to list objects in '{bucket_name}' ({error_code}): {e}")
         except Exception as e:
             raise S3ServiceError(f"Unexpected error listing objects in '{bucket_name}': {e}")
 
+        objects = [
+            {
+                "key": obj["Key"],
+                "size": obj["Size"],
+                "last_modified": obj["LastModified"],
+                "etag": obj["ETag"].strip('"'),
+            }
+            for obj in response.get("Contents", [])
+        ]
+        next_cursor = response.get("NextContinuationToken") if response.get("IsTruncated") else None
+        return objects, next_cursor
+
+    def top_objects(
+        self, bucket_name: str, sort: str = "largest", limit: int = 100, prefix: str = ""
+    ) -> List[Dict]:
+        """
+        Find the top objects by size or modification date under a prefix.
+
+        Streams over the paginated listing keeping a bounded heap, so memory
+        stays O(limit) however many objects the bucket holds.
+
+        Args:
+            bucket_name: Name of the bucket
+            sort: One of TOP_SORTS ("largest", "newest", "oldest")
+            limit: Number of objects to return
+            prefix: Only include keys starting with this prefix
+
+        Returns:
+            Up to limit objects, best first
+        """
+        rank = self.TOP_SORTS.get(sort)
+        if rank is None:
+            raise S3ServiceError(f"Unknown sort order '{sort}'")
+
+        # Min-heap of (rank, key, obj): the root is the weakest of the current top
+        heap = []
+        cursor = None
+        while True:
+            objects, cursor = self.list_object_page(bucket_name, prefix, cursor)
+            for obj in objects:
+                item = (rank(obj), obj["key"], obj)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            if not cursor:
+                break
+
+        return [obj for _, _, obj in sorted(heap, reverse=True)]
+
+    def list_top_level(
+        self,
+        bucket_name: str,
+        start_after: Optional[str] = None,
+        end: Optional[str] = None,
+        max_pages: Optional[int] = None,
+    ) -> Dict:
+        """
+        Total the objects at the root of a bucket and list its top-level prefixes.
+
+        Root objects are only counted and summed, never collected, so a flat
+        bucket costs constant memory.
+
+        Args:
+            bucket_name: Name of the bucket
+            start_after: Only list keys after this one
+            end: Only list keys up to and including this one
+            max_pages: Stop after this many pages, None for all
+
+        Returns:
+            Dict with root_objects, root_bytes, prefixes (top-level prefixes) and
+            resume_after (the last key or prefix seen if listing stopped at
+            max_pages with more to come, else None)
+        """
+        totals = {"root_objects": 0, "root_bytes": 0, "prefixes": [], "resume_after": None}
+        params = {"Bucket": bucket_name, "Delimiter": "/", "MaxKeys": 1000}
+        if start_after:
+            params["StartAfter"] = start_after
+
+        try:
+            pages = 0
+            while True:
+                response = self.client.list_objects_v2(**params)
+                pages += 1
+                objects = response.get("Contents", [])
+                prefixes = [p["Prefix"] for p in response.get("CommonPrefixes", [])]
+                last = max([obj["Key"] for obj in objects[-1:]] + prefixes[-1:], default="")
+                past_end = end is not None and last > end
+                if past_end:
+                    objects = [obj for obj in objects if obj["Key"] <= end]
+                    prefixes = [prefix for prefix in prefixes if prefix <= end]
+
+                totals["root_objects"] += len(objects)
+                totals["root_bytes"] += sum(obj["Size"] for obj in objects)
+                totals["prefixes"].extend(prefixes)
+
+                if past_end or not response.get("IsTruncated"):
+                    return totals
+                if max_pages is not None and pages >= max_pages:
+                    totals["resume_after"] = last
+                    return totals
+                params["ContinuationToken"] = response["NextContinuationToken"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "NoSuchBucket":
+                raise S3ServiceError(f"Bucket '{bucket_name}' does not exist")
+            raise S3ServiceError(f"Failed to list objects in '{bucket_name}' ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error listing objects in '{bucket_name}': {e}")
+
+    def prefix_breadcrumbs(self, prefix: str) -> List[Tuple[str, str]]:
+        """
+        Split a folder prefix into breadcrumb entries.
+
+        Args:
+            prefix: Folder prefix such as "logs/2024/"
+
+        Returns:
+            List of (folder_name, folder_prefix) tuples, e.g.
+            [("logs", "logs/"), ("2024", "logs/2024/")]
+        """
+        breadcrumbs = []
+        current = ""
+        for part in prefix.split("/"):
+            if not part:
+                continue
+            current += part + "/"
+            breadcrumbs.append((part, current))
+        return breadcrumbs
+
+    def _remember_previous_cursor(self, page_key: Tuple, previous_cursor: Optional[str]):
+        """
+        Record which cursor leads to the page before page_key.
+
+        S3 continuation tokens only go forwards, so "previous" links are served from
+        this bounded map. Entries are evicted oldest-first.
+        """
+        with self._cursor_lock:
+            self._previous_cursors[page_key] = previous_cursor
+            self._previous_cursors.move_to_end(page_key)
+            while len(self._previous_cursors) > self.MAX_REMEMBERED_CURSORS:
+                self._previous_cursors.popitem(last=False)
+
     def upload_file(
-        self, bucket_name: str, file_key: str, file_data: bytes
+        self,
+        bucket_name: str,
+        file_key: str,
+        file_data: bytes,
+        content_type: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         """
         Upload a file to an S3 bucket.
@@ -199,6 +441,7 @@ class S3Service:
             bucket_name: Name of the bucket
             file_key: Key (name) of the file
             file_data: Binary data of the file
+            content_type: MIME type to store with the object
 
         Returns:
             Tuple of (success, error_message)
@@ -215,7 +458,10 @@ class S3Service:
             return False, "File name cannot be empty"
 
         try:
-            self.client.put_object(Bucket=bucket_name, Key=file_key, Body=file_data)
+            params = {"Bucket": bucket_name, "Key": file_key, "Body": file_data}
+            if content_type:
+                params["ContentType"] = content_type
+            self.client.put_object(**params)
             return True, None
 
         except ClientError as e:
@@ -228,26 +474,60 @@ class S3Service:
             return False, f"Unexpected error uploading file: {e}"
 
     def download_file(
-        self, bucket_name: str, file_key: str
-    ) -> Tuple[bool, Optional[bytes], Optional[str]]:
+        self,
+        bucket_name: str,
+        file_key: str,
+        byte_range: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+        if_modified_since: Optional[datetime] = None,
+    ) -> Tuple[bool, Optional[Dict], Optional[str]]:
         """
-        Download a file from an S3 bucket.
+        Open a file in an S3 bucket for streaming download.
+
+        The body is not read here; the caller streams it with read_chunk.
 
         Args:
             bucket_name: Name of the bucket
             file_key: Key (name) of the file
+            byte_range: HTTP Range header value, e.g. "bytes=0-1023"
+            if_none_match: HTTP If-None-Match header value
+            if_modified_since: Parsed HTTP If-Modified-Since header value
 
         Returns:
-            Tuple of (success, file_data, error_message)
+            Tuple of (success, download, error_message). download contains "status_code"
+            (200, 206, 304 or 416), "body" (a botocore stream, None unless 200/206),
+            "content_type", "content_length", "content_range", "etag" and "last_modified"
         """
+        params = {"Bucket": bucket_name, "Key": file_key}
+        if byte_range:
+            params["Range"] = byte_range
+        if if_none_match:
+            params["IfNoneMatch"] = if_none_match
+        if if_modified_since:
+            params["IfModifiedSince"] = if_modified_since
+
         try:
-            response = self.client.get_object(Bucket=bucket_name, Key=file_key)
-            file_data = response["Body"].read()
-            return True, file_data, None
+            response = self.client.get_object(**params)
+            download = {
+                "status_code": 206 if response.get("ContentRange") else 200,
+                "body": response["Body"],
+                "content_type": response.get("ContentType") or "application/octet-stream",
+                "content_length": response.get("ContentLength"),
+                "content_range": response.get("ContentRange"),
+                "etag": response.get("ETag"),
+                "last_modified": response.get("LastModified"),
+            }
+            return True, download, None
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
-            if error_code == "NoSuchKey":
+            status_code = e.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            headers = e.response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+            if status_code == 304 or error_code in ("304", "NotModified"):
+                return True, self._bodiless_download(304, headers), None
+            elif error_code == "InvalidRange":
+                return True, self._bodiless_download(416, headers), None
+            elif error_code == "NoSuchKey":
                 return False, None, f"File '{file_key}' not found in bucket '{bucket_name}'"
             elif error_code == "NoSuchBucket":
                 return False, None, f"Bucket '{bucket_name}' does not exist"
@@ -256,6 +536,173 @@ class S3Service:
         except Exception as e:
             return False, None, f"Unexpected error downloading file: {e}"
 
+    def _bodiless_download(self, status_code: int, headers: Dict) -> Dict:
+        """Build a download result for responses without a body (304, 416)."""
+        return {
+            "status_code": status_code,
+            "body": None,
+            "content_type": None,
+            "content_length": None,
+            "content_range": headers.get("content-range"),
+            "etag": headers.get("etag"),
+            "last_modified": None,
+        }
+
+    def read_chunk(self, body, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> bytes:
+        """
+        Read the next chunk of a download body, closing it once exhausted.
+
+        Returns:
+            The next chunk, or b"" at the end of the stream
+        """
+        chunk = body.read(chunk_size)
+        if not chunk:
+            body.close()
+        return chunk
+
+    def presigned_download_url(
+        self, bucket_name: str, file_key: str, expires_in: int = settings.S3_PRESIGNED_URL_EXPIRY
+    ) -> str:
+        """
+        Create a short-lived URL the browser can use to download a file directly.
+
+        Args:
+            bucket_name: Name of the bucket
+            file_key: Key (name) of the file
+            expires_in: Lifetime of the URL in seconds
+
+        Returns:
+            Presigned GET URL
+        """
+        filename = file_key.rsplit("/", 1)[-1]
+        try:
+            return self.presign_client.generate_presigned_url(
+                "get_object",
+                Params={
+                    "Bucket": bucket_name,
+                    "Key": file_key,
+                    "ResponseContentDisposition": f'attachment; filename="{filename}"',
+                },
+                ExpiresIn=expires_in,
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to presign download ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error presigning download: {e}")
+
+    def presigned_upload_post(
+        self,
+        bucket_name: str,
+        redirect_url: str,
+        expires_in: int = settings.S3_PRESIGNED_URL_EXPIRY,
+    ) -> Dict:
+        """
+        Create a presigned POST policy so the browser can upload a file directly.
+
+        The object key is the uploaded file's name and the size is capped at
+        MAX_FILE_SIZE_BYTES.
+
+        Args:
+            bucket_name: Name of the bucket
+            redirect_url: Where S3 sends the browser after a successful upload
+            expires_in: Lifetime of the policy in seconds
+
+        Returns:
+            Dictionary with the form "url" and the hidden "fields" to post
+        """
+        try:
+            return self.presign_client.generate_presigned_post(
+                Bucket=bucket_name,
+                Key="${filename}",
+                Fields={"success_action_redirect": redirect_url},
+                Conditions=[
+                    {"success_action_redirect": redirect_url},
+                    ["starts-with", "$Content-Type", ""],
+                    ["content-length-range", 0, settings.MAX_FILE_SIZE_BYTES],
+                ],
+                ExpiresIn=expires_in,
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to presign upload ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error presigning upload: {e}")
+
+    def create_multipart_upload(
+        self, bucket_name: str, file_key: str, content_type: Optional[str] = None
+    ) -> str:
+        """
+        Start a multipart upload.
+
+        Returns:
+            The upload ID
+        """
+        params = {"Bucket": bucket_name, "Key": file_key}
+        if content_type:
+            params["ContentType"] = content_type
+
+        try:
+            return self.client.create_multipart_upload(**params)["UploadId"]
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "NoSuchBucket":
+                raise S3ServiceError(f"Bucket '{bucket_name}' does not exist")
+            raise S3ServiceError(f"Failed to start upload ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error starting upload: {e}")
+
+    def upload_part(
+        self, bucket_name: str, file_key: str, upload_id: str, part_number: int, data: bytes
+    ) -> Dict:
+        """
+        Upload one part of a multipart upload.
+
+        Returns:
+            Part dictionary with PartNumber and ETag, as complete_multipart_upload expects
+        """
+        try:
+            response = self.client.upload_part(
+                Bucket=bucket_name,
+                Key=file_key,
+                UploadId=upload_id,
+                PartNumber=part_number,
+                Body=data,
+            )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to upload part {part_number} ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error uploading part {part_number}: {e}")
+
+    def complete_multipart_upload(
+        self, bucket_name: str, file_key: str, upload_id: str, parts: List[Dict]
+    ):
+        """Assemble the uploaded parts into the final object."""
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=bucket_name,
+                Key=file_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+            )
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to complete upload ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error completing upload: {e}")
+
+    def abort_multipart_upload(self, bucket_name: str, file_key: str, upload_id: str):
+        """Abort a multipart upload so S3 discards its parts."""
+        try:
+            self.client.abort_multipart_upload(Bucket=bucket_name, Key=file_key, UploadId=upload_id)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise S3ServiceError(f"Failed to abort upload ({error_code}): {e}")
+        except Exception as e:
+            raise S3ServiceError(f"Unexpected error aborting upload: {e}")
+
     def delete_file(self, bucket_name: str, file_key: str) -> Tuple[bool, Optional[str]]:
         """
         Delete a file from an S3 bucket.
@@ -280,6 +727,39 @@ class S3Service:
         except Exception as e:
             return False, f"Unexpected error deleting file: {e}"
 
+    def delete_objects(self, bucket_name: str, keys: List[str]) -> Tuple[int, List[str]]:
+        """
+        Delete up to 1000 objects with a single DeleteObjects call.
+
+        Args:
+            bucket_name: Name of the bucket
+            keys: Keys to delete (at most 1000)
+
+        Returns:
+            Tuple of (deleted_count, error_messages)
+        """
+        if not keys:
+            return 0, []
+
+        try:
+            response = self.client.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+            )
+            errors = [
+                f"{error.get('Key')}: {error.get('Message', error.get('Code', 'Unknown'))}"
+                for error in response.get("Errors", [])
+            ]
+            return len(keys) - len(errors), errors
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code == "NoSuchBucket":
+                return 0, [f"Bucket '{bucket_name}' does not exist"]
+            return 0, [f"Failed to delete {len(keys)} file(s) ({error_code}): {e}"]
+        except Exception as e:
+            return 0, [f"Unexpected error deleting {len(keys)} file(s): {e}"]
+
     def get_file_info(
         self, bucket_name: str, file_key: str
     ) -> Tuple[bool, Optional[Dict], Optional[str]]:
@@ -326,5 +806,600 @@ class S3Service:
         return f"{size_bytes:.1f} TB"
 
 
-# Global instance
+class MultipartUpload:
+    """
+    Stream data into an S3 object without holding the whole file in memory.
+
+    Data is cut into parts of part_size bytes and up to concurrency parts are
+    uploaded at once, so memory stays around part_size * (concurrency + 1).
+    Files smaller than one part are sent with a single put_object instead.
+    """
+
+    def __init__(
+        self,
+        service: S3Service,
+        bucket_name: str,
+        file_key: str,
+        content_type: Optional[str] = None,
+        part_size: int = settings.S3_UPLOAD_PART_SIZE_BYTES,
+        concurrency: int = settings.S3_UPLOAD_CONCURRENCY,
+    ):
+        self.service = service
+        self.bucket_name = bucket_name
+        self.file_key = file_key
+        self.content_type = content_type
+        self.part_size = part_size
+        self.size = 0
+        self.upload_id = None
+        self._buffer = bytearray()
+        self._part_number = 0
+        self._tasks = []
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def write(self, data: bytes):
+        """Add data to the upload, sending any complete parts."""
+        self.size += len(data)
+        if self.size > settings.MAX_FILE_SIZE_BYTES:
+            raise S3ServiceError(f"File exceeds limit of {settings.MAX_FILE_SIZE_MB}MB")
+
+        self._buffer.extend(data)
+        while len(self._buffer) >= self.part_size:
+            part = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            await self._send_part(part)
+
+    async def complete(self):
+        """Send the remaining data and finish the upload."""
+        if self.upload_id is None:
+            success, error_message = await aws_executor.run(
+                self.service.upload_file,
+                self.bucket_name,
+                self.file_key,
+                bytes(self._buffer),
+                self.content_type,
+            )
+            if not success:
+                raise S3ServiceError(error_message)
+            return
+
+        if self._buffer:
+            await self._send_part(bytes(self._buffer))
+            self._buffer.clear()
+
+        parts = await asyncio.gather(*self._tasks)
+        await aws_executor.run(
+            self.service.complete_multipart_upload,
+            self.bucket_name,
+            self.file_key,
+            self.upload_id,
+            parts,
+        )
+
+    async def abort(self):
+        """Stop the upload and tell S3 to discard any parts already sent."""
+        # Let in-flight parts settle first so none land after the abort
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if self.upload_id is not None:
+            await aws_executor.run(
+                self.service.abort_multipart_upload,
+                self.bucket_name,
+                self.file_key,
+                self.upload_id,
+            )
+
+    async def _send_part(self, data: bytes):
+        """Start uploading one part, waiting while too many parts are in flight."""
+        if self.upload_id is None:
+            self.upload_id = await aws_executor.run(
+                self.service.create_multipart_upload,
+                self.bucket_name,
+                self.file_key,
+                self.content_type,
+            )
+
+        await self._slots.acquire()
+
+        # Fail fast if an earlier part has already failed
+        for task in self._tasks:
+            if task.done() and task.exception():
+                self._slots.release()
+                raise task.exception()
+
+        self._part_number += 1
+        self._tasks.append(asyncio.create_task(self._upload_part(self._part_number, data)))
+
+    async def _upload_part(self, part_number: int, data: bytes) -> Dict:
+        """Upload one part on the AWS executor and free its slot when done."""
+        try:
+            return await aws_executor.run(
+                self.service.upload_part,
+                self.bucket_name,
+                self.file_key,
+                self.upload_id,
+                part_number,
+                data,
+            )
+        finally:
+            self._slots.release()
+
+
+class BulkDelete:
+    """
+    Delete many objects using batched DeleteObjects calls.
+
+    Keys are sent in batches of up to 1000, with up to concurrency batches in
+    flight while the listing for the next page is fetched.
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        service: S3Service,
+        bucket_name: str,
+        concurrency: int = settings.S3_DELETE_CONCURRENCY,
+    ):
+        self.service = service
+        self.bucket_name = bucket_name
+        self.deleted = 0
+        self.errors = []
+        self._tasks = []
+        self._slots = asyncio.Semaphore(concurrency)
+
+    async def delete_keys(self, keys: List[str]):
+        """Delete the given keys and wait for every batch to finish."""
+        await self._send(keys)
+        await self._wait()
+
+    async def delete_prefix(self, prefix: str = ""):
+        """Delete every object whose key starts with prefix ("" empties the bucket)."""
+        cursor = None
+        try:
+            while True:
+                objects, cursor = await aws_executor.run(
+                    self.service.list_object_page, self.bucket_name, prefix, cursor
+                )
+                await self._send([obj["key"] for obj in objects])
+                if not cursor:
+                    break
+        finally:
+            # Never leave batches running behind a listing failure
+            await self._wait()
+
+    async def _send(self, keys: List[str]):
+        """Queue keys for deletion, waiting while too many batches are in flight."""
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            await self._slots.acquire()
+            batch = keys[start : start + self.BATCH_SIZE]
+            self._tasks.append(asyncio.create_task(self._delete_batch(batch)))
+
+    async def _delete_batch(self, keys: List[str]):
+        """Delete one batch on the AWS executor and record the outcome."""
+        try:
+            deleted, errors = await aws_executor.run(
+                self.service.delete_objects, self.bucket_name, keys
+            )
+            self.deleted += deleted
+            self.errors.extend(errors)
+        finally:
+            self._slots.release()
+
+    async def _wait(self):
+        """Wait for all queued batches."""
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+
+
+class BucketStats:
+    """
+    Per-bucket storage statistics with a du-style size tree by prefix.
+
+    Each top-level prefix is a shard, scanned in one streaming pass over its
+    paginated listing with up to concurrency shards in flight. A root with
+    more than one page of entries is listed as key ranges on the same slots.
+    Results are cached with the time they were computed until refreshed or
+    invalidated by a change to the bucket.
+    """
+
+    # Upper bounds of the key ranges a large bucket root is listed in. Each is a
+    # single character, so no top-level prefix straddles two ranges.
+    ROOT_RANGE_BOUNDS = string.digits + string.ascii_uppercase + string.ascii_lowercase
+
+    # Buckets whose statistics are kept; the least recently viewed are evicted
+    MAX_CACHED_BUCKETS = 64
+
+    def __init__(
+        self,
+        service: S3Service,
+        concurrency: int = settings.S3_STATS_CONCURRENCY,
+        max_depth: int = settings.S3_STATS_MAX_DEPTH,
+    ):
+        self.service = service
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self._cache = OrderedDict()
+        self._locks = {}
+
+    async def get(self, bucket_name: str, refresh: bool = False) -> Dict:
+        """
+        Return statistics for a bucket, computing them if not cached.
+
+        Concurrent callers for the same bucket share a single computation.
+
+        Args:
+            bucket_name: Name of the bucket
+            refresh: Recompute even if cached
+
+        Returns:
+            Dict with total_objects, total_bytes, prefixes (prefix -> {"objects",
+            "bytes"}), computed_at (epoch seconds) and duration (seconds)
+        """
+        if not refresh and bucket_name in self._cache:
+            self._cache.move_to_end(bucket_name)
+            return self._cache[bucket_name]
+
+        requested_at = time.time()
+        async with self._lock(bucket_name):
+            stats = self._cache.get(bucket_name)
+            # Another caller may have computed them while we waited for the lock
+            if stats is not None and (not refresh or stats["computed_at"] >= requested_at):
+                return stats
+            stats = await self._compute(bucket_name)
+            self._cache[bucket_name] = stats
+            self._cache.move_to_end(bucket_name)
+            while len(self._cache) > self.MAX_CACHED_BUCKETS:
+                self._cache.popitem(last=False)
+            return stats
+
+    def invalidate(self, bucket_name: str):
+        """Forget cached statistics for a bucket."""
+        self._cache.pop(bucket_name, None)
+
+    def _lock(self, bucket_name: str) -> asyncio.Lock:
+        """The lock computations of one bucket share, keeping only locks in use."""
+        lock = self._locks.get(bucket_name)
+        if lock is None:
+            if len(self._locks) >= self.MAX_CACHED_BUCKETS:
+                # An unlocked lock has no waiters, so it can be dropped
+                for name in [name for name, other in self._locks.items() if not other.locked()]:
+                    del self._locks[name]
+            lock = self._locks[bucket_name] = asyncio.Lock()
+        return lock
+
+    async def _compute(self, bucket_name: str) -> Dict:
+        """List the root, scan every top-level prefix concurrently and merge the shards."""
+        started = time.monotonic()
+        slots = asyncio.Semaphore(self.concurrency)
+
+        async def run(func, *args, **kwargs):
+            async with slots:
+                return await aws_executor.run(func, *args, **kwargs)
+
+        # The first page shows whether the root is large enough to split
+        roots = [await run(self.service.list_top_level, bucket_name, max_pages=1)]
+        resume_after = roots[0]["resume_after"]
+        if resume_after is not None:
+            bounds = [bound for bound in self.ROOT_RANGE_BOUNDS if bound > resume_after]
+            ranges = zip([resume_after, *bounds], [*bounds, None])
+            roots += await asyncio.gather(
+                *(
+                    run(self.service.list_top_level, bucket_name, start_after=start, end=end)
+                    for start, end in ranges
+                )
+            )
+        # Listing after a prefix can repeat it, so prefixes are merged as a set
+        top_level = sorted({prefix for root in roots for prefix in root["prefixes"]})
+        root_objects = sum(root["root_objects"] for root in roots)
+        root_bytes = sum(root["root_bytes"] for root in roots)
+
+        shards = await asyncio.gather(
+            *(run(self._scan_prefix, bucket_name, prefix) for prefix in top_level)
+        )
+
+        # Shards cover disjoint prefixes, so merging is a plain update
+        prefixes = {}
+        for shard in shards:
+            prefixes.update(shard)
+
+        return {
+            "total_objects": root_objects
+            + sum(prefixes[p]["objects"] for p in top_level if p in prefixes),
+            "total_bytes": root_bytes
+            + sum(prefixes[p]["bytes"] for p in top_level if p in prefixes),
+            "root_objects": root_objects,
+            "root_bytes": root_bytes,
+            "prefixes": dict(sorted(prefixes.items())),
+            "max_depth": self.max_depth,
+            "computed_at": time.time(),
+            "duration": time.monotonic() - started,
+        }
+
+    def _scan_prefix(self, bucket_name: str, prefix: str) -> Dict[str, Dict]:
+        """Aggregate sizes under one top-level prefix, page by page."""
+        tree = {}
+        cursor = None
+        while True:
+            objects, cursor = self.service.list_object_page(bucket_name, prefix, cursor)
+            for obj in objects:
+                # Credit the object to every enclosing folder up to max_depth
+                parts = obj["key"].split("/")[:-1]
+                for depth in range(1, min(len(parts), self.max_depth) + 1):
+                    folder = "/".join(parts[:depth]) + "/"
+                    node = tree.get(folder)
+                    if node is None:
+                        node = tree[folder] = {"objects": 0, "bytes": 0, "depth": depth}
+                    node["objects"] += 1
+                    node["bytes"] += obj["size"]
+            if not cursor:
+                return tree
+
+
+class KeyIndex:
+    """
+    Searchable index of the keys in one bucket.
+
+    Keys are kept sorted for prefix range queries, with a lower-cased trigram
+    index for substring search. Refreshes are incremental: the listing is
+    applied page by page as it streams in, and only keys that are new, whose
+    ETag, size or LastModified changed, or that are gone from the listing
+    touch the index structures.
+    """
+
+    GRAM_SIZE = 3
+
+    # Rough memory cost of one key and of one trigram entry, for the budget
+    KEY_OVERHEAD_BYTES = 300
+    GRAM_ENTRY_BYTES = 40
+
+    def __init__(self, bucket_name: str):
+        self.bucket_name = bucket_name
+        self.keys = []
+        self.objects = {}
+        self.grams = {}
+        self.memory_bytes = 0
+        self.refreshed_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def apply(self, pages: Iterable[List[Dict]]) -> Tuple[int, int, int]:
+        """
+        Bring the index in line with a full listing of the bucket.
+
+        Each page is applied as soon as it arrives, so the listing is never
+        held in memory as a whole.
+
+        Args:
+            pages: Pages of every object in the bucket, as returned by
+                list_object_page (in key order)
+
+        Returns:
+            Tuple of (added, updated, removed) key counts
+        """
+        self._generation += 1
+        added = updated = 0
+        for objects in pages:
+            with self._lock:
+                for obj in objects:
+                    entry = self.objects.get(obj["key"])
+                    if entry is None:
+                        self._add(obj)
+                        added += 1
+                    elif (entry["etag"], entry["size"], entry["last_modified"]) != (
+                        obj["etag"],
+                        obj["size"],
+                        obj["last_modified"],
+                    ):
+                        self._update(entry, obj)
+                        updated += 1
+                    else:
+                        entry["generation"] = self._generation
+
+        # Keys not listed in this generation are gone from the bucket
+        with self._lock:
+            removed = [
+                key
+                for key, entry in self.objects.items()
+                if entry["generation"] != self._generation
+            ]
+            for key in removed:
+                self._remove(key)
+            if removed:
+                self.keys = [key for key in self.keys if key in self.objects]
+
+        return added, updated, len(removed)
+
+    def search(self, query: str, prefix: str = "", limit: int = 100) -> Tuple[List[Dict], int]:
+        """
+        Find keys under prefix containing query (case-insensitive).
+
+        Args:
+            query: Substring to look for
+            prefix: Only include keys starting with this prefix
+            limit: Maximum number of results to return
+
+        Returns:
+            Tuple of (matching objects sorted by key, total number of matches)
+        """
+        needle = query.lower()
+        with self._lock:
+            if len(needle) >= self.GRAM_SIZE:
+                # Intersect the posting sets of the query's trigrams, smallest first
+                sets = sorted(
+                    (self.grams.get(gram, set()) for gram in self._grams(needle)), key=len
+                )
+                candidates = sets[0].intersection(*sets[1:])
+                matches = sorted(
+                    key for key in candidates if key.startswith(prefix) and needle in key.lower()
+                )
+            else:
+                # Too short for trigrams: scan the prefix range of the sorted keys
+                matches = []
+                for i in range(bisect.bisect_left(self.keys, prefix), len(self.keys)):
+                    key = self.keys[i]
+                    if not key.startswith(prefix):
+                        break
+                    if needle in key.lower():
+                        matches.append(key)
+
+            results = [
+                {
+                    "key": key,
+                    "size": self.objects[key]["size"],
+                    "last_modified": self.objects[key]["last_modified"],
+                }
+                for key in matches[:limit]
+            ]
+        return results, len(matches)
+
+    def _grams(self, text: str) -> set:
+        """Distinct trigrams of an already lower-cased string."""
+        return {text[i : i + self.GRAM_SIZE] for i in range(len(text) - self.GRAM_SIZE + 1)}
+
+    def _add(self, obj: Dict):
+        """Add a new object; caller holds the lock."""
+        key = obj["key"]
+        grams = self._grams(key.lower())
+        for gram in grams:
+            self.grams.setdefault(gram, set()).add(key)
+        self.memory_bytes += self.KEY_OVERHEAD_BYTES + len(key) + self.GRAM_ENTRY_BYTES * len(grams)
+        self.objects[key] = {}
+        self._update(self.objects[key], obj)
+
+        # Listings come in key order, so a first build only ever appends
+        if not self.keys or key > self.keys[-1]:
+            self.keys.append(key)
+        else:
+            bisect.insort(self.keys, key)
+
+    def _update(self, entry: Dict, obj: Dict):
+        """Record an object's current metadata; caller holds the lock."""
+        entry["size"] = obj["size"]
+        entry["last_modified"] = obj["last_modified"]
+        entry["etag"] = obj["etag"]
+        entry["generation"] = self._generation
+
+    def _remove(self, key: str):
+        """Remove one key; caller holds the lock."""
+        del self.objects[key]
+        grams = self._grams(key.lower())
+        for gram in grams:
+            postings = self.grams[gram]
+            postings.discard(key)
+            if not postings:
+                del self.grams[gram]
+        self.memory_bytes -= self.KEY_OVERHEAD_BYTES + len(key) + self.GRAM_ENTRY_BYTES * len(grams)
+
+
+class KeyIndexCache:
+    """
+    Per-bucket KeyIndex instances, built lazily and evicted least recently used.
+
+    The first search of a bucket waits for its index to be built, and so does
+    the first search after the bucket was changed through the UI; other
+    searches are answered from the index while a stale one is refreshed in
+    the background.
+    """
+
+    def __init__(
+        self,
+        service: S3Service,
+        ttl: float = settings.S3_KEY_INDEX_TTL,
+        memory_budget: int = settings.S3_KEY_INDEX_MEMORY_MB * 1024 * 1024,
+    ):
+        self.service = service
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self._indexes = OrderedDict()
+        self._refreshes = {}
+        self._changed_at = {}
+
+    async def search(
+        self, bucket_name: str, query: str, prefix: str = "", limit: int = 100
+    ) -> Tuple[List[Dict], int, KeyIndex]:
+        """
+        Search a bucket's keys for a substring.
+
+        Returns:
+            Tuple of (matching objects, total number of matches, index searched)
+        """
+        index = self._indexes.get(bucket_name)
+        changed_at = self._changed_at.get(bucket_name)
+        # Wait for a listing taken after the last change; one already running may predate it
+        while index is None or (changed_at is not None and index.refreshed_at <= changed_at):
+            index = await asyncio.shield(self._refresh(bucket_name))
+        if changed_at is not None and self._changed_at.get(bucket_name) == changed_at:
+            del self._changed_at[bucket_name]
+        if time.monotonic() - index.refreshed_at > self.ttl:
+            # Answer from the current index and refresh it in the background
+            self._refresh(bucket_name)
+        if bucket_name in self._indexes:
+            self._indexes.move_to_end(bucket_name)
+
+        results, total = index.search(query, prefix, limit)
+        return results, total, index
+
+    def mark_stale(self, bucket_name: str):
+        """Have the next search wait for a listing of a bucket taken after this call."""
+        if bucket_name in self._indexes or bucket_name in self._refreshes:
+            self._changed_at[bucket_name] = time.monotonic()
+
+    def invalidate(self, bucket_name: str):
+        """Drop a bucket's index."""
+        self._indexes.pop(bucket_name, None)
+        self._changed_at.pop(bucket_name, None)
+
+    def _refresh(self, bucket_name: str) -> asyncio.Task:
+        """Start refreshing a bucket's index unless a refresh is already running."""
+        task = self._refreshes.get(bucket_name)
+        if task is None:
+            task = asyncio.create_task(self._build(bucket_name))
+            self._refreshes[bucket_name] = task
+            task.add_done_callback(lambda done: self._refresh_done(bucket_name, done))
+        return task
+
+    def _refresh_done(self, bucket_name: str, task: asyncio.Task):
+        """Forget a finished refresh; background failures keep the old index."""
+        self._refreshes.pop(bucket_name, None)
+        if not task.cancelled():
+            task.exception()
+
+    async def _build(self, bucket_name: str) -> KeyIndex:
+        """List the bucket and apply the listing to its (new or existing) index."""
+        index = self._indexes.get(bucket_name) or KeyIndex(bucket_name)
+        # The index is as fresh as the moment its listing started
+        started = time.monotonic()
+        await aws_executor.run(self._update, index)
+        index.refreshed_at = started
+        self._indexes[bucket_name] = index
+        self._indexes.move_to_end(bucket_name)
+        self._evict(keep=bucket_name)
+        return index
+
+    def _update(self, index: KeyIndex):
+        """Stream the bucket listing into an index; runs on the AWS executor."""
+        index.apply(self._pages(index.bucket_name))
+
+    def _pages(self, bucket_name: str) -> Iterator[List[Dict]]:
+        """Every page of a bucket's listing, fetched as the previous one is used."""
+        cursor = None
+        while True:
+            objects, cursor = self.service.list_object_page(bucket_name, cursor=cursor)
+            yield objects
+            if not cursor:
+                return
+
+    def _evict(self, keep: str):
+        """Drop least recently used indexes until within the memory budget."""
+        total = sum(index.memory_bytes for index in self._indexes.values())
+        for bucket_name in list(self._indexes):
+            if total <= self.memory_budget:
+                break
+            if bucket_name != keep:
+                total -= self._indexes.pop(bucket_name).memory_bytes
+
+
+# Global instances
 s3_service = S3Service()
+bucket_stats = BucketStats(s3_service)
+key_index = KeyIndexCache(s3_service)
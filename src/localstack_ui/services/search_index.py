@@ -0,0 +1,112 @@
+import bisect
+import re
+from typing import Dict, List
+
+# Splits values into words: on punctuation and between letters and digits
+WORD_PATTERN = re.compile(r"[a-z]+|[0-9]+")
+# Dotted version numbers such as the "3.12" in "python3.12"
+VERSION_PATTERN = re.compile(r"[0-9]+(?:\.[0-9]+)+")
+
+
+class SearchIndex:
+    """
+    Token index over a listing, built once so searches skip the full scan.
+
+    Every indexed field is normalized (lower-cased) into tokens: the whole
+    value, its punctuation-separated parts and its letter/digit runs, so
+    "python3.12" is found by "python3.12", "python", "3.12" or "12". Query
+    terms match tokens by prefix, falling back to a substring match when no
+    token starts with a term of at least GRAM_SIZE characters (so "unction"
+    still finds "my-function"), and all terms must match. A term may be
+    qualified with a field name, e.g. "runtime:python3.12"; unqualified terms
+    match any field.
+    """
+
+    # Length of the token n-grams that substring matches are looked up by
+    GRAM_SIZE = 3
+
+    def __init__(self, items: List[Dict], fields: Dict[str, str]):
+        """
+        Args:
+            items: The listing to index, in display order
+            fields: Query field name -> item key, e.g. {"name": "function_name"}
+        """
+        self.items = items
+        self.fields = fields
+        # field -> token -> ids of the items containing it; "" is any field
+        self._postings = {field: {} for field in [""] + list(fields)}
+
+        for item_id, item in enumerate(items):
+            for field, item_key in fields.items():
+                for token in self.tokenize(str(item.get(item_key) or "")):
+                    self._postings[field].setdefault(token, set()).add(item_id)
+                    self._postings[""].setdefault(token, set()).add(item_id)
+
+        self._tokens = {field: sorted(postings) for field, postings in self._postings.items()}
+        # field -> trigram -> tokens containing it, for substring matches
+        self._grams = {field: {} for field in self._postings}
+        for field, postings in self._postings.items():
+            for token in postings:
+                for gram in self._token_grams(token):
+                    self._grams[field].setdefault(gram, set()).add(token)
+
+    @staticmethod
+    def tokenize(value: str) -> set:
+        """Normalized tokens of one field value."""
+        value = value.lower().strip()
+        if not value:
+            return set()
+        tokens = {value}
+        for part in re.split(r"[\s/:,;|=@]+", value):
+            if part:
+                tokens.add(part)
+                tokens.update(re.split(r"[-_.]+", part))
+        tokens.update(WORD_PATTERN.findall(value))
+        tokens.update(VERSION_PATTERN.findall(value))
+        tokens.discard("")
+        return tokens
+
+    def search(self, query: str) -> List[Dict]:
+        """
+        Return the items matching every term of the query, in listing order.
+
+        Args:
+            query: Space-separated terms, optionally "field:value"
+        """
+        matches = None
+        for term in query.lower().split():
+            field, _, value = term.partition(":")
+            if value and field in self.fields:
+                ids = self._lookup(field, value)
+            else:
+                ids = self._lookup("", term)
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if matches is None:
+            return list(self.items)
+        return [self.items[item_id] for item_id in sorted(matches)]
+
+    def _lookup(self, field: str, term: str) -> set:
+        """Ids of the items with a token in field starting with, or else containing, term."""
+        tokens = self._tokens[field]
+        postings = self._postings[field]
+        ids = set()
+        for i in range(bisect.bisect_left(tokens, term), len(tokens)):
+            if not tokens[i].startswith(term):
+                break
+            ids |= postings[tokens[i]]
+        if not ids and len(term) >= self.GRAM_SIZE:
+            # Only tokens holding every trigram of the term can contain it
+            sets = sorted(
+                (self._grams[field].get(gram, set()) for gram in self._token_grams(term)), key=len
+            )
+            for token in sets[0].intersection(*sets[1:]):
+                if term in token:
+                    ids |= postings[token]
+        return ids
+
+    def _token_grams(self, token: str) -> set:
+        """Distinct n-grams of a token."""
+        return {token[i : i + self.GRAM_SIZE] for i in range(len(token) - self.GRAM_SIZE + 1)}
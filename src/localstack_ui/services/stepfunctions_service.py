@@ -1,10 +1,24 @@
+import asyncio
+import bisect
+import hashlib
 import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
 
 from botocore.exceptions import ClientError
 
 from ..aws_client import aws_client_factory
+from ..executor import aws_executor
+from ..settings import settings
+from .asl_graph import LAYOUT_VERSION, render_svg
+from .latency import LatencyStats
+from .search_index import SearchIndex
 
 
 class StepFunctionsServiceError(Exception):
@@ -16,30 +30,69 @@ class StepFunctionsServiceError(Exception):
 class StepFunctionsService:
     """Service for Step Functions read-only operations."""
 
+    # Fields of the state machine list searchable as "field:value"
+    SEARCH_FIELDS = {
+        "name": "name",
+        "type": "type",
+        "status": "status",
+        "arn": "arn",
+    }
+
+    # Upper bound on cached parsed definitions
+    MAX_CACHED_DEFINITIONS = 128
+    # Upper bound on rendered graphs kept in memory (more are kept on disk)
+    MAX_CACHED_GRAPHS = 64
+
+    # Event detail fields that carry payloads, loaded separately by get_payload
+    PAYLOAD_FIELDS = ("input", "output", "parameters")
+
+    # History events that end an execution
+    TERMINAL_EVENTS = {
+        "ExecutionSucceeded",
+        "ExecutionFailed",
+        "ExecutionAborted",
+        "ExecutionTimedOut",
+    }
+
     def __init__(self):
         self.client = aws_client_factory.get_stepfunctions_client()
+        self._listing = None
+        self._listing_time = 0.0
+        self._listing_lock = asyncio.Lock()
+        self._latest_executions = {}
+        self._definitions = OrderedDict()
+        self._definitions_lock = threading.Lock()
+        self._graphs = OrderedDict()
+        self._payloads = OrderedDict()
+        self._payload_bytes = 0
+        self._payloads_lock = threading.Lock()
 
     def list_state_machines(self) -> List[Dict]:
         """
-        List all Step Functions state machines.
+        List all Step Functions state machines, following nextToken to the end.
 
         Returns:
             List of state machine dictionaries with basic information
         """
         try:
-            response = self.client.list_state_machines()
             state_machines = []
+            params = {}
 
-            for sm in response.get("stateMachines", []):
-                state_machines.append(
-                    {
-                        "name": sm.get("name", ""),
-                        "arn": sm.get("stateMachineArn", ""),
-                        "type": sm.get("type", "STANDARD"),
-                        "status": sm.get("status", "ACTIVE"),
-                        "creation_date": sm.get("creationDate", ""),
-                    }
-                )
+            while True:
+                response = self.client.list_state_machines(**params)
+                for sm in response.get("stateMachines", []):
+                    state_machines.append(
+                        {
+                            "name": sm.get("name", ""),
+                            "arn": sm.get("stateMachineArn", ""),
+                            "type": sm.get("type", "STANDARD"),
+                            "status": sm.get("status", "ACTIVE"),
+                            "creation_date": sm.get("creationDate", ""),
+                        }
+                    )
+                if not response.get("nextToken"):
+                    break
+                params["nextToken"] = response["nextToken"]
 
             # Sort by name for consistent display
             state_machines.sort(key=lambda x: x["name"].lower())
@@ -51,6 +104,94 @@ class StepFunctionsService:
         except Exception as e:
             raise StepFunctionsServiceError(f"Unexpected error listing state machines: {e}")
 
+    async def get_state_machines(
+        self, max_age: float = settings.STEPFUNCTIONS_LIST_CACHE_TTL
+    ) -> Dict:
+        """
+        Return the cached state machine list, re-listing only when older than max_age.
+
+        Concurrent callers share a single listing.
+
+        Returns:
+            dict: "state_machines" (sorted by name), "index" (a SearchIndex over
+            them) and "listed_at" (epoch seconds)
+        """
+        if self._listing is not None and time.monotonic() - self._listing_time < max_age:
+            return self._listing
+
+        async with self._listing_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if self._listing is not None and time.monotonic() - self._listing_time < max_age:
+                return self._listing
+
+            state_machines = await aws_executor.run(self.list_state_machines)
+            if self._listing is not None and self._listing["state_machines"] == state_machines:
+                # Unchanged listing: keep the index already built for it
+                index = self._listing["index"]
+            else:
+                index = SearchIndex(state_machines, self.SEARCH_FIELDS)
+            self._listing = {
+                "state_machines": state_machines,
+                "index": index,
+                "listed_at": time.time(),
+            }
+            self._listing_time = time.monotonic()
+            return self._listing
+
+    def invalidate_state_machines(self):
+        """Drop the cached state machine list so the next request re-lists."""
+        self._listing = None
+        self._latest_executions = {}
+
+    async def get_latest_executions(
+        self,
+        state_machine_arns: List[str],
+        max_age: float = settings.STEPFUNCTIONS_STATUS_CACHE_TTL,
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        Get the most recent execution of each state machine.
+
+        Entries older than max_age are refreshed in one batch of
+        list_executions(maxResults=1) calls, at most
+        STEPFUNCTIONS_STATUS_CONCURRENCY in flight.
+
+        Returns:
+            dict: state machine ARN -> latest execution (None if never run);
+            machines whose lookup failed are left out
+        """
+        now = time.monotonic()
+        stale = [
+            arn
+            for arn in state_machine_arns
+            if arn not in self._latest_executions
+            or now - self._latest_executions[arn]["time"] >= max_age
+        ]
+
+        if stale:
+            slots = asyncio.Semaphore(settings.STEPFUNCTIONS_STATUS_CONCURRENCY)
+
+            async def fetch(arn):
+                async with slots:
+                    return await aws_executor.run(self.list_executions, arn, 1)
+
+            results = await asyncio.gather(*(fetch(arn) for arn in stale), return_exceptions=True)
+            fetched_at = time.monotonic()
+            for arn, result in zip(stale, results):
+                if isinstance(result, StepFunctionsServiceError):
+                    continue
+                if isinstance(result, BaseException):
+                    raise result
+                self._latest_executions[arn] = {
+                    "execution": result[0] if result else None,
+                    "time": fetched_at,
+                }
+
+        return {
+            arn: self._latest_executions[arn]["execution"]
+            for arn in state_machine_arns
+            if arn in self._latest_executions
+        }
+
     def describe_state_machine(self, state_machine_arn: str) -> Optional[Dict]:
         """
         Get detailed information about a Step Functions state machine.
@@ -76,16 +217,14 @@ class StepFunctionsService:
                 "tracing_configuration": response.get("tracingConfiguration", {}),
             }
 
-            # Parse and format the definition
+            # Parsed definition, formatted form and stats (cached per revision)
+            analysis = self.analyze_definition(state_machine_info["definition"])
+            state_machine_info.update(analysis)
             try:
-                definition_dict = json.loads(state_machine_info["definition"])
-                state_machine_info["definition_formatted"] = json.dumps(
-                    definition_dict, indent=2, sort_keys=True
-                )
-                state_machine_info["definition_dict"] = definition_dict
-            except json.JSONDecodeError:
-                state_machine_info["definition_formatted"] = state_machine_info["definition"]
-                state_machine_info["definition_dict"] = {}
+                state_machine_info["graph_svg"] = self.get_definition_graph(analysis)
+            except Exception:
+                # A definition the layout can't handle still shows as raw JSON
+                state_machine_info["graph_svg"] = None
 
             return state_machine_info
 
@@ -101,6 +240,95 @@ class StepFunctionsService:
                 f"Unexpected error describing state machine '{state_machine_arn}': {e}"
             )
 
+    def analyze_definition(self, definition: str) -> Dict:
+        """
+        Parse a definition and derive its formatted form and stats.
+
+        Results are cached by the definition's SHA-256, so each revision is
+        parsed once. The returned dict is shared and must not be modified.
+
+        Returns:
+            dict with definition_hash, definition_dict, definition_formatted,
+            state_count and state_types
+        """
+        definition_hash = hashlib.sha256(definition.encode("utf-8")).hexdigest()
+        with self._definitions_lock:
+            analysis = self._definitions.get(definition_hash)
+            if analysis is not None:
+                self._definitions.move_to_end(definition_hash)
+                return analysis
+
+        try:
+            definition_dict = json.loads(definition)
+            definition_formatted = json.dumps(definition_dict, indent=2, sort_keys=True)
+        except json.JSONDecodeError:
+            definition_dict = {}
+            definition_formatted = definition
+
+        analysis = {
+            "definition_hash": definition_hash,
+            "definition_dict": definition_dict,
+            "definition_formatted": definition_formatted,
+            "state_count": self.get_state_count(definition_dict),
+            "state_types": self.get_state_types(definition_dict),
+        }
+        with self._definitions_lock:
+            self._definitions[definition_hash] = analysis
+            while len(self._definitions) > self.MAX_CACHED_DEFINITIONS:
+                self._definitions.popitem(last=False)
+        return analysis
+
+    def get_definition_graph(self, analysis: Dict) -> str:
+        """
+        Return the SVG graph of an analyzed definition.
+
+        Graphs are cached in memory and, when STEPFUNCTIONS_GRAPH_CACHE_DIR is
+        set, on disk, both keyed by definition hash and layout version, so a
+        revision is rendered once and survives restarts.
+
+        Args:
+            analysis: Result of analyze_definition
+
+        Returns:
+            The rendered <svg> document
+        """
+        key = f"{analysis['definition_hash']}-v{LAYOUT_VERSION}"
+        with self._definitions_lock:
+            svg = self._graphs.get(key)
+            if svg is not None:
+                self._graphs.move_to_end(key)
+                return svg
+
+        cache_dir = settings.STEPFUNCTIONS_GRAPH_CACHE_DIR
+        path = os.path.join(cache_dir, f"{key}.svg") if cache_dir else None
+        svg = None
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    svg = f.read()
+            except OSError:
+                pass
+
+        if svg is None:
+            svg = render_svg(analysis["definition_dict"])
+            if path:
+                # The disk cache is best effort; write then rename so readers
+                # never see a partial file
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(svg)
+                    os.replace(tmp_path, path)
+                except OSError:
+                    pass
+
+        with self._definitions_lock:
+            self._graphs[key] = svg
+            while len(self._graphs) > self.MAX_CACHED_GRAPHS:
+                self._graphs.popitem(last=False)
+        return svg
+
     def list_executions(self, state_machine_arn: str, max_items: int = 10) -> List[Dict]:
         """
         List recent executions for a state machine.
@@ -112,24 +340,66 @@ class StepFunctionsService:
         Returns:
             List of execution dictionaries
         """
+        executions, _ = self.list_executions_page(state_machine_arn, max_results=max_items)
+        return executions
+
+    def list_executions_page(
+        self,
+        state_machine_arn: str,
+        status: Optional[str] = None,
+        next_token: Optional[str] = None,
+        max_results: int = settings.STEPFUNCTIONS_EXECUTIONS_PAGE_SIZE,
+        started_after: Optional[datetime] = None,
+        started_before: Optional[datetime] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        List one page of a state machine's executions, newest first.
+
+        The status filter is applied by ListExecutions itself. The start date
+        range is not supported by the API, so it is applied here while reading:
+        executions newer than started_before are skipped and reading stops at
+        the first one older than started_after, since results are newest first.
+
+        Args:
+            state_machine_arn: ARN of the state machine
+            status: Only executions with this status (e.g. "FAILED")
+            next_token: Token from the previous page, None for the first
+            max_results: Executions per page (at most 1000)
+            started_after: Only executions started at or after this time
+            started_before: Only executions started before this time
+
+        Returns:
+            Tuple of (executions, next_token); next_token is None on the last page
+        """
+        max_results = max(1, min(max_results, 1000))
+        executions = []
+
         try:
-            response = self.client.list_executions(
-                stateMachineArn=state_machine_arn, maxResults=max_items
-            )
-
-            executions = []
-            for execution in response.get("executions", []):
-                executions.append(
-                    {
-                        "arn": execution.get("executionArn", ""),
-                        "name": execution.get("name", ""),
-                        "status": execution.get("status", "UNKNOWN"),
-                        "start_date": execution.get("startDate", ""),
-                        "stop_date": execution.get("stopDate"),
-                    }
-                )
+            while True:
+                # Never ask for more than still fits on the page, so the next
+                # token resumes right after the last execution shown
+                params = {
+                    "stateMachineArn": state_machine_arn,
+                    "maxResults": max_results - len(executions),
+                }
+                if status:
+                    params["statusFilter"] = status
+                if next_token:
+                    params["nextToken"] = next_token
 
-            return executions
+                response = self.client.list_executions(**params)
+                next_token = response.get("nextToken")
+
+                for execution in response.get("executions", []):
+                    start_date = execution.get("startDate")
+                    if started_before and start_date and start_date >= started_before:
+                        continue
+                    if started_after and start_date and start_date < started_after:
+                        return executions, None
+                    executions.append(self._execution_summary(execution))
+
+                if not next_token or len(executions) >= max_results:
+                    return executions, next_token
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "Unknown")
@@ -141,6 +411,310 @@ class StepFunctionsService:
                 f"Unexpected error listing executions for '{state_machine_arn}': {e}"
             )
 
+    def _execution_summary(self, execution: Dict) -> Dict:
+        """Reduce a ListExecutions item to the fields the pages show."""
+        return {
+            "arn": execution.get("executionArn", ""),
+            "name": execution.get("name", ""),
+            "status": execution.get("status", "UNKNOWN"),
+            "start_date": execution.get("startDate", ""),
+            "stop_date": execution.get("stopDate"),
+        }
+
+    def start_execution(
+        self, state_machine_arn: str, execution_input: str, name: Optional[str] = None
+    ) -> Dict:
+        """
+        Start an execution of a state machine.
+
+        Args:
+            state_machine_arn: ARN of the state machine
+            execution_input: JSON input of the execution
+            name: Execution name, generated by Step Functions if None
+
+        Returns:
+            dict with the execution's arn and start_date
+        """
+        params = {"stateMachineArn": state_machine_arn, "input": execution_input}
+        if name:
+            params["name"] = name
+
+        try:
+            response = self.client.start_execution(**params)
+            return {
+                "arn": response.get("executionArn", ""),
+                "start_date": response.get("startDate"),
+            }
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise StepFunctionsServiceError(
+                f"Failed to start execution of '{state_machine_arn}' ({error_code}): {e}"
+            )
+        except Exception as e:
+            raise StepFunctionsServiceError(
+                f"Unexpected error starting execution of '{state_machine_arn}': {e}"
+            )
+
+    def describe_execution(self, execution_arn: str) -> Optional[Dict]:
+        """
+        Get the status, input and output of an execution.
+
+        Args:
+            execution_arn: ARN of the execution
+
+        Returns:
+            Execution details dictionary or None if not found
+        """
+        try:
+            response = self.client.describe_execution(executionArn=execution_arn)
+            return {
+                "arn": response.get("executionArn", ""),
+                "name": response.get("name", ""),
+                "state_machine_arn": response.get("stateMachineArn", ""),
+                "status": response.get("status", "UNKNOWN"),
+                "start_date": response.get("startDate", ""),
+                "stop_date": response.get("stopDate"),
+                "input": response.get("input"),
+                "output": response.get("output"),
+                "error": response.get("error"),
+                "cause": response.get("cause"),
+            }
+
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            if error_code in ("ExecutionDoesNotExist", "InvalidArn"):
+                return None
+            raise StepFunctionsServiceError(
+                f"Failed to describe execution '{execution_arn}' ({error_code}): {e}"
+            )
+        except Exception as e:
+            raise StepFunctionsServiceError(
+                f"Unexpected error describing execution '{execution_arn}': {e}"
+            )
+
+    def get_execution_history_page(
+        self,
+        execution_arn: str,
+        next_token: Optional[str] = None,
+        reverse: bool = False,
+        page_size: int = settings.STEPFUNCTIONS_HISTORY_PAGE_SIZE,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Fetch one page of an execution's history.
+
+        Args:
+            execution_arn: ARN of the execution
+            next_token: Token from the previous page, None for the first
+            reverse: Newest events first
+            page_size: Events per page (at most 1000)
+
+        Returns:
+            Tuple of (events, next_token); next_token is None on the last page
+        """
+        params = {
+            "executionArn": execution_arn,
+            "reverseOrder": reverse,
+            "maxResults": max(1, min(page_size, 1000)),
+        }
+        if next_token:
+            params["nextToken"] = next_token
+
+        try:
+            response = self.client.get_execution_history(**params)
+        except ClientError as e:
+            error_code = e.response.get("Error", {}).get("Code", "Unknown")
+            raise StepFunctionsServiceError(
+                f"Failed to get history of '{execution_arn}' ({error_code}): {e}"
+            )
+        except Exception as e:
+            raise StepFunctionsServiceError(
+                f"Unexpected error getting history of '{execution_arn}': {e}"
+            )
+
+        events = [self._history_event(execution_arn, event) for event in response.get("events", [])]
+        return events, response.get("nextToken")
+
+    def get_execution_history_since(self, execution_arn: str, last_event_id: int) -> List[Dict]:
+        """
+        Fetch only the events newer than last_event_id, oldest first.
+
+        Reads the history newest-first and stops at the first known event, so
+        tailing a long execution does not re-read its whole history.
+        """
+        events = []
+        next_token = None
+        while True:
+            page, next_token = self.get_execution_history_page(
+                execution_arn, next_token, reverse=True
+            )
+            for event in page:
+                if event["id"] <= last_event_id:
+                    return events[::-1]
+                events.append(event)
+            if not next_token:
+                return events[::-1]
+
+    async def iter_execution_history(
+        self, execution_arn: str, reverse: bool = False, follow: bool = False
+    ):
+        """
+        Yield an execution's history as (events, tailed) one page at a time.
+
+        With follow, keep polling for new events (yielded oldest first, with
+        tailed=True) every STEPFUNCTIONS_TAIL_INTERVAL seconds until the
+        execution finishes. Only one page is held in memory at a time.
+        """
+        last_event_id = 0
+        finished = False
+        next_token = None
+        while True:
+            events, next_token = await aws_executor.run(
+                self.get_execution_history_page, execution_arn, next_token, reverse
+            )
+            for event in events:
+                last_event_id = max(last_event_id, event["id"])
+                finished = finished or event["type"] in self.TERMINAL_EVENTS
+            yield events, False
+            if not next_token:
+                break
+
+        while follow and not finished:
+            await asyncio.sleep(settings.STEPFUNCTIONS_TAIL_INTERVAL)
+            events = await aws_executor.run(
+                self.get_execution_history_since, execution_arn, last_event_id
+            )
+            for event in events:
+                last_event_id = max(last_event_id, event["id"])
+                finished = finished or event["type"] in self.TERMINAL_EVENTS
+            if events:
+                yield events, True
+
+    def _history_event(self, execution_arn: str, event: Dict) -> Dict:
+        """
+        Reduce a history event to its id, type, time, state name and details.
+
+        Payloads are left out of the details (only their sizes are kept under
+        "payloads") and stashed in the payload cache for get_payload.
+        """
+        details = dict(
+            next((value for key, value in event.items() if key.endswith("EventDetails")), {})
+        )
+        payloads = {}
+        for field in self.PAYLOAD_FIELDS:
+            raw = details.pop(field, None)
+            if isinstance(raw, str):
+                payloads[field] = len(raw)
+                self._store_payload((execution_arn, event.get("id", 0), field), {"raw": raw})
+        return {
+            "id": event.get("id", 0),
+            "previous_event_id": event.get("previousEventId", 0),
+            "timestamp": event["timestamp"].isoformat() if event.get("timestamp") else "",
+            "type": event.get("type", ""),
+            "state": details.get("name", ""),
+            "details": details,
+            "payloads": payloads,
+        }
+
+    def get_payload(
+        self, execution_arn: str, source: str, field: Optional[str] = None
+    ) -> Optional[Dict]:
+        """
+        Get an execution payload with its parsed and pretty-printed forms.
+
+        History events and execution input never change, nor does the output
+        of a finished execution, so payloads are cached (up to
+        STEPFUNCTIONS_PAYLOAD_CACHE_MB) and formatted once.
+
+        Args:
+            execution_arn: ARN of the execution
+            source: "input", "output" or a history event id
+            field: Payload of the event: "input", "output" or "parameters"
+
+        Returns:
+            dict with raw (None if there is no such payload yet), value (parsed
+            JSON or None), pretty and is_json; None if the execution or event
+            does not exist
+        """
+        if source in ("input", "output"):
+            key = (execution_arn, source)
+        else:
+            key = (execution_arn, int(source), field)
+
+        entry = self._cached_payload(key)
+        if entry is None:
+            if len(key) == 2:
+                execution = self.describe_execution(execution_arn)
+                if execution is None:
+                    return None
+                entry = {"raw": execution[source]}
+                # Output changes until the execution finishes
+                if entry["raw"] is None or (
+                    source == "output" and execution["status"] == "RUNNING"
+                ):
+                    return self._format_payload(entry)
+            else:
+                entry = self._find_event_payload(execution_arn, key[1], field)
+                if entry is None:
+                    return None
+
+        if "pretty" not in entry:
+            entry = self._format_payload(entry)
+        self._store_payload(key, entry)
+        return entry
+
+    def _find_event_payload(self, execution_arn: str, event_id: int, field: str) -> Optional[Dict]:
+        """Read the history up to an event, stashing payloads on the way."""
+        next_token = None
+        while True:
+            events, next_token = self.get_execution_history_page(
+                execution_arn, next_token, page_size=1000
+            )
+            for event in events:
+                if event["id"] == event_id:
+                    if field not in event["payloads"]:
+                        return None
+                    return self._cached_payload((execution_arn, event_id, field))
+            if not next_token or (events and events[-1]["id"] > event_id):
+                return None
+
+    def _format_payload(self, entry: Dict) -> Dict:
+        """Add the parsed value and pretty-printed text to a raw payload."""
+        raw = entry["raw"]
+        try:
+            value = json.loads(raw) if raw is not None else None
+            pretty = json.dumps(value, indent=2, ensure_ascii=False)
+            is_json = raw is not None
+        except ValueError:
+            value = None
+            pretty = raw
+            is_json = False
+        return {"raw": raw, "value": value, "pretty": pretty, "is_json": is_json}
+
+    def _cached_payload(self, key: Tuple) -> Optional[Dict]:
+        """Look up a payload, marking it recently used."""
+        with self._payloads_lock:
+            cached = self._payloads.get(key)
+            if cached is None:
+                return None
+            self._payloads.move_to_end(key)
+            return cached[0]
+
+    def _store_payload(self, key: Tuple, entry: Dict):
+        """Cache a payload, evicting the least recently used beyond the budget."""
+        # Raw and pretty text, plus roughly as much again for the parsed value
+        size = len(entry["raw"] or "") + 2 * len(entry.get("pretty") or "")
+        budget = settings.STEPFUNCTIONS_PAYLOAD_CACHE_MB * 1024 * 1024
+        with self._payloads_lock:
+            old = self._payloads.pop(key, None)
+            if old is not None:
+                self._payload_bytes -= old[1]
+            self._payloads[key] = (entry, size)
+            self._payload_bytes += size
+            while self._payload_bytes > budget and self._payloads:
+                _, (_, evicted_size) = self._payloads.popitem(last=False)
+                self._payload_bytes -= evicted_size
+
     def format_date(self, date_value) -> str:
         """Format date for display."""
         if not date_value:
@@ -176,5 +750,444 @@ class StepFunctionsService:
         return arn
 
 
-# Global instance
+class ExecutionBatch:
+    """
+    Start count executions of a state machine and follow them to completion.
+
+    At most concurrency executions run at once and at most rate are started
+    per second (0 for no limit). Running executions are polled with
+    DescribeExecution in rounds, each execution backing off from
+    POLL_INTERVAL to MAX_POLL_INTERVAL while it keeps running. Completion
+    latency is the execution's own stopDate - startDate, so polling less
+    often does not inflate it. stream() yields progress snapshots; after
+    max_wait seconds it stops starting and polling and ends with a snapshot
+    marked timed_out, listing the executions still running.
+    """
+
+    # Seconds between progress snapshots
+    SNAPSHOT_INTERVAL = 0.5
+    # First and longest wait between two polls of one running execution
+    POLL_INTERVAL = 0.25
+    MAX_POLL_INTERVAL = 5.0
+    POLL_BACKOFF = 1.5
+    # Placeholders of the input template, e.g. {"order": "{{index}}"}
+    VARIABLE_PATTERN = re.compile(r"\{\{\s*(index|uuid|timestamp|batch)\s*\}\}")
+
+    def __init__(
+        self,
+        service: StepFunctionsService,
+        state_machine_arn: str,
+        input_template: str,
+        count: int,
+        concurrency: int,
+        rate: float = 0.0,
+        max_wait: float = settings.STEPFUNCTIONS_BATCH_MAX_WAIT,
+    ):
+        self.service = service
+        self.state_machine_arn = state_machine_arn
+        self.input_template = input_template
+        self.count = count
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_wait = max_wait
+        self.timed_out = False
+        self.batch_id = uuid.uuid4().hex[:8]
+        self.latency = LatencyStats()
+        self.started = 0
+        self.completed = 0
+        self.succeeded = 0
+        self.describe_calls = 0
+        self.failures = Counter()
+        # arn -> [next poll time, current poll interval]
+        self._running = {}
+        self._starts = set()
+        self._slots = asyncio.Semaphore(concurrency)
+        self._poll_slots = asyncio.Semaphore(settings.STEPFUNCTIONS_STATUS_CONCURRENCY)
+        self._start_time = None
+        self._end_time = None
+
+    def render_input(self, index: int) -> str:
+        """
+        Input of the index-th execution (1-based).
+
+        {{index}}, {{uuid}}, {{timestamp}} (UTC, ISO 8601) and {{batch}} (this
+        batch's id) are replaced in the template.
+        """
+        values = {
+            "index": str(index),
+            "batch": self.batch_id,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        }
+
+        def substitute(match):
+            name = match.group(1)
+            return uuid.uuid4().hex if name == "uuid" else values[name]
+
+        return self.VARIABLE_PATTERN.sub(substitute, self.input_template)
+
+    async def stream(self):
+        """Run the batch, yielding a snapshot periodically and once at the end."""
+        self._start_time = time.monotonic()
+        tasks = [asyncio.create_task(self._starter()), asyncio.create_task(self._poller())]
+        deadline = self._start_time + self.max_wait
+        try:
+            while self.completed < self.count:
+                await asyncio.sleep(
+                    min(self.SNAPSHOT_INTERVAL, max(deadline - time.monotonic(), 0))
+                )
+                for task in tasks:
+                    # Surface unexpected errors instead of waiting forever
+                    if task.done() and task.exception():
+                        raise task.exception()
+                if self.completed < self.count and time.monotonic() >= deadline:
+                    # Executions that never finish must not keep the stream open
+                    self.timed_out = True
+                    break
+                if self.completed < self.count:
+                    yield self.snapshot()
+            self._end_time = time.monotonic()
+            yield self.snapshot()
+        finally:
+            # Stop starting and polling if the client went away; executions
+            # already started keep running in Step Functions
+            for task in tasks + list(self._starts):
+                task.cancel()
+
+    async def _starter(self):
+        """Start executions as concurrency slots free up, paced to the rate."""
+        next_start = time.monotonic()
+        for index in range(1, self.count + 1):
+            await self._slots.acquire()
+            if self.rate > 0:
+                delay = next_start - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_start = max(next_start, time.monotonic()) + 1 / self.rate
+            self.started += 1
+            task = asyncio.create_task(self._start(index))
+            self._starts.add(task)
+            task.add_done_callback(self._starts.discard)
+
+    async def _start(self, index: int):
+        """Start one execution and hand it to the poller."""
+        try:
+            execution = await aws_executor.run(
+                self.service.start_execution,
+                self.state_machine_arn,
+                self.render_input(index),
+                f"batch-{self.batch_id}-{index:05d}",
+            )
+        except StepFunctionsServiceError as e:
+            self._finish(f"StartExecution failed: {e}")
+            return
+        self._running[execution["arn"]] = [
+            time.monotonic() + self.POLL_INTERVAL,
+            self.POLL_INTERVAL,
+        ]
+
+    async def _poller(self):
+        """Poll the running executions that are due, in concurrent rounds."""
+        while self.completed < self.count:
+            now = time.monotonic()
+            due = [arn for arn, (next_poll, _) in self._running.items() if next_poll <= now]
+            if due:
+                await asyncio.gather(*(self._poll(arn) for arn in due))
+            next_polls = [next_poll for next_poll, _ in self._running.values()]
+            delay = min(next_polls, default=now + self.POLL_INTERVAL) - time.monotonic()
+            await asyncio.sleep(min(max(delay, 0.01), self.POLL_INTERVAL))
+
+    async def _poll(self, execution_arn: str):
+        """Describe one execution; record it if finished, else back off."""
+        async with self._poll_slots:
+            self.describe_calls += 1
+            try:
+                execution = await aws_executor.run(self.service.describe_execution, execution_arn)
+            except StepFunctionsServiceError as e:
+                del self._running[execution_arn]
+                self._finish(f"DescribeExecution failed: {e}")
+                return
+
+        if execution is None or execution["status"] == "RUNNING":
+            # Not visible yet or still running: back off
+            _, interval = self._running[execution_arn]
+            interval = min(interval * self.POLL_BACKOFF, self.MAX_POLL_INTERVAL)
+            self._running[execution_arn] = [time.monotonic() + interval, interval]
+            return
+
+        del self._running[execution_arn]
+        if execution["start_date"] and execution["stop_date"]:
+            elapsed = execution["stop_date"] - execution["start_date"]
+            self.latency.record(elapsed.total_seconds() * 1000)
+        if execution["status"] == "SUCCEEDED":
+            self.succeeded += 1
+            self._finish()
+        elif execution["error"]:
+            self._finish(f"{execution['status']}: {execution['error']}")
+        else:
+            self._finish(execution["status"])
+
+    def _finish(self, failure: Optional[str] = None):
+        """Count a finished execution and free its concurrency slot."""
+        self.completed += 1
+        if failure:
+            self.failures[failure] += 1
+        self._slots.release()
+
+    def snapshot(self) -> Dict:
+        """Current progress and statistics."""
+        completed = self.completed
+        elapsed = 0.0
+        if self._start_time is not None:
+            elapsed = (self._end_time or time.monotonic()) - self._start_time
+        failed = completed - self.succeeded
+        return {
+            "batch_id": self.batch_id,
+            "count": self.count,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "started": self.started,
+            "running": len(self._running),
+            "completed": completed,
+            "succeeded": self.succeeded,
+            "failed": failed,
+            "failure_rate": failed / completed if completed else 0.0,
+            "latency_ms": self.latency.summary(),
+            "elapsed": elapsed,
+            "start_rate": self.started / elapsed if elapsed else 0.0,
+            "throughput": completed / elapsed if elapsed else 0.0,
+            "describe_calls": self.describe_calls,
+            "failures": self.failures.most_common(10),
+            "max_wait": self.max_wait,
+            "timed_out": self.timed_out,
+            "done": self._end_time is not None,
+        }
+
+
+class ExecutionStats:
+    """
+    Execution statistics per state machine, refreshed incrementally.
+
+    Finished executions never change, so each one is listed (and, when it
+    failed, described for its error) only once. The cache per state machine
+    holds the newest executions contiguously; a refresh lists from the newest
+    execution down to the first cached finished one, provided every execution
+    that was running at the last refresh has been seen again. Older results
+    come from the cache.
+    """
+
+    # Upper bounds (milliseconds) of the duration histogram buckets
+    HISTOGRAM_BUCKETS_MS = [100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000]
+    # Executions asked for per ListExecutions call while refreshing
+    SCAN_PAGE_SIZE = 100
+
+    def __init__(
+        self,
+        service: StepFunctionsService,
+        max_executions: int = settings.STEPFUNCTIONS_STATS_MAX_EXECUTIONS,
+        concurrency: int = settings.STEPFUNCTIONS_STATUS_CONCURRENCY,
+    ):
+        self.service = service
+        self.max_executions = max_executions
+        self.concurrency = concurrency
+        self._cache = {}
+        self._locks = {}
+
+    async def get(
+        self,
+        state_machine_arn: str,
+        limit: Optional[int] = None,
+        since: Optional[datetime] = None,
+    ) -> Dict:
+        """
+        Return statistics over the last limit executions or those started since.
+
+        Concurrent callers for the same state machine share a single refresh.
+
+        Args:
+            state_machine_arn: ARN of the state machine
+            limit: Number of newest executions to cover
+            since: Cover the executions started at or after this time instead
+
+        Returns:
+            Dict with total, running, succeeded, failed, success_rate,
+            duration_ms (count/min/mean/max/p50/p95/p99), histogram (list of
+            {"label", "count"}), failures ([error, count] pairs), oldest_start,
+            fetched (executions listed by this refresh), described (failures
+            described by this refresh), cached and duration (seconds)
+        """
+        limit = min(limit or self.max_executions, self.max_executions)
+        started = time.monotonic()
+        lock = self._locks.setdefault(state_machine_arn, asyncio.Lock())
+        async with lock:
+            cache = self._cache.setdefault(state_machine_arn, {"records": [], "exhausted": False})
+            updates, listed, connected, exhausted = await aws_executor.run(
+                self._scan, state_machine_arn, cache, limit, since
+            )
+            described = await self._describe_failures(updates)
+            self._merge(cache, updates, listed, connected, exhausted)
+
+        records = [r for r in cache["records"] if not since or r["start_date"] >= since][:limit]
+        stats = self._summarize(records)
+        stats.update(
+            {
+                "fetched": len(updates),
+                "described": described,
+                "cached": len(records) - len([r for r in records if r["arn"] in updates]),
+                "duration": time.monotonic() - started,
+            }
+        )
+        return stats
+
+    def invalidate(self, state_machine_arn: str):
+        """Forget cached executions of a state machine."""
+        self._cache.pop(state_machine_arn, None)
+
+    def _scan(
+        self,
+        state_machine_arn: str,
+        cache: Dict,
+        limit: int,
+        since: Optional[datetime],
+    ) -> Tuple[Dict[str, Dict], set, bool, bool]:
+        """
+        List executions newest first until the cache takes over.
+
+        Returns:
+            Tuple of (new or changed records by arn, arns listed, whether the
+            listing reached the cached executions, whether it reached the
+            oldest execution)
+        """
+        records = cache["records"]
+        known = {record["arn"]: index for index, record in enumerate(records)}
+        pending = {record["arn"] for record in records if record["status"] == "RUNNING"}
+        updates = {}
+        listed = set()
+        next_token = None
+
+        while True:
+            page, next_token = self.service.list_executions_page(
+                state_machine_arn, next_token=next_token, max_results=self.SCAN_PAGE_SIZE
+            )
+            for execution in page:
+                if since and execution["start_date"] and execution["start_date"] < since:
+                    return updates, listed, False, False
+
+                index = known.get(execution["arn"])
+                if index is not None and records[index]["status"] != "RUNNING" and not pending:
+                    # Everything from here down is cached; stop if it covers the window
+                    cached_older = len(records) - index
+                    covers_since = since and records[-1]["start_date"] < since
+                    if cache["exhausted"] or len(listed) + cached_older >= limit or covers_since:
+                        return updates, listed, True, cache["exhausted"]
+
+                pending.discard(execution["arn"])
+                if index is None or records[index]["status"] != execution["status"]:
+                    updates[execution["arn"]] = self._record(execution)
+                listed.add(execution["arn"])
+                if len(listed) >= limit:
+                    return updates, listed, False, False
+
+            if not next_token:
+                return updates, listed, False, True
+
+    def _record(self, execution: Dict) -> Dict:
+        """Cacheable record of a listed execution."""
+        start_date = execution["start_date"]
+        stop_date = execution["stop_date"]
+        duration_ms = None
+        if start_date and stop_date:
+            duration_ms = (stop_date - start_date).total_seconds() * 1000
+        return {
+            "arn": execution["arn"],
+            "status": execution["status"],
+            "start_date": start_date,
+            "duration_ms": duration_ms,
+            "error": None,
+        }
+
+    async def _describe_failures(self, updates: Dict[str, Dict]) -> int:
+        """Fill in the error of newly failed executions, describing them concurrently."""
+        slots = asyncio.Semaphore(self.concurrency)
+        failed = [record for record in updates.values() if record["status"] == "FAILED"]
+
+        async def describe(record):
+            async with slots:
+                try:
+                    execution = await aws_executor.run(
+                        self.service.describe_execution, record["arn"]
+                    )
+                except StepFunctionsServiceError:
+                    execution = None
+            record["error"] = (execution or {}).get("error") or "Unknown error"
+
+        await asyncio.gather(*(describe(record) for record in failed))
+        return len(failed)
+
+    def _merge(
+        self,
+        cache: Dict,
+        updates: Dict[str, Dict],
+        listed: set,
+        connected: bool,
+        exhausted: bool,
+    ):
+        """Fold a refresh into the cache, keeping only contiguous newest executions."""
+        records = {
+            record["arn"]: record
+            for record in cache["records"]
+            # Unless the listing reached the cached executions, only those it
+            # listed still connect to the newest ones
+            if connected or record["arn"] in listed
+        }
+        records.update(updates)
+        records = sorted(records.values(), key=lambda record: record["start_date"], reverse=True)
+        cache["exhausted"] = exhausted and len(records) <= self.max_executions
+        cache["records"] = records[: self.max_executions]
+
+    def _summarize(self, records: List[Dict]) -> Dict:
+        """Success rate, duration percentiles, histogram and failures of records."""
+        durations = LatencyStats()
+        histogram = [0] * (len(self.HISTOGRAM_BUCKETS_MS) + 1)
+        statuses = Counter()
+        failures = Counter()
+
+        for record in records:
+            statuses[record["status"]] += 1
+            if record["status"] == "FAILED":
+                failures[record["error"] or "Unknown error"] += 1
+            elif record["status"] != "SUCCEEDED" and record["status"] != "RUNNING":
+                failures[record["status"]] += 1
+            if record["duration_ms"] is not None and record["status"] != "RUNNING":
+                durations.record(record["duration_ms"])
+                histogram[bisect.bisect_left(self.HISTOGRAM_BUCKETS_MS, record["duration_ms"])] += 1
+
+        finished = len(records) - statuses["RUNNING"]
+        labels = [f"≤ {self._format_ms(bound)}" for bound in self.HISTOGRAM_BUCKETS_MS]
+        labels.append(f"> {self._format_ms(self.HISTOGRAM_BUCKETS_MS[-1])}")
+        return {
+            "total": len(records),
+            "running": statuses["RUNNING"],
+            "succeeded": statuses["SUCCEEDED"],
+            "failed": finished - statuses["SUCCEEDED"],
+            "success_rate": statuses["SUCCEEDED"] / finished if finished else 0.0,
+            "duration_ms": durations.summary(),
+            "histogram": [
+                {"label": label, "count": count} for label, count in zip(labels, histogram)
+            ],
+            "failures": failures.most_common(),
+            "oldest_start": records[-1]["start_date"] if records else None,
+        }
+
+    @staticmethod
+    def _format_ms(value: float) -> str:
+        """Short duration label, e.g. 250ms, 2.5s or 5m."""
+        if value < 1000:
+            return f"{value:g}ms"
+        if value < 60000:
+            return f"{value / 1000:g}s"
+        return f"{value / 60000:g}m"
+
+
+# Global instances
 stepfunctions_service = StepFunctionsService()
+execution_stats = ExecutionStats(stepfunctions_service)
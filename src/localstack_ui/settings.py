@@ -5,15 +5,112 @@ class Settings:
     """Application settings with environment variable support."""
 
     # File upload settings
-    MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "1"))
+    MAX_FILE_SIZE_MB: int = int(os.getenv("MAX_FILE_SIZE_MB", "5120"))
     MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE_MB * 1024 * 1024
 
+    # Streaming multipart uploads (S3 requires parts of at least 5MB, except the last)
+    S3_UPLOAD_PART_SIZE_MB: int = max(5, int(os.getenv("S3_UPLOAD_PART_SIZE_MB", "8")))
+    S3_UPLOAD_PART_SIZE_BYTES: int = S3_UPLOAD_PART_SIZE_MB * 1024 * 1024
+    S3_UPLOAD_CONCURRENCY: int = int(os.getenv("S3_UPLOAD_CONCURRENCY", "4"))
+
+    # Bulk deletes: DeleteObjects batches (of up to 1000 keys) in flight at once
+    S3_DELETE_CONCURRENCY: int = int(os.getenv("S3_DELETE_CONCURRENCY", "4"))
+
+    # Bucket statistics: top-level prefixes scanned at once, deepest prefix level kept
+    S3_STATS_CONCURRENCY: int = int(os.getenv("S3_STATS_CONCURRENCY", "4"))
+    S3_STATS_MAX_DEPTH: int = int(os.getenv("S3_STATS_MAX_DEPTH", "4"))
+
+    # Key search index: seconds before a bucket's index is refreshed, memory budget for all
+    S3_KEY_INDEX_TTL: float = float(os.getenv("S3_KEY_INDEX_TTL", "60"))
+    S3_KEY_INDEX_MEMORY_MB: int = int(os.getenv("S3_KEY_INDEX_MEMORY_MB", "256"))
+
+    # Presigned URL mode: the browser transfers files directly with LocalStack
+    S3_PRESIGNED_URLS: bool = os.getenv("S3_PRESIGNED_URLS", "false").lower() == "true"
+    S3_PRESIGNED_URL_EXPIRY: int = int(os.getenv("S3_PRESIGNED_URL_EXPIRY", "300"))
+
+    # S3 listing settings (keys per page, capped at 1000 by S3)
+    S3_PAGE_SIZE: int = int(os.getenv("S3_PAGE_SIZE", "100"))
+
+    # Lambda function list: seconds the full listing is cached, functions per page
+    LAMBDA_LIST_CACHE_TTL: float = float(os.getenv("LAMBDA_LIST_CACHE_TTL", "30"))
+    LAMBDA_PAGE_SIZE: int = int(os.getenv("LAMBDA_PAGE_SIZE", "20"))
+
+    # Lambda detail page: AWS calls in flight per page, seconds a page is served without
+    # any call, and seconds it is reused while GetFunction shows the function unchanged
+    LAMBDA_DETAIL_CONCURRENCY: int = int(os.getenv("LAMBDA_DETAIL_CONCURRENCY", "4"))
+    LAMBDA_DETAIL_FRESH_TTL: float = float(os.getenv("LAMBDA_DETAIL_FRESH_TTL", "10"))
+    LAMBDA_DETAIL_CACHE_TTL: float = float(os.getenv("LAMBDA_DETAIL_CACHE_TTL", "300"))
+
+    # Lambda load tests: upper bounds on invocations per run and in flight (across all tests)
+    LAMBDA_LOAD_MAX_INVOCATIONS: int = int(os.getenv("LAMBDA_LOAD_MAX_INVOCATIONS", "1000"))
+    LAMBDA_LOAD_MAX_CONCURRENCY: int = int(os.getenv("LAMBDA_LOAD_MAX_CONCURRENCY", "10"))
+
+    # Step Functions state machine list: seconds the full listing is cached, machines per page
+    STEPFUNCTIONS_LIST_CACHE_TTL: float = float(os.getenv("STEPFUNCTIONS_LIST_CACHE_TTL", "30"))
+    STEPFUNCTIONS_PAGE_SIZE: int = int(os.getenv("STEPFUNCTIONS_PAGE_SIZE", "20"))
+    # Last execution status column: list_executions calls in flight, seconds cached
+    STEPFUNCTIONS_STATUS_CONCURRENCY: int = int(os.getenv("STEPFUNCTIONS_STATUS_CONCURRENCY", "8"))
+    STEPFUNCTIONS_STATUS_CACHE_TTL: float = float(os.getenv("STEPFUNCTIONS_STATUS_CACHE_TTL", "10"))
+
+    # Directory for rendered state machine graphs (empty keeps them in memory only)
+    STEPFUNCTIONS_GRAPH_CACHE_DIR: str = os.getenv(
+        "STEPFUNCTIONS_GRAPH_CACHE_DIR", "/tmp/localstack-ui/graphs"
+    )
+
+    # Executions shown per page of the execution browser
+    STEPFUNCTIONS_EXECUTIONS_PAGE_SIZE: int = int(
+        os.getenv("STEPFUNCTIONS_EXECUTIONS_PAGE_SIZE", "50")
+    )
+
+    # Batch runs: upper bounds on executions per run and executions running at once
+    STEPFUNCTIONS_BATCH_MAX_EXECUTIONS: int = int(
+        os.getenv("STEPFUNCTIONS_BATCH_MAX_EXECUTIONS", "1000")
+    )
+    STEPFUNCTIONS_BATCH_MAX_CONCURRENCY: int = int(
+        os.getenv("STEPFUNCTIONS_BATCH_MAX_CONCURRENCY", "50")
+    )
+    # Seconds a batch run waits for its executions before reporting the rest as running
+    STEPFUNCTIONS_BATCH_MAX_WAIT: float = float(os.getenv("STEPFUNCTIONS_BATCH_MAX_WAIT", "600"))
+
+    # Execution statistics: most executions covered (and cached) per state machine
+    STEPFUNCTIONS_STATS_MAX_EXECUTIONS: int = int(
+        os.getenv("STEPFUNCTIONS_STATS_MAX_EXECUTIONS", "1000")
+    )
+
+    # Payload viewer: characters shown before "show all", memory for cached payloads
+    STEPFUNCTIONS_PAYLOAD_PREVIEW_BYTES: int = int(
+        os.getenv("STEPFUNCTIONS_PAYLOAD_PREVIEW_BYTES", "4096")
+    )
+    STEPFUNCTIONS_PAYLOAD_CACHE_MB: int = int(os.getenv("STEPFUNCTIONS_PAYLOAD_CACHE_MB", "64"))
+
+    # Execution history: events per GetExecutionHistory page, seconds between tail polls
+    STEPFUNCTIONS_HISTORY_PAGE_SIZE: int = int(os.getenv("STEPFUNCTIONS_HISTORY_PAGE_SIZE", "200"))
+    STEPFUNCTIONS_TAIL_INTERVAL: float = float(os.getenv("STEPFUNCTIONS_TAIL_INTERVAL", "2"))
+
     # LocalStack settings
     LOCALSTACK_ENDPOINT: str = os.getenv("LOCALSTACK_ENDPOINT", "http://localstack:4566")
+    # LocalStack endpoint as reachable from the browser, used to sign presigned URLs
+    LOCALSTACK_PUBLIC_ENDPOINT: str = os.getenv(
+        "LOCALSTACK_PUBLIC_ENDPOINT", "http://localhost:4566"
+    )
     AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "test")
     AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "test")
 
+    # AWS call concurrency (thread pool size and HTTP connection pool size)
+    AWS_MAX_CONCURRENCY: int = int(os.getenv("AWS_MAX_CONCURRENCY", "16"))
+
+    # Health check settings (seconds)
+    HEALTH_CHECK_TTL: float = float(os.getenv("HEALTH_CHECK_TTL", "10"))
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "3"))
+
+    # Rendered page cache: seconds a page is reused while its data is unchanged, pages kept
+    PAGE_CACHE_TTL: float = float(os.getenv("PAGE_CACHE_TTL", "30"))
+    PAGE_CACHE_MAX_ENTRIES: int = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "256"))
+
+    # Compiled template cache directory (empty compiles templates in every process)
+    TEMPLATE_CACHE_DIR: str = os.getenv("TEMPLATE_CACHE_DIR", "/tmp/localstack-ui/templates")
+
     # Application settings
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     HOST: str = os.getenv("HOST", "0.0.0.0")
@@ -0,0 +1,76 @@
+import os
+from datetime import datetime, timezone
+from typing import Optional
+
+import jinja2
+from starlette.templating import Jinja2Templates
+
+from .services.lambda_service import lambda_service
+from .services.s3 import s3_service
+from .services.stepfunctions_service import stepfunctions_service
+from .settings import settings
+
+# Directory the page templates are loaded from
+TEMPLATE_DIRECTORY = "templates"
+
+
+def format_timestamp(epoch) -> str:
+    """Format epoch seconds as a UTC date and time."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+# Filters available to every template, e.g. {{ obj.size|format_file_size }}
+FILTERS = {
+    "format_file_size": s3_service.format_file_size,
+    "format_timestamp": format_timestamp,
+    "format_memory_size": lambda_service.format_memory_size,
+    "format_timeout": lambda_service.format_timeout,
+    "format_code_size": lambda_service.format_code_size,
+    "format_date": stepfunctions_service.format_date,
+}
+
+
+def _bytecode_cache() -> Optional[jinja2.BytecodeCache]:
+    """Filesystem bytecode cache in TEMPLATE_CACHE_DIR, if set and writable."""
+    cache_dir = settings.TEMPLATE_CACHE_DIR
+    if not cache_dir:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError:
+        return None
+    return jinja2.FileSystemBytecodeCache(cache_dir)
+
+
+def _environment() -> jinja2.Environment:
+    """
+    The one Jinja environment shared by all routes.
+
+    Templates are only checked for changes in DEBUG; otherwise a template is
+    compiled once per process, from the bytecode cache when it has it.
+    """
+    environment = jinja2.Environment(
+        loader=jinja2.FileSystemLoader(TEMPLATE_DIRECTORY),
+        autoescape=True,
+        auto_reload=settings.DEBUG,
+        bytecode_cache=_bytecode_cache(),
+    )
+    environment.filters.update(FILTERS)
+    return environment
+
+
+def precompile_templates() -> int:
+    """
+    Compile every template up front, so no request pays for it.
+
+    Returns:
+        Number of templates compiled
+    """
+    names = templates.env.list_templates(extensions=["html"])
+    for name in names:
+        templates.get_template(name)
+    return len(names)
+
+
+# Global instance
+templates = Jinja2Templates(env=_environment())
@@ -1,5 +1,8 @@
+import json
 import os
+import re
 import time
+from urllib.parse import urlencode
 
 from playwright.sync_api import sync_playwright
 
@@ -9,6 +12,9 @@ class LocalStackUITester:
 
     def __init__(self):
         self.base_url = os.getenv("BASE_URL", "https://localstack-ui-nginx")
+        self.presigned_base_url = os.getenv(
+            "PRESIGNED_BASE_URL", "http://localstack-ui-presigned:8000"
+        )
         self.browser = None
         self.context = None
         self.page = None
@@ -129,6 +135,446 @@ class LocalStackUITester:
 
         print("✓ S3 bucket contents test passed")
 
+    def test_s3_folder_navigation(self):
+        """Test S3 folder browsing with prefixes and breadcrumbs"""
+        print("Testing S3 folder navigation...")
+        self.page.goto(f"{self.base_url}/s3/buckets/demo-bucket-1/contents", timeout=30000)
+        self.wait_for_page_load()
+
+        # Nested files are grouped under their folder at the top level
+        docs_folder = self.page.locator('a:has-text("docs/")').first
+        assert docs_folder.is_visible(), "docs/ folder should be visible"
+        assert self.page.locator('td:has-text("sample.txt")').count() == 0, (
+            "Nested files should not be listed at the top level"
+        )
+
+        # Open the folder
+        docs_folder.click()
+        self.wait_for_page_load()
+        assert "prefix=docs" in self.page.url, f"Expected prefix in URL, got: {self.page.url}"
+
+        sample_file = self.page.locator('td:has-text("sample.txt")').first
+        assert sample_file.is_visible(), "sample.txt should be visible inside docs/"
+
+        # Breadcrumb leads back to the bucket root
+        breadcrumb = self.page.locator('.breadcrumb a:has-text("demo-bucket-1")').first
+        assert breadcrumb.is_visible(), "Bucket breadcrumb should link back to the root"
+
+        print("✓ S3 folder navigation test passed")
+
+    def test_s3_download_range(self):
+        """Test ranged and conditional S3 downloads"""
+        print("Testing S3 download Range and 304...")
+        url = f"{self.base_url}/s3/buckets/demo-bucket-1/files/hello.txt/download"
+
+        # Full download carries the validators
+        response = self.context.request.get(url, timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert response.body() == b"Hello World\n", "Download should return the file body"
+        assert response.headers.get("accept-ranges") == "bytes", "Should advertise byte ranges"
+        etag = response.headers.get("etag")
+        assert etag, "Download should carry an ETag"
+
+        # Partial download
+        response = self.context.request.get(url, headers={"Range": "bytes=0-4"}, timeout=30000)
+        assert response.status == 206, f"Expected 206 for a Range request, got: {response.status}"
+        assert response.body() == b"Hello", "Range request should return only the requested bytes"
+        assert response.headers.get("content-range") == "bytes 0-4/12", (
+            f"Unexpected Content-Range: {response.headers.get('content-range')}"
+        )
+
+        # Conditional download of an unchanged file
+        response = self.context.request.get(url, headers={"If-None-Match": etag}, timeout=30000)
+        assert response.status == 304, f"Expected 304 for a matching ETag, got: {response.status}"
+        assert response.body() == b"", "304 response should have no body"
+
+        print("✓ S3 download Range and 304 test passed")
+
+    def test_s3_multipart_upload(self):
+        """Test uploading a file larger than one multipart part"""
+        print("Testing S3 multipart upload...")
+        # 12 MB spans two 8 MB parts; the byte pattern makes part boundaries checkable
+        data = bytes(range(256)) * (12 * 1024 * 1024 // 256)
+
+        self.page.goto(f"{self.base_url}/s3/buckets/test-uploads/upload", timeout=30000)
+        self.wait_for_page_load()
+
+        upload_button = self.page.locator("#uploadButton")
+        assert upload_button.is_disabled(), "Upload button should wait for a file"
+        self.page.set_input_files(
+            "input#file",
+            files=[
+                {
+                    "name": "multipart-test.bin",
+                    "mimeType": "application/octet-stream",
+                    "buffer": data,
+                }
+            ],
+        )
+        assert upload_button.is_enabled(), "Upload button should be enabled once a file is chosen"
+
+        with self.page.expect_navigation(url="**/s3/buckets/test-uploads/contents", timeout=60000):
+            upload_button.click()
+        self.wait_for_page_load()
+
+        uploaded_file = self.page.locator('td:has-text("multipart-test.bin")').first
+        assert uploaded_file.is_visible(), "Uploaded file should be listed in the bucket"
+
+        # The parts were joined in order: check the size and the bytes around the first boundary
+        url = f"{self.base_url}/s3/buckets/test-uploads/files/multipart-test.bin/download"
+        boundary = 8 * 1024 * 1024
+        response = self.context.request.get(
+            url, headers={"Range": f"bytes={boundary - 8}-{boundary + 7}"}, timeout=30000
+        )
+        assert response.status == 206, f"Expected 206, got: {response.status}"
+        assert response.body() == data[boundary - 8 : boundary + 8], (
+            "Bytes across the part boundary should match the uploaded file"
+        )
+        content_range = response.headers.get("content-range", "")
+        assert content_range.endswith(f"/{len(data)}"), (
+            f"Uploaded size should be {len(data)}, got Content-Range: {content_range}"
+        )
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-files",
+            form={"keys": "multipart-test.bin"},
+            timeout=30000,
+        )
+
+        print("✓ S3 multipart upload test passed")
+
+    def test_s3_presigned_urls(self):
+        """Test that presigned URL mode hands transfers to LocalStack"""
+        print("Testing S3 presigned URLs...")
+        base_url = self.presigned_base_url
+
+        # Downloads redirect to a signed LocalStack URL
+        response = self.context.request.get(
+            f"{base_url}/s3/buckets/demo-bucket-1/files/hello.txt/download",
+            max_redirects=0,
+            timeout=30000,
+        )
+        assert response.status == 307, f"Expected 307, got: {response.status}"
+        location = response.headers.get("location", "")
+        assert "Signature=" in location, f"Expected a presigned URL, got: {location}"
+        assert not location.startswith(base_url), "Download should not go through the UI"
+        response = self.context.request.get(location, timeout=30000)
+        assert response.body() == b"Hello World\n", "Presigned URL should return the file body"
+
+        # The upload form posts straight to LocalStack with a signed policy
+        self.page.goto(f"{base_url}/s3/buckets/test-uploads/upload", timeout=30000)
+        self.wait_for_page_load()
+        action = self.page.locator("#uploadForm").get_attribute("action") or ""
+        assert action and not action.startswith(base_url), (
+            f"Upload form should post to LocalStack, got: {action}"
+        )
+        assert self.page.locator('#uploadForm input[name="policy"]').count() == 1, (
+            "Upload form should carry the presigned policy"
+        )
+        self.page.set_input_files(
+            "input#file",
+            files=[{"name": "presigned-test.txt", "mimeType": "text/plain", "buffer": b"test\n"}],
+        )
+
+        # LocalStack redirects back to the bucket once the file is stored
+        with self.page.expect_navigation(
+            url="**/s3/buckets/test-uploads/contents**", timeout=60000
+        ):
+            self.page.locator("#uploadButton").click()
+        self.wait_for_page_load()
+        assert self.page.locator('td:has-text("presigned-test.txt")').first.is_visible(), (
+            "File uploaded through the presigned form should be listed"
+        )
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-files",
+            form={"keys": "presigned-test.txt"},
+            timeout=30000,
+        )
+
+        print("✓ S3 presigned URLs test passed")
+
+    def upload_test_file(self, bucket_name, key, body=b"test\n"):
+        """Upload a file through the upload form endpoint, keeping any folder in its key"""
+        response = self.context.request.post(
+            f"{self.base_url}/s3/buckets/{bucket_name}/upload",
+            multipart={"file": {"name": key, "mimeType": "text/plain", "buffer": body}},
+            timeout=30000,
+        )
+        assert response.ok, f"Upload of {key} failed with {response.status}"
+
+    def listed_keys(self):
+        """Keys of the files listed on the current bucket contents page"""
+        return self.page.locator('input[name="keys"]').evaluate_all(
+            "inputs => inputs.map(input => input.value)"
+        )
+
+    def test_s3_pagination(self):
+        """Test paging forward and back through a folder with cursors"""
+        print("Testing S3 pagination...")
+        keys = [f"page-test/f{i}.txt" for i in range(1, 6)]
+        for key in keys:
+            self.upload_test_file("test-uploads", key)
+
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/test-uploads/contents?prefix=page-test/&page_size=2",
+            timeout=30000,
+        )
+        self.wait_for_page_load()
+        assert self.listed_keys() == keys[0:2], f"Unexpected first page: {self.listed_keys()}"
+        previous_link = self.page.locator("a.pagination-previous")
+        next_link = self.page.locator("a.pagination-next")
+        assert previous_link.get_attribute("disabled") is not None, (
+            "Previous should be disabled on the first page"
+        )
+
+        # Forward to the last page
+        next_link.click()
+        self.wait_for_page_load()
+        assert "cursor=" in self.page.url, f"Expected a cursor in URL, got: {self.page.url}"
+        assert "page_size=2" in self.page.url, "Page size should be kept while paging"
+        assert self.listed_keys() == keys[2:4], f"Unexpected second page: {self.listed_keys()}"
+        next_link.click()
+        self.wait_for_page_load()
+        assert self.listed_keys() == keys[4:], f"Unexpected last page: {self.listed_keys()}"
+        assert next_link.get_attribute("disabled") is not None, (
+            "Next should be disabled on the last page"
+        )
+
+        # And back again
+        previous_link.click()
+        self.wait_for_page_load()
+        assert self.listed_keys() == keys[2:4], "Previous should return to the second page"
+        previous_link.click()
+        self.wait_for_page_load()
+        assert self.listed_keys() == keys[0:2], "Previous should return to the first page"
+        assert "cursor=" not in self.page.url, "The first page should not need a cursor"
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-prefix",
+            form={"prefix": "page-test/"},
+            timeout=30000,
+        )
+
+        print("✓ S3 pagination test passed")
+
+    def stats_total_objects(self):
+        """Total Objects figure on the current bucket statistics page"""
+        total = self.page.locator('p.heading:has-text("Total Objects") + p.title').first
+        return int(total.text_content().strip())
+
+    def test_s3_bucket_stats(self):
+        """Test bucket statistics totals and their per-prefix breakdown"""
+        print("Testing S3 bucket statistics...")
+        stats_url = f"{self.base_url}/s3/buckets/test-uploads/stats?depth=2"
+
+        # Compute (and cache) the statistics before adding files
+        self.page.goto(stats_url, timeout=30000)
+        self.wait_for_page_load()
+        assert "test-uploads Statistics" in self.page.title(), (
+            f"Expected statistics in title, got: {self.page.title()}"
+        )
+        initial_objects = self.stats_total_objects()
+
+        # Uploads through the UI invalidate the cached statistics
+        self.upload_test_file("test-uploads", "stats-test/a.txt", b"a" * 100)
+        self.upload_test_file("test-uploads", "stats-test/nested/b.txt", b"b" * 50)
+        self.page.goto(stats_url, timeout=30000)
+        self.wait_for_page_load()
+        assert self.stats_total_objects() == initial_objects + 2, (
+            f"Expected {initial_objects + 2} objects, got: {self.stats_total_objects()}"
+        )
+
+        # Each prefix row totals the files under it, nested folders included
+        for prefix, objects, size in (
+            ("stats-test/", "2", "150.0 B"),
+            ("stats-test/nested/", "1", "50.0 B"),
+        ):
+            cells = self.page.locator(f'tr:has(a:text-is("{prefix}")) td')
+            assert cells.nth(1).text_content().strip() == objects, (
+                f"{prefix} should hold {objects} object(s), got: {cells.nth(1).text_content()}"
+            )
+            assert cells.nth(2).text_content().strip() == size, (
+                f"{prefix} should total {size}, got: {cells.nth(2).text_content()}"
+            )
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-prefix",
+            form={"prefix": "stats-test/"},
+            timeout=30000,
+        )
+        self.page.goto(stats_url, timeout=30000)
+        self.wait_for_page_load()
+        assert self.stats_total_objects() == initial_objects, (
+            "Statistics should drop the deleted files"
+        )
+
+        print("✓ S3 bucket statistics test passed")
+
+    def test_s3_top_objects(self):
+        """Test the largest-files report across a folder and its subfolders"""
+        print("Testing S3 top objects...")
+        for key, size in (
+            ("top-test/small.txt", 10),
+            ("top-test/big.txt", 300),
+            ("top-test/sub/mid.txt", 100),
+        ):
+            self.upload_test_file("test-uploads", key, b"x" * size)
+
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/test-uploads/contents?prefix=top-test/&page_size=2",
+            timeout=30000,
+        )
+        self.wait_for_page_load()
+        self.page.locator('.tabs a:has-text("Largest")').click()
+        self.wait_for_page_load()
+
+        assert "sort=largest" in self.page.url, f"Expected sort in URL, got: {self.page.url}"
+        summary = self.page.locator('p:has-text("largest file(s)")').first
+        assert "Top 2 largest" in summary.text_content(), (
+            f"Report should list page-size files, got: {summary.text_content()}"
+        )
+        # Largest first, nested files included, the smallest left out
+        assert self.listed_keys() == ["top-test/big.txt", "top-test/sub/mid.txt"], (
+            f"Unexpected largest files: {self.listed_keys()}"
+        )
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-prefix",
+            form={"prefix": "top-test/"},
+            timeout=30000,
+        )
+
+        print("✓ S3 top objects test passed")
+
+    def test_s3_bulk_delete(self):
+        """Test deleting selected files and whole folders"""
+        print("Testing S3 bulk and prefix delete...")
+        for key in ("bulk-test/a.txt", "bulk-test/b.txt", "bulk-test/keep.txt"):
+            self.upload_test_file("test-uploads", key)
+
+        # Delete two selected files
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/test-uploads/contents?prefix=bulk-test/", timeout=30000
+        )
+        self.wait_for_page_load()
+        delete_selected = self.page.locator("#deleteSelected")
+        assert delete_selected.is_disabled(), "Delete Selected should wait for a selection"
+
+        self.page.locator('input[name="keys"][value="bulk-test/a.txt"]').check()
+        self.page.locator('input[name="keys"][value="bulk-test/b.txt"]').check()
+        assert delete_selected.is_enabled(), "Delete Selected should be enabled after selecting"
+
+        self.page.once("dialog", lambda dialog: dialog.accept())
+        delete_selected.click()
+        self.wait_for_page_load()
+
+        assert "prefix=bulk-test" in self.page.url, "Should return to the same folder"
+        assert self.page.locator('td:has-text("a.txt")').count() == 0, "a.txt should be deleted"
+        assert self.page.locator('td:has-text("b.txt")').count() == 0, "b.txt should be deleted"
+        assert self.page.locator('td:has-text("keep.txt")').first.is_visible(), (
+            "Unselected files should be kept"
+        )
+
+        # Delete the whole folder, including nested files
+        self.upload_test_file("test-uploads", "bulk-test/nested/c.txt")
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-prefix?prefix=bulk-test/",
+            timeout=30000,
+        )
+        self.wait_for_page_load()
+
+        self.page.once("dialog", lambda dialog: dialog.accept())
+        self.page.locator('button:has-text("Yes, Delete Folder")').click()
+        self.wait_for_page_load()
+
+        assert "/s3/buckets/test-uploads/contents" in self.page.url, (
+            f"Should return to the parent folder, got: {self.page.url}"
+        )
+        assert self.page.locator('a:has-text("bulk-test/")').count() == 0, (
+            "Deleted folder should no longer be listed"
+        )
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/test-uploads/contents?prefix=bulk-test/", timeout=30000
+        )
+        self.wait_for_page_load()
+        assert self.page.locator('input[name="keys"]').count() == 0, (
+            "No files should remain under the deleted folder"
+        )
+
+        print("✓ S3 bulk and prefix delete test passed")
+
+    def test_s3_key_search(self):
+        """Test searching keys across folders from the key index"""
+        print("Testing S3 key search...")
+        self.page.goto(f"{self.base_url}/s3/buckets/demo-bucket-1/contents", timeout=30000)
+        self.wait_for_page_load()
+
+        # Search from the bucket root finds nested keys
+        self.page.fill('input[name="q"]', "sample")
+        self.page.locator('button:has-text("Search")').click()
+        self.wait_for_page_load()
+
+        assert "q=sample" in self.page.url, f"Expected query in URL, got: {self.page.url}"
+        summary = self.page.locator('p:has-text("key(s) match")').first
+        assert summary.is_visible(), "Search summary should be visible"
+        assert '1 key(s) match "sample"' in summary.text_content(), (
+            f"Unexpected search summary: {summary.text_content()}"
+        )
+        assert self.page.locator('td:has-text("docs/sample.txt")').first.is_visible(), (
+            "Nested match should be listed with its folder"
+        )
+        assert self.page.locator('td:has-text("hello.txt")').count() == 0, (
+            "Non-matching keys should not be listed"
+        )
+
+        # No matches
+        self.page.goto(
+            f"{self.base_url}/s3/buckets/demo-bucket-1/contents?q=no-such-key", timeout=30000
+        )
+        self.wait_for_page_load()
+        assert self.page.locator('p:has-text("0 key(s) match")').first.is_visible(), (
+            "Search without matches should say so"
+        )
+
+        # Warm the test-uploads index, so the checks below cover a built index
+        search_url = f"{self.base_url}/s3/buckets/test-uploads/contents?q=needle"
+        self.page.goto(search_url, timeout=30000)
+        self.wait_for_page_load()
+        assert self.page.locator('p:has-text("0 key(s) match")').first.is_visible(), (
+            "test-uploads should have no matching keys yet"
+        )
+
+        # Keys uploaded through the UI show up in the next search
+        self.upload_test_file("test-uploads", "search-test/needle-123.txt")
+        self.page.goto(search_url, timeout=30000)
+        self.wait_for_page_load()
+        assert self.page.locator('td:has-text("search-test/needle-123.txt")').first.is_visible(), (
+            "Uploaded key should be found by the next search"
+        )
+
+        # Keys deleted through the UI are gone from the next search
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-files",
+            form={"keys": "search-test/needle-123.txt"},
+            timeout=30000,
+        )
+        self.page.goto(search_url, timeout=30000)
+        self.wait_for_page_load()
+        assert self.page.locator('td:has-text("search-test/needle-123.txt")').count() == 0, (
+            "Deleted key should not be found by the next search"
+        )
+        assert self.page.locator('p:has-text("0 key(s) match")').first.is_visible(), (
+            "Search should report no matches after the delete"
+        )
+
+        print("✓ S3 key search test passed")
+
     def test_lambda_function_listing(self):
         """Test Lambda function listing page"""
         print("Testing Lambda function listing...")
@@ -199,6 +645,147 @@ class LocalStackUITester:
 
         print("✓ Lambda function detail test passed")
 
+    def search_functions(self, query):
+        """Open the function listing for a search and return the function names shown"""
+        self.page.goto(
+            f"{self.base_url}/lambda/functions?{urlencode({'search': query})}", timeout=30000
+        )
+        self.wait_for_page_load()
+        return [name.strip() for name in self.page.locator("p.title.is-4").all_text_contents()]
+
+    def test_lambda_search(self):
+        """Test Lambda function search with field filters"""
+        print("Testing Lambda search filters...")
+
+        # Field filter
+        names = self.search_functions("runtime:python3.11")
+        assert names == ["data-processor"], f"Expected only data-processor, got: {names}"
+        summary = self.page.locator('.notification:has-text("function(s) matching")').first
+        assert summary.is_visible(), "Search should report the number of matches"
+        assert "Found 1 function(s)" in " ".join(summary.text_content().split()), (
+            f"Unexpected search summary: {summary.text_content()}"
+        )
+
+        names = self.search_functions("name:hello")
+        assert names == ["hello-world"], f"Expected only hello-world, got: {names}"
+
+        # Free text matches word prefixes in any field
+        names = self.search_functions("process")
+        assert names == ["data-processor"], f"Expected only data-processor, got: {names}"
+
+        # Terms that start no word fall back to a substring match
+        names = self.search_functions("orld")
+        assert names == ["hello-world"], f"Expected only hello-world, got: {names}"
+
+        # Every term must match
+        names = self.search_functions("runtime:python3.11 hello")
+        assert names == [], f"Expected no matches, got: {names}"
+        assert self.page.locator('h4:has-text("No Functions Found")').first.is_visible(), (
+            "Search without matches should say so"
+        )
+
+        print("✓ Lambda search filters test passed")
+
+    def aws_calls(self):
+        """AWS calls the app has made so far, from the executor metrics"""
+        metrics = self.context.request.get(f"{self.base_url}/health/executor").json()
+        return metrics["completed"] + metrics["failed"]
+
+    def test_lambda_detail_cache(self):
+        """Test that revisiting an unchanged function costs no AWS calls"""
+        print("Testing Lambda detail cache...")
+        url = f"{self.base_url}/lambda/functions/hello-world"
+
+        # Refresh fetches the function and every section
+        before = self.aws_calls()
+        response = self.context.request.get(f"{url}?refresh=1", timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        fetch_calls = self.aws_calls() - before
+        assert fetch_calls > 1, (
+            f"Refresh should fetch the function and sections, made {fetch_calls}"
+        )
+
+        # Coming back straight away is served from the cache
+        before = self.aws_calls()
+        response = self.context.request.get(url, timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert self.aws_calls() - before == 0, (
+            f"Revisit should make no AWS calls, made {self.aws_calls() - before}"
+        )
+
+        print("✓ Lambda detail cache test passed")
+
+    def test_lambda_listing_cache(self):
+        """Test that the function list is served from its cache until refreshed"""
+        print("Testing Lambda listing cache...")
+        url = f"{self.base_url}/lambda/functions"
+        self.page.goto(url, timeout=30000)
+        self.wait_for_page_load()
+
+        # Refresh drops the cached list, so the functions are listed again
+        before = self.aws_calls()
+        with self.page.expect_navigation(url="**/lambda/functions", timeout=30000):
+            self.page.locator('button:has-text("Refresh")').click()
+        self.wait_for_page_load()
+        assert self.aws_calls() - before > 0, "Refresh should list the functions again"
+        names = [name.strip() for name in self.page.locator("p.title.is-4").all_text_contents()]
+        assert "hello-world" in names, f"hello-world should be listed after a refresh, got: {names}"
+
+        # Coming back within the cache TTL makes no AWS calls
+        before = self.aws_calls()
+        response = self.context.request.get(url, timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert "hello-world" in response.text(), "Cached list should include hello-world"
+        assert self.aws_calls() - before == 0, (
+            f"Cached list should make no AWS calls, made {self.aws_calls() - before}"
+        )
+
+        # A page past the end shows the last page
+        response = self.context.request.get(f"{url}?page=99", timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert "hello-world" in response.text(), "Out-of-range page should show the last page"
+
+        print("✓ Lambda listing cache test passed")
+
+    def test_lambda_load_test(self):
+        """Test the load-test endpoint's progress snapshots and its limits"""
+        print("Testing Lambda load test...")
+        url = f"{self.base_url}/lambda/functions/hello-world/load-test"
+
+        response = self.context.request.post(
+            url, form={"payload": "{}", "count": "6", "concurrency": "3"}, timeout=120000
+        )
+        assert response.ok, f"Load test failed with {response.status}: {response.text()}"
+        assert "ndjson" in response.headers.get("content-type", ""), "Should stream NDJSON"
+        snapshots = [json.loads(line) for line in response.text().strip().splitlines()]
+
+        # Progress only moves forward and only the last snapshot is final
+        completed = [snapshot["completed"] for snapshot in snapshots]
+        assert completed == sorted(completed), f"Progress should not go back: {completed}"
+        assert [snapshot["done"] for snapshot in snapshots].count(True) == 1, (
+            "Exactly one snapshot should be final"
+        )
+        final = snapshots[-1]
+        assert final["done"] and final["completed"] == 6, f"All 6 should finish, got: {final}"
+        assert final["count"] == 6 and final["concurrency"] == 3, (
+            f"Snapshot should echo the settings, got: {final}"
+        )
+        assert final["latency_ms"], "Final snapshot should summarise latency"
+
+        # Out-of-range settings and bad payloads are rejected up front
+        for form, message in (
+            ({"payload": "{}", "count": "0", "concurrency": "1"}, "Invocations must be"),
+            ({"payload": "{}", "count": "1", "concurrency": "0"}, "Concurrency must be"),
+            ({"payload": "{not json", "count": "1", "concurrency": "1"}, "not valid JSON"),
+        ):
+            response = self.context.request.post(url, form=form, timeout=30000)
+            assert response.status == 400, f"Expected 400 for {form}, got: {response.status}"
+            assert message in response.json()["error"], (
+                f"Unexpected error for {form}: {response.json()}"
+            )
+
+        print("✓ Lambda load test passed")
+
     def test_stepfunctions_listing(self):
         """Test Step Functions state machine listing page"""
         print("Testing Step Functions listing...")
@@ -266,6 +853,402 @@ class LocalStackUITester:
 
         print("✓ Step Functions detail test passed")
 
+    def test_stepfunctions_definition_stats(self):
+        """Test the parsed definition, its stats and the cost of a detail page"""
+        print("Testing Step Functions definition stats...")
+        state_machine_arn = (
+            "arn:aws:states:us-east-1:000000000000:stateMachine:DataProcessingWorkflow"
+        )
+        url = f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}"
+        self.page.goto(url, timeout=30000)
+        self.wait_for_page_load()
+
+        states = self.page.locator('p.heading:text-is("States") + p.title').first
+        assert states.text_content().strip() == "4", (
+            f"Expected 4 states, got: {states.text_content()}"
+        )
+        state_types = self.page.locator('.field:has(label:text-is("State Types")) .tag')
+        types = [text.strip() for text in state_types.all_text_contents()]
+        assert types == ["Choice", "Fail", "Succeed", "Task"], f"Unexpected state types: {types}"
+
+        # The definition is shown pretty-printed with sorted keys
+        definition = self.page.locator("#definition-json").text_content()
+        assert json.loads(definition)["StartAt"] == "ProcessData", "Definition should parse"
+        assert definition.startswith('{\n  "Comment": '), (
+            f"Definition should be indented with sorted keys, got: {definition[:40]!r}"
+        )
+
+        # A detail page costs one describe and one execution listing
+        before = self.aws_calls()
+        response = self.context.request.get(url, timeout=30000)
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert self.aws_calls() - before == 2, (
+            f"Detail page should make 2 AWS calls, made {self.aws_calls() - before}"
+        )
+
+        print("✓ Step Functions definition stats test passed")
+
+    def test_stepfunctions_graph(self):
+        """Test the server-rendered graph of a state machine definition"""
+        print("Testing Step Functions graph...")
+        state_machine_arn = (
+            "arn:aws:states:us-east-1:000000000000:stateMachine:DataProcessingWorkflow"
+        )
+        self.page.goto(
+            f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}", timeout=30000
+        )
+        self.wait_for_page_load()
+
+        graph = self.page.locator("svg.asl-graph").first
+        assert graph.is_visible(), "State machine graph should be rendered"
+
+        # One node per state, end states marked
+        names = sorted(graph.locator("g.state text.name").all_text_contents())
+        assert names == ["CheckResult", "Failure", "ProcessData", "Success"], (
+            f"Graph should have a node per state, got: {names}"
+        )
+        ends = sorted(graph.locator("g.state.end text.name").all_text_contents())
+        assert ends == ["Failure", "Success"], f"Succeed and Fail should end the graph: {ends}"
+
+        # The Choice state's two branches are drawn as choice edges
+        assert graph.locator("path.edge.choice").count() == 2, (
+            "Choice state should have two choice edges"
+        )
+
+        print("✓ Step Functions graph test passed")
+
+    def run_execution(self, state_machine_name, execution_input="{}"):
+        """Run one execution through the batch endpoint and return its ARN once finished"""
+        state_machine_arn = (
+            f"arn:aws:states:us-east-1:000000000000:stateMachine:{state_machine_name}"
+        )
+        response = self.context.request.post(
+            f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}/batch",
+            form={"input": execution_input, "count": "1", "concurrency": "1"},
+            timeout=120000,
+        )
+        assert response.ok, f"Batch run failed with {response.status}: {response.text()}"
+        snapshot = json.loads(response.text().strip().splitlines()[-1])
+        assert snapshot["done"] and snapshot["completed"] == 1, (
+            f"Execution should have finished, got: {snapshot}"
+        )
+        return (
+            f"arn:aws:states:us-east-1:000000000000:execution:{state_machine_name}:"
+            f"batch-{snapshot['batch_id']}-00001"
+        )
+
+    def test_stepfunctions_latest_execution(self):
+        """Test that the listing links each state machine's latest execution"""
+        print("Testing Step Functions latest execution...")
+        execution_arn = self.run_execution("SimpleExample")
+        execution_name = execution_arn.rsplit(":", 1)[-1]
+
+        # Refresh drops the cached statuses, so the new execution shows at once
+        self.page.goto(f"{self.base_url}/stepfunctions/state-machines", timeout=30000)
+        self.wait_for_page_load()
+        with self.page.expect_navigation(url="**/stepfunctions/state-machines", timeout=30000):
+            self.page.locator('button:has-text("Refresh")').click()
+        self.wait_for_page_load()
+
+        card = self.page.locator('.card:has(p.title:text-is("SimpleExample"))').first
+        assert card.is_visible(), "SimpleExample should be listed"
+        latest = card.locator("a.tag").first
+        assert latest.is_visible(), "SimpleExample should link its last execution"
+        assert execution_name in (latest.get_attribute("href") or ""), (
+            f"Last execution should be {execution_name}, got: {latest.get_attribute('href')}"
+        )
+        assert latest.text_content().strip() in ("SUCCEEDED", "FAILED"), (
+            f"Finished execution should show its final status, got: {latest.text_content()}"
+        )
+
+        print("✓ Step Functions latest execution test passed")
+
+    def stream_events(self, execution_arn, **params):
+        """Read an execution's NDJSON event stream and return its lines"""
+        response = self.context.request.get(
+            f"{self.base_url}/stepfunctions/executions/{execution_arn}/events?{urlencode(params)}",
+            timeout=60000,
+        )
+        assert response.ok, f"Event stream failed with {response.status}"
+        assert "ndjson" in response.headers.get("content-type", ""), "Should stream NDJSON"
+        return [json.loads(line) for line in response.text().strip().splitlines()]
+
+    def test_stepfunctions_event_stream(self):
+        """Test the streamed event history in both orders and in follow mode"""
+        print("Testing Step Functions event stream...")
+        execution_arn = self.run_execution("SimpleExample")
+
+        # Oldest first, ending with a done marker
+        lines = self.stream_events(execution_arn)
+        assert lines[-1] == {"done": True}, f"Stream should end with done, got: {lines[-1]}"
+        events = [event for line in lines[:-1] for event in line["events"]]
+        ids = [event["id"] for event in events]
+        assert ids == sorted(ids) and len(ids) > 2, f"Events should be oldest first: {ids}"
+        assert events[0]["type"] == "ExecutionStarted", (
+            f"First event should be ExecutionStarted, got: {events[0]['type']}"
+        )
+
+        # Newest first
+        lines = self.stream_events(execution_arn, reverse="1")
+        assert lines[-1] == {"done": True}, "Reversed stream should end with done"
+        reversed_ids = [event["id"] for line in lines[:-1] for event in line["events"]]
+        assert reversed_ids == ids[::-1], f"Reverse should send newest first: {reversed_ids}"
+
+        # Following a finished execution sends its history once and stops
+        lines = self.stream_events(execution_arn, follow="1")
+        assert lines[-1] == {"done": True}, "Follow should stop once the execution finished"
+        assert not any(line.get("tail") for line in lines[:-1]), (
+            "A finished execution should have no tailed events"
+        )
+        followed_ids = [event["id"] for line in lines[:-1] for event in line["events"]]
+        assert followed_ids == ids, "Follow should send each event exactly once"
+
+        # Unknown executions end the stream with an error line
+        lines = self.stream_events(execution_arn.rsplit(":", 1)[0] + ":no-such-execution")
+        assert "error" in lines[-1], f"Unknown execution should report an error, got: {lines}"
+
+        print("✓ Step Functions event stream test passed")
+
+    def listed_executions(self):
+        """(name, status) of each row on the current execution browser page"""
+        rows = self.page.locator("table tbody tr")
+        return [
+            (
+                row.locator("td").nth(0).text_content().strip(),
+                row.locator("td").nth(1).text_content().strip(),
+            )
+            for row in rows.all()
+        ]
+
+    def test_stepfunctions_execution_browser(self):
+        """Test filtering a state machine's executions by status and date"""
+        print("Testing Step Functions execution browser...")
+        execution_arn = self.run_execution("SimpleExample")
+        execution_name = execution_arn.rsplit(":", 1)[-1]
+        state_machine_arn = "arn:aws:states:us-east-1:000000000000:stateMachine:SimpleExample"
+        url = f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}/executions"
+
+        # Unfiltered, newest first
+        self.page.goto(url, timeout=30000)
+        self.wait_for_page_load()
+        executions = self.listed_executions()
+        assert executions and executions[0][0] == execution_name, (
+            f"Newest execution should be {execution_name}, got: {executions[:1]}"
+        )
+        status = executions[0][1]
+
+        # The status tab only lists executions with that status
+        self.page.locator(f'.tabs a:text-is("{status}")').click()
+        self.wait_for_page_load()
+        assert f"status={status}" in self.page.url, f"Expected status in URL: {self.page.url}"
+        executions = self.listed_executions()
+        assert execution_name in [name for name, _ in executions], (
+            f"{execution_name} should be listed under {status}"
+        )
+        assert {listed for _, listed in executions} == {status}, (
+            f"Only {status} executions should be listed, got: {executions}"
+        )
+        other = "ABORTED" if status != "ABORTED" else "TIMED_OUT"
+        self.page.goto(f"{url}?status={other}", timeout=30000)
+        self.wait_for_page_load()
+        assert execution_name not in [name for name, _ in self.listed_executions()], (
+            f"{execution_name} should not be listed under {other}"
+        )
+
+        # Date filters
+        self.page.goto(f"{url}?until=2000-01-01", timeout=30000)
+        self.wait_for_page_load()
+        assert self.page.locator(".notification:has-text('selected date range')").is_visible(), (
+            "A date range without executions should say so"
+        )
+        self.page.goto(f"{url}?since=yesterday", timeout=30000)
+        self.wait_for_page_load()
+        assert self.page.locator(".notification:has-text('YYYY-MM-DD')").is_visible(), (
+            "Malformed dates should be reported"
+        )
+
+        print("✓ Step Functions execution browser test passed")
+
+    def test_stepfunctions_batch_runner(self):
+        """Test batch progress snapshots, templated inputs and input limits"""
+        print("Testing Step Functions batch runner...")
+        state_machine_arn = "arn:aws:states:us-east-1:000000000000:stateMachine:SimpleExample"
+        batch_url = f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}/batch"
+
+        response = self.context.request.post(
+            batch_url,
+            form={
+                "input": '{"order": "{{index}}", "batch": "{{batch}}"}',
+                "count": "3",
+                "concurrency": "2",
+            },
+            timeout=120000,
+        )
+        assert response.ok, f"Batch run failed with {response.status}: {response.text()}"
+        snapshots = [json.loads(line) for line in response.text().strip().splitlines()]
+
+        # Progress only moves forward and the last snapshot accounts for every execution
+        completed = [snapshot["completed"] for snapshot in snapshots]
+        assert completed == sorted(completed), f"Progress should not go back: {completed}"
+        final = snapshots[-1]
+        assert final["done"] and not final["timed_out"], f"Batch should finish, got: {final}"
+        assert final["started"] == final["completed"] == 3 and final["running"] == 0, (
+            f"All 3 executions should have finished, got: {final}"
+        )
+        assert final["succeeded"] + final["failed"] == 3, f"Outcomes should add up: {final}"
+        assert final["max_wait"] > 0, "Snapshot should report the batch time limit"
+
+        # Each execution got its own rendered input
+        execution_arn = (
+            f"arn:aws:states:us-east-1:000000000000:execution:SimpleExample:"
+            f"batch-{final['batch_id']}-00002"
+        )
+        response = self.context.request.get(
+            f"{self.base_url}/stepfunctions/executions/{execution_arn}/payload?source=input",
+            timeout=30000,
+        )
+        assert response.ok, f"Expected the second execution's input, got: {response.status}"
+        assert json.loads(response.json()["text"]) == {
+            "order": "2",
+            "batch": final["batch_id"],
+        }, f"Unexpected rendered input: {response.json()['text']}"
+
+        # Out-of-range settings and bad templates are rejected up front
+        for form, message in (
+            ({"input": "{}", "count": "0", "concurrency": "1"}, "Executions must be"),
+            ({"input": "{}", "count": "1", "concurrency": "0"}, "Concurrency must be"),
+            ({"input": "{}", "count": "1", "concurrency": "1", "rate": "-1"}, "Rate must be"),
+            ({"input": "{{index}", "count": "1", "concurrency": "1"}, "not valid JSON"),
+        ):
+            response = self.context.request.post(batch_url, form=form, timeout=30000)
+            assert response.status == 400, f"Expected 400 for {form}, got: {response.status}"
+            assert message in response.json()["error"], (
+                f"Unexpected error for {form}: {response.json()}"
+            )
+
+        print("✓ Step Functions batch runner test passed")
+
+    def test_stepfunctions_statistics(self):
+        """Test the execution statistics page and its query validation"""
+        print("Testing Step Functions statistics...")
+        self.run_execution("SimpleExample")
+        state_machine_arn = "arn:aws:states:us-east-1:000000000000:stateMachine:SimpleExample"
+        url = f"{self.base_url}/stepfunctions/state-machines/{state_machine_arn}/stats"
+
+        response = self.page.goto(url, timeout=30000)
+        self.wait_for_page_load()
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        assert "SimpleExample Statistics" in self.page.title(), (
+            f"Expected statistics in title, got: {self.page.title()}"
+        )
+        executions = self.page.locator('.box:has(p.heading:text-is("Executions")) p.title').first
+        assert int(executions.text_content()) >= 1, "The finished execution should be counted"
+        assert self.page.locator('p.heading:has-text("Success Rate")').first.is_visible(), (
+            "Success rate should be shown"
+        )
+
+        # Time window
+        response = self.page.goto(f"{url}?hours=24", timeout=30000)
+        self.wait_for_page_load()
+        assert response.status == 200, f"Expected 200 for ?hours=24, got: {response.status}"
+        active_tab = self.page.locator(".tabs li.is-active").first
+        assert active_tab.text_content().strip() == "24h", "The 24h window should be selected"
+
+        # Invalid windows are rejected
+        for query in ("hours=-1", "hours=0", "limit=0", "limit=abc"):
+            response = self.page.goto(f"{url}?{query}", timeout=30000)
+            assert response.status == 400, f"Expected 400 for ?{query}, got: {response.status}"
+            error = self.page.locator(".notification.is-danger").first
+            assert "positive whole numbers" in error.text_content(), (
+                f"?{query} should explain the error"
+            )
+
+        print("✓ Step Functions statistics test passed")
+
+    def test_stepfunctions_payload_viewer(self):
+        """Test the lazy execution payload viewer and its drill-down"""
+        print("Testing Step Functions payload viewer...")
+        execution_input = json.dumps({"order": {"id": 42, "items": ["a", "b"]}})
+        execution_arn = self.run_execution("SimpleExample", execution_input)
+
+        self.page.goto(f"{self.base_url}/stepfunctions/executions/{execution_arn}", timeout=30000)
+        self.wait_for_page_load()
+
+        # The input is loaded after the page, starting at the root
+        viewer = self.page.locator('#payloads .payload-viewer[data-source="input"]')
+        viewer.locator("pre").wait_for(timeout=10000)
+        assert viewer.locator(".tag").first.text_content().startswith("$ · object"), (
+            "Input viewer should start at the root object"
+        )
+        assert '"order"' in viewer.locator("pre").text_content(), "Input should be shown"
+
+        # Drill into a child and back
+        viewer.locator('a.tag:has-text("order · object")').click()
+        viewer.locator('.tag:has-text("$.order · object")').wait_for(timeout=10000)
+        assert '"items"' in viewer.locator("pre").text_content(), "Child value should be shown"
+        assert viewer.locator('a.tag:has-text("items · array")').is_visible(), (
+            "Nested children should be listed"
+        )
+        viewer.locator('a.tag:has-text("Back to $")').click()
+        viewer.locator('.tag:has-text("$ · object")').wait_for(timeout=10000)
+
+        output_viewer = self.page.locator('#payloads .payload-viewer[data-source="output"]')
+        output_viewer.locator("pre").wait_for(timeout=10000)
+
+        # Parts of a payload can be fetched by path
+        payload_url = f"{self.base_url}/stepfunctions/executions/{execution_arn}/payload"
+        response = self.context.request.get(
+            f"{payload_url}?{urlencode({'source': 'input', 'path': '$.order.items'})}",
+            timeout=30000,
+        )
+        assert response.status == 200, f"Expected 200, got: {response.status}"
+        payload = response.json()
+        assert payload["type"] == "array", f"Expected an array, got: {payload['type']}"
+        assert [child["path"] for child in payload["children"]] == [
+            "$.order.items[0]",
+            "$.order.items[1]",
+        ], f"Unexpected children: {payload['children']}"
+
+        response = self.context.request.get(f"{payload_url}?source=nowhere", timeout=30000)
+        assert response.status == 400, f"Expected 400 for a bad source, got: {response.status}"
+
+        print("✓ Step Functions payload viewer test passed")
+
+    def test_template_filters(self):
+        """Test that the shared template filters format values on every service's pages"""
+        print("Testing template filters...")
+
+        # S3: object sizes
+        self.page.goto(f"{self.base_url}/s3/buckets/demo-bucket-1/contents", timeout=30000)
+        self.wait_for_page_load()
+        row = self.page.locator('tr:has(td:has-text("hello.txt"))').first
+        assert row.locator('td:text-is("12.0 B")').count() == 1, (
+            f"hello.txt should be shown as 12.0 B, got: {row.text_content()}"
+        )
+
+        # S3: computation time on the statistics page
+        self.page.goto(f"{self.base_url}/s3/buckets/demo-bucket-1/stats", timeout=30000)
+        self.wait_for_page_load()
+        computed = self.page.locator('p.heading:has-text("Computed") + p').first.text_content()
+        assert computed.strip().endswith(" UTC"), f"Expected a UTC timestamp, got: {computed}"
+
+        # Lambda: memory and timeout of a function with non-default settings
+        self.page.goto(f"{self.base_url}/lambda/functions", timeout=30000)
+        self.wait_for_page_load()
+        card = self.page.locator('.card:has(p.title:text-is("data-processor"))').first
+        tags = [" ".join(tag.split()) for tag in card.locator(".tags .tag").all_text_contents()]
+        assert "256 MB" in tags and "30s" in tags, f"Expected 256 MB and 30s, got: {tags}"
+
+        # Step Functions: creation dates
+        self.page.goto(f"{self.base_url}/stepfunctions/state-machines", timeout=30000)
+        self.wait_for_page_load()
+        created = self.page.locator('small:has-text("Created:")').first.text_content()
+        assert re.search(r"Created: \d{4}-\d{2}-\d{2} \d{2}:\d{2}", created), (
+            f"Expected a formatted creation date, got: {created}"
+        )
+
+        print("✓ Template filters test passed")
+
     def test_health_endpoints(self):
         """Test health check endpoints"""
         print("Testing health endpoints...")
@@ -287,8 +1270,68 @@ class LocalStackUITester:
         assert "lambda" in content, "Should include Lambda service status"
         assert "stepfunctions" in content, "Should include Step Functions service status"
 
+        # Test AWS executor metrics (JSON endpoint)
+        self.page.goto(f"{self.base_url}/health/executor", timeout=30000)
+        self.wait_for_page_load()
+        content = self.page.content()
+        assert "max_workers" in content, "Executor metrics should include pool size"
+        assert "queued" in content, "Executor metrics should include queue depth"
+
         print("✓ Health endpoints test passed")
 
+    def test_conditional_get(self):
+        """Test page ETags and 304 Not Modified responses"""
+        print("Testing ETag and 304 responses...")
+        pages = [
+            "/",
+            "/s3/buckets",
+            "/s3/buckets/demo-bucket-1/contents",
+            "/lambda/functions",
+            "/lambda/functions/hello-world",
+            "/stepfunctions/state-machines",
+            "/static/style.css",
+        ]
+        for path in pages:
+            url = f"{self.base_url}{path}"
+            response = self.context.request.get(url, timeout=30000)
+            assert response.status == 200, f"Expected 200 for {path}, got: {response.status}"
+            etag = response.headers.get("etag")
+            assert etag, f"{path} should carry an ETag"
+
+            # Time-dependent values must not make an unchanged page look changed
+            response = self.context.request.get(url, timeout=30000)
+            assert response.headers.get("etag") == etag, f"ETag of {path} should be stable"
+
+            response = self.context.request.get(url, headers={"If-None-Match": etag}, timeout=30000)
+            assert response.status == 304, f"Expected 304 for {path}, got: {response.status}"
+            assert response.body() == b"", f"304 for {path} should have no body"
+
+        # Ages are filled in by the browser, so cached pages do not show stale ones
+        self.page.goto(f"{self.base_url}/lambda/functions", timeout=30000)
+        self.wait_for_page_load()
+        listed = self.page.locator("[data-since]").first
+        assert listed.text_content().endswith("s ago"), (
+            f"Listing age should be rendered client-side, got: {listed.text_content()}"
+        )
+
+        # Changing the data changes the ETag
+        url = f"{self.base_url}/s3/buckets/test-uploads/contents"
+        etag = self.context.request.get(url, timeout=30000).headers.get("etag")
+        self.upload_test_file("test-uploads", "etag-test.txt")
+        response = self.context.request.get(url, headers={"If-None-Match": etag}, timeout=30000)
+        assert response.status == 200, f"Expected 200 after an upload, got: {response.status}"
+        assert response.headers.get("etag") != etag, "ETag should change with the listing"
+        assert "etag-test.txt" in response.text(), "New file should be listed"
+
+        # Clean up
+        self.context.request.post(
+            f"{self.base_url}/s3/buckets/test-uploads/delete-files",
+            form={"keys": "etag-test.txt"},
+            timeout=30000,
+        )
+
+        print("✓ ETag and 304 test passed")
+
     def run_all_tests(self):
         """Run all tests"""
         try:
@@ -304,10 +1347,33 @@ class LocalStackUITester:
             self.test_health_endpoints()
             self.test_s3_bucket_listing()
             self.test_s3_bucket_contents()
+            self.test_s3_folder_navigation()
+            self.test_s3_download_range()
+            self.test_s3_multipart_upload()
+            self.test_s3_pagination()
+            self.test_s3_presigned_urls()
+            self.test_s3_bucket_stats()
+            self.test_s3_top_objects()
+            self.test_s3_bulk_delete()
+            self.test_s3_key_search()
             self.test_lambda_function_listing()
             self.test_lambda_function_detail()
+            self.test_lambda_search()
+            self.test_lambda_detail_cache()
+            self.test_lambda_listing_cache()
+            self.test_lambda_load_test()
             self.test_stepfunctions_listing()
             self.test_stepfunctions_detail()
+            self.test_stepfunctions_latest_execution()
+            self.test_stepfunctions_definition_stats()
+            self.test_stepfunctions_graph()
+            self.test_stepfunctions_event_stream()
+            self.test_stepfunctions_execution_browser()
+            self.test_stepfunctions_batch_runner()
+            self.test_stepfunctions_statistics()
+            self.test_stepfunctions_payload_viewer()
+            self.test_conditional_get()
+            self.test_template_filters()
 
             print("\n🎉 All tests passed!")
             return True